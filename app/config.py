@@ -4,6 +4,8 @@ from typing import Dict, Any
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 WEAVIATE_URL = os.getenv("WEAVIATE_URL", "http://weaviate:8080")
+# Batch imports and vector queries go over gRPC, which listens on its own port
+WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
 WEAVIATE_API_KEY = os.getenv("WEAVIATE_API_KEY")
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
 
@@ -47,10 +49,16 @@ def load_embeddings_config() -> Dict[str, Any]:
                 "dimensions": 1536
             },
             "processing": {
-                "batch_size": 100,
+                "batch_size": 200,
+                "embedding_request_size": 1000,
                 "parallel_processing": True,
                 "retry_failed": True,
-                "max_retries": 3
+                "max_retries": 3,
+                "min_searchable_words": 1,
+                "server_side_batching": False,
+                "bulk_insert": True,
+                "incremental_reload": False,
+                "auto_tune_batch_size": False
             },
             "vectorize_fields": {
                 "name": True,
@@ -64,7 +72,11 @@ def load_embeddings_config() -> Dict[str, Any]:
             },
             "performance": {
                 "request_timeout": 30,
-                "rate_limit_delay": 0.1
+                "rate_limit_delay": 0.1,
+                "max_concurrent_requests": 8
+            },
+            "cache": {
+                "enabled": True
             },
             "usage": {
                 "track_tokens": True,
@@ -158,8 +158,14 @@ class DownloadHistoryManager:
                 raise
 
     def add_download_record(self, ontology_name: str, filename: str, 
-                          size_bytes: int, timestamp: str = None) -> None:
-        """Add a download record for an ontology."""
+                          size_bytes: int, timestamp: str = None,
+                          source_url: str = None, etag: str = None,
+                          last_modified: str = None) -> None:
+        """Add a download record for an ontology.
+
+        ``etag`` and ``last_modified`` are the HTTP validators returned by the
+        source, kept so the next download can be made conditional.
+        """
         history = self._read_history()
         
         if timestamp is None:
@@ -170,6 +176,12 @@ class DownloadHistoryManager:
             "timestamp": timestamp,
             "size_mb": round(size_bytes / (1024 * 1024), 2) if size_bytes else 0
         }
+        if source_url:
+            record["source_url"] = source_url
+        if etag:
+            record["etag"] = etag
+        if last_modified:
+            record["last_modified"] = last_modified
         
         # Initialize list if not exists
         if ontology_name not in history:
@@ -187,6 +199,11 @@ class DownloadHistoryManager:
         """Get the full download history."""
         return self._read_history()
 
+    def get_latest_record(self, ontology_name: str) -> Optional[Dict]:
+        """Get the most recent download record for an ontology, if any."""
+        records = self._read_history().get(ontology_name) or []
+        return records[-1] if records else None
+
     def clear_history(self, ontology_name: str = None) -> None:
         """Clear download history for a specific ontology or all."""
         history = self._read_history()
@@ -202,7 +202,7 @@ class DOEmbeddingGenerator:
         
         # Use batch size from config if not specified
         if batch_size is None:
-            batch_size = self.processing_config.get('batch_size', 100)
+            batch_size = self.processing_config.get('batch_size', 200)
         
         # Process terms in batches
         all_results = []
@@ -0,0 +1,124 @@
+"""
+Persistent cache of term embeddings keyed by model and searchable text.
+
+Ontology releases usually change only a small share of terms, so rebuilding a
+collection can reuse the vectors of every term whose searchable text is
+unchanged and only send the rest to OpenAI.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+# Stay well below SQLite's limit on bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+# Bytes of the database file read through a memory map; lookups then come
+# straight from the OS page cache instead of being copied by read() calls
+_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class EmbeddingCache:
+    """SQLite-backed map of ``make_key(model, text)`` to a float32 vector."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            self._create_schema(conn)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}|{text}".encode()).hexdigest()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: list[str]) -> dict[str, Sequence[float]]:
+        """Return the cached vectors for whichever of ``keys`` are present."""
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob)
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, Sequence[float]]]) -> None:
+        """Store vectors, replacing any existing entry for the same key."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, array("f", vector).tobytes()) for key, vector in items)
+            )
+
+
+class PassageEmbeddingCache(EmbeddingCache):
+    """Bounded cache of search passage vectors.
+
+    Passages are arbitrary user input rather than a release's terms, so entries
+    expire after ``ttl_seconds`` and at most ``max_entries`` are kept, newest
+    first. Both limits are enforced whenever vectors are stored.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        super().__init__(path)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS passages "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS passages_created_at ON passages (created_at)")
+
+    def get_many(self, keys: list[str]) -> dict[str, Sequence[float]]:
+        """Return the unexpired cached vectors for whichever of ``keys`` are present."""
+        found = {}
+        oldest = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM passages WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*chunk, oldest]
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob)
+        return found
+
+    def put_many(self, items: Iterable[tuple[str, Sequence[float]]]) -> None:
+        """Store vectors, then drop expired entries and the oldest beyond the cap."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO passages (key, vector, created_at) VALUES (?, ?, ?)",
+                ((key, array("f", vector).tobytes(), now) for key, vector in items)
+            )
+            conn.execute("DELETE FROM passages WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM passages WHERE key IN "
+                "(SELECT key FROM passages ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
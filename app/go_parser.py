@@ -1,8 +1,20 @@
 """
 Enhanced GO.json parser that extracts all useful fields for semantic matching.
 """
+import sys
 from typing import Dict, List
 
+# Synonyms, cross-references and namespaces repeat across thousands of terms.
+# Short ones are interned so every parsed term shares a single copy.
+_INTERN_MAX_LENGTH = 64
+
+
+def _shared(text: str) -> str:
+    """Return the interned copy of a short string, or the string itself."""
+    if isinstance(text, str) and len(text) <= _INTERN_MAX_LENGTH:
+        return sys.intern(text)
+    return text
+
 
 def extract_synonyms_from_go_node(node: Dict) -> Dict[str, List[str]]:
     """Extract and categorize synonyms from GO node metadata."""
@@ -16,7 +28,7 @@ def extract_synonyms_from_go_node(node: Dict) -> Dict[str, List[str]]:
     all_synonyms = []
     
     for syn in synonyms:
-        syn_text = syn.get("val", "")
+        syn_text = _shared(syn.get("val", ""))
         syn_type = syn.get("pred", "")
         
         if syn_text:
@@ -48,7 +60,7 @@ def extract_cross_references(node: Dict) -> List[str]:
     # Check definition xrefs
     definition = meta.get("definition", {})
     if isinstance(definition, dict) and "xrefs" in definition:
-        xrefs.extend(definition["xrefs"])
+        xrefs.extend(map(_shared, definition["xrefs"]))
     
     # Check main xrefs section in meta
     meta_xrefs = meta.get("xrefs", [])
@@ -56,9 +68,9 @@ def extract_cross_references(node: Dict) -> List[str]:
         if isinstance(xref, dict) and "val" in xref:
             val = xref["val"]
             if val:  # Only add non-empty values
-                xrefs.append(val)
+                xrefs.append(_shared(val))
         elif isinstance(xref, str) and xref:  # Only add non-empty strings
-            xrefs.append(xref)
+            xrefs.append(_shared(xref))
     
     # Check for other xref sources in basicPropertyValues
     basic_props = meta.get("basicPropertyValues", [])
@@ -66,7 +78,7 @@ def extract_cross_references(node: Dict) -> List[str]:
         if "hasDbXref" in prop.get("pred", ""):
             val = prop.get("val", "")
             if val:  # Only add non-empty values
-                xrefs.append(val)
+                xrefs.append(_shared(val))
     
     return xrefs
 
@@ -78,7 +90,7 @@ def get_ontology_namespace(node: Dict) -> str:
     
     for prop in basic_props:
         if prop.get("pred") == "http://www.geneontology.org/formats/oboInOwl#hasOBONamespace":
-            return prop.get("val", "")
+            return _shared(prop.get("val", ""))
     
     return ""
 
@@ -151,15 +163,14 @@ def parse_go_json_enhanced(go_data: Dict, id_format: Dict = None) -> List[Dict]:
         return []
     
     nodes = graphs[0].get("nodes", [])
-    parsed_terms = []
     
-    for node in nodes:
-        if "lbl" in node and "id" in node:  # Only process terms with required fields
-            enhanced_term = parse_enhanced_go_term(node, id_format)
-            if enhanced_term:
-                parsed_terms.append(enhanced_term)
-    
-    return parsed_terms
+    # Only process terms with required fields
+    return [
+        enhanced_term
+        for node in nodes
+        if "lbl" in node and "id" in node
+        and (enhanced_term := parse_enhanced_go_term(node, id_format))
+    ]
 
 
 # Example usage and testing
@@ -1,24 +1,29 @@
+import asyncio
 import json
 import logging
 import os
 import time
 from datetime import datetime
-from typing import Dict, Any
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Depends
+from contextlib import asynccontextmanager
+from functools import cache, cached_property
+from typing import Any, Callable, Dict, Optional
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
-import aiohttp
 import aiofiles
-import asyncio
-import requests
 import openai
 
-from .ontology_manager import OntologyManager
+from .ontology_manager import DrainingTerms, OntologyManager, get_embedding_dimensions, get_embedding_model_name
 from .ontology_searcher import OntologySearcher
 from .llm_matcher import LLMMatcher
 from .config_updater import ConfigUpdater, DownloadHistoryManager
 from .config import ADMIN_API_KEY, OPENAI_API_KEY, ONTOLOGY_CONFIG, load_ontology_config, EMBEDDINGS_CONFIG, load_embeddings_config
 from .go_parser import parse_go_json_enhanced
-from .ontology_version_manager import OntologyVersionManager
+from .ontology_update import (
+    _perform_ontology_update,
+    register_update_task,
+    update_progress_store,
+    update_tasks,
+)
 from .models import (
     ResolveRequest,
     ResolveResponse,
@@ -26,9 +31,58 @@ from .models import (
     OntologyTerm,
 )
 
-app = FastAPI(title="Biocurator Mapper")
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+
+class _Services:
+    """Lazily constructed API services.
+
+    Building these at import time would open network clients in the parent
+    process before uvicorn/gunicorn forks its workers, so each worker
+    constructs its own instances on first use instead.
+    """
+
+    @cached_property
+    def ontology_manager(self) -> OntologyManager:
+        return OntologyManager()
+
+    @cached_property
+    def searcher(self) -> OntologySearcher:
+        return OntologySearcher(self.ontology_manager)
+
+    @cached_property
+    def matcher(self) -> LLMMatcher:
+        return LLMMatcher()
+
+    async def warm_up(self) -> None:
+        """Build every service and connect the manager's clients.
+
+        Done at worker startup so the first request does not pay for it.
+        """
+        await self.ontology_manager.warmup()
+        # Accessing the cached properties constructs them
+        _ = self.searcher, self.matcher
+
+
+services = _Services()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker after fork, so clients are never shared across processes
+    await services.warm_up()
+    yield
+    await services.ontology_manager.close()
+
+
+app = FastAPI(title="Biocurator Mapper", lifespan=lifespan)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -36,14 +90,9 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-ontology_manager = OntologyManager()
-searcher = OntologySearcher(ontology_manager)
-matcher = LLMMatcher()
 config_updater = ConfigUpdater()
-version_manager = OntologyVersionManager()
 
 # Progress tracking store (in-memory for now)
-update_progress_store = {}
 embedding_progress_store = {}
 # Track background tasks for cancellation
 background_tasks_store = {}
@@ -65,24 +114,45 @@ async def health_check():
     }
 
 
+def _json_response(model: ResolveResponse) -> Response:
+    # Serialise with pydantic-core directly; returning a Response skips
+    # FastAPI's second validation pass over the already-built model
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
 @app.post("/resolve_biocurated_data", response_model=ResolveResponse)
 async def resolve_biocurated_data(payload: ResolveRequest):
     logger.info("Resolve request for ontology %s", payload.ontology_name)
-    collection = ontology_manager.get_current_ontology_version(payload.ontology_name)
+    collection = services.ontology_manager.get_current_ontology_version(payload.ontology_name)
     if not collection:
         raise HTTPException(status_code=404, detail="Ontology not configured")
     try:
-        candidates = await searcher.search_ontology(payload.passage, collection)
-        match = await matcher.select_best_match(payload.passage, candidates)
+        candidates = await services.searcher.search_ontology(payload.passage, collection)
+        match = await services.matcher.select_best_match(payload.passage, candidates)
         if "error" in match:
-            return ResolveResponse(error=match["error"])
-        best = OntologyTerm(id=match.get("id"), name=match.get("name"))
-        return ResolveResponse(
+            return _json_response(ResolveResponse(error=match["error"]))
+        # Single pass over the candidates: pick out the winner's full record
+        # (for its definition) and build the alternatives from the rest.
+        # Candidates come from our own collection, so validation is skipped.
+        best_id = match.get("id")
+        best_definition = None
+        alternatives = []
+        for c in candidates:
+            if c.get("id") == best_id:
+                best_definition = c.get("definition")
+            else:
+                alternatives.append(OntologyTerm.model_construct(
+                    id=c.get("id"), name=c.get("name"), definition=c.get("definition")
+                ))
+        best = OntologyTerm.model_construct(
+            id=best_id, name=match.get("name"), definition=best_definition
+        )
+        return _json_response(ResolveResponse.model_construct(
             best_match=best,
             confidence=match.get("confidence"),
             reason=match.get("reason"),
-            alternatives=[OntologyTerm(**c) for c in candidates if c.get("id") != best.id],
-        )
+            alternatives=alternatives,
+        ))
     except Exception as e:
         logger.exception("Resolution failed")
         raise HTTPException(status_code=500, detail=str(e))
@@ -92,189 +162,37 @@ def get_ontology_config(ontology_name: str) -> dict:
     """Get configuration for a specific ontology."""
     return ONTOLOGY_CONFIG.get("ontologies", {}).get(ontology_name, {})
 
-def get_nested_value(data: dict, path: list, default=""):
-    """Get nested value from dict using path list."""
-    current = data
-    for key in path:
-        if isinstance(current, dict) and key in current:
-            current = current[key]
-        else:
-            return default
-    return current
+_MISSING = object()
 
-async def _perform_ontology_update(ontology_name: str, source_url: str):
-    """Download the ontology from ``source_url`` and save to disk."""
-    
-    # Initialize progress tracking
-    progress_key = ontology_name
-    update_progress_store[progress_key] = {
-        "status": "starting",
-        "progress_percentage": 0,
-        "recent_logs": [],
-        "started_at": time.time(),
-        "ontology_name": ontology_name,
-        "source_url": source_url,
-        "download_percentage": 0,
-        "download_bytes": 0,
-        "download_total_bytes": 0
-    }
-    
-    def add_log(message: str, level: str = "INFO"):
-        """Add a log entry to progress tracking."""
-        timestamp = datetime.utcnow().strftime("%H:%M:%S")
-        log_entry = {
-            "timestamp": timestamp,
-            "message": message,
-            "level": level
-        }
-        if progress_key in update_progress_store:
-            update_progress_store[progress_key]["recent_logs"].append(log_entry)
-            # Keep only last 10 logs
-            update_progress_store[progress_key]["recent_logs"] = update_progress_store[progress_key]["recent_logs"][-10:]
-        logger.info("Update %s: %s", ontology_name, message)
 
-    def update_progress(status: str, percentage: int, message: str = "", 
-                       download_percentage: int = None, download_bytes: int = None, 
-                       download_total_bytes: int = None):
-        """Update progress status."""
-        if progress_key in update_progress_store:
-            update_progress_store[progress_key].update({
-                "status": status,
-                "progress_percentage": percentage
-            })
-            if download_percentage is not None:
-                update_progress_store[progress_key]["download_percentage"] = download_percentage
-            if download_bytes is not None:
-                update_progress_store[progress_key]["download_bytes"] = download_bytes
-            if download_total_bytes is not None:
-                update_progress_store[progress_key]["download_total_bytes"] = download_total_bytes
-            if message:
-                add_log(message)
-
-    try:
-        add_log(f"Starting ontology update from {source_url}")
-        update_progress("starting", 5, "Initializing download...")
-
-        # Get the persistent data directory from environment
-        data_dir = os.environ.get("ONTOLOGY_DATA_DIR", "/app/data")
-        
-        # Create source_ontologies subdirectory
-        source_ontologies_dir = os.path.join(data_dir, "source_ontologies")
-        os.makedirs(source_ontologies_dir, exist_ok=True)
-        
-        # Standardized filename for this ontology
-        filename = f"{ontology_name}.json"
-        file_path = os.path.join(source_ontologies_dir, filename)
-        
-        update_progress("downloading", 10, f"Downloading to {filename}")
-
-        # Download function to run in thread
-        def download_file_with_progress():
-            """Download file with progress tracking using requests."""
-            try:
-                with requests.get(source_url, stream=True) as response:
-                    response.raise_for_status()
-                    
-                    # Get file size for progress tracking
-                    total_size = int(response.headers.get('content-length', 0))
-                    downloaded_size = 0
-                    
-                    # Update progress with total size
-                    update_progress("downloading", 10, f"Starting download ({total_size // 1024 // 1024} MB)",
-                                  download_percentage=0, download_bytes=0, download_total_bytes=total_size)
-                    
-                    # Stream download to file
-                    with open(file_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            # Check for cancellation
-                            if (progress_key in update_progress_store and 
-                                update_progress_store[progress_key].get("status") == "cancelled"):
-                                logger.warning("Download cancelled by user")
-                                return None
-                                
-                            if chunk:  # filter out keep-alive chunks
-                                f.write(chunk)
-                                downloaded_size += len(chunk)
-                                
-                                # Update download progress
-                                if total_size > 0:
-                                    download_pct = int((downloaded_size / total_size) * 100)
-                                    overall_pct = 10 + int((downloaded_size / total_size) * 30)  # 30% for download
-                                    update_progress("downloading", overall_pct, 
-                                                  f"Downloaded {downloaded_size // 1024 // 1024} MB of {total_size // 1024 // 1024} MB",
-                                                  download_percentage=download_pct,
-                                                  download_bytes=downloaded_size,
-                                                  download_total_bytes=total_size)
-                    
-                    return downloaded_size
-                    
-            except requests.RequestException as exc:
-                raise exc
-        
-        # Run download in thread to not block async event loop
+@cache
+def _path_getter(path: tuple) -> Callable[[Any], Any]:
+    """Build (once per distinct path) a getter that walks ``path`` through nested dicts."""
+    def getter(data):
         try:
-            downloaded_size = await asyncio.to_thread(download_file_with_progress)
-            
-            if downloaded_size is None:
-                add_log("Download cancelled by user", "WARNING")
-                update_progress("cancelled", 0, "Download cancelled")
-                return None
-                
-            add_log(f"Downloaded {downloaded_size // 1024 // 1024} MB to {filename}")
-            
-        except Exception as exc:
-            error_msg = f"Download failed: {str(exc)}"
-            add_log(error_msg, "ERROR")
-            update_progress("failed", 0, error_msg)
-            raise exc
-
-        update_progress("completed", 100, f"Download completed! File saved to {filename}")
-        add_log(f"Ontology download completed successfully. File: {filename}")
-        
-        # Store download metadata
-        download_info = {
-            "ontology_name": ontology_name,
-            "source_url": source_url,
-            "filename": filename,
-            "file_path": file_path,
-            "downloaded_at": datetime.utcnow().isoformat(),
-            "size_bytes": downloaded_size
-        }
-        
-        # Update the download history so Streamlit can see it
-        download_history_manager = DownloadHistoryManager()
-        # Store filename with subdirectory path relative to data dir
-        filename_with_path = os.path.join("source_ontologies", filename)
-        download_history_manager.add_download_record(
-            ontology_name=ontology_name,
-            filename=filename_with_path,
-            size_bytes=downloaded_size,
-            timestamp=download_info["downloaded_at"] + "Z"
-        )
-        # Update status to available since we just downloaded it
-        download_history_manager.update_file_status(ontology_name, filename_with_path, "available")
-        add_log(f"Updated download history for {ontology_name}")
-        
-        return download_info
-        
-    except Exception as exc:
-        error_msg = f"Ontology update failed: {str(exc)}"
-        add_log(error_msg, "ERROR")
-        update_progress("failed", 0, error_msg)
-        logger.exception("Ontology update failed")
-        raise exc
+            for key in path:
+                data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return _MISSING
+        return data
+    return getter
 
+def get_nested_value(data: dict, path: list, default=""):
+    """Get nested value from dict using path list."""
+    value = _path_getter(tuple(path))(data)
+    return default if value is _MISSING else value
 
-@app.post("/admin/update_ontology")
+@app.post("/admin/update_ontology", status_code=202)
 async def update_ontology(
     request: OntologyUpdateRequest,
     background_tasks: BackgroundTasks,
     api_key: str = Depends(verify_api_key),
 ):
+    task_id = register_update_task(request.ontology_name, request.source_url)
     background_tasks.add_task(
-        _perform_ontology_update, request.ontology_name, request.source_url
+        _perform_ontology_update, request.ontology_name, request.source_url, task_id
     )
-    return {"status": "update started"}
+    return {"task_id": task_id, "status": "queued"}
 
 
 @app.get("/admin/update_progress/{ontology_name}")
@@ -309,7 +227,12 @@ async def cancel_update(ontology_name: str, api_key: str = Depends(verify_api_ke
     return {"status": "Update marked for cancellation"}
 
 @app.get("/admin/ontology_status")
-async def ontology_status(api_key: str = Depends(verify_api_key)):
+async def ontology_status(task_id: Optional[str] = None, api_key: str = Depends(verify_api_key)):
+    """Return the configured ontology versions, or the state of a single update task."""
+    if task_id is not None:
+        if task_id not in update_tasks:
+            raise HTTPException(status_code=404, detail="Unknown update task")
+        return update_tasks[task_id]
     return config_updater.get_all_ontology_configs()
 
 @app.get("/admin/verify_downloads")
@@ -378,7 +301,7 @@ async def weaviate_health_check(api_key: str = Depends(verify_api_key)):
     """Check Weaviate health status."""
     try:
         # Check if Weaviate client is healthy
-        is_healthy = await ontology_manager.check_weaviate_health()
+        is_healthy = await services.ontology_manager.check_weaviate_health()
         return {
             "healthy": is_healthy,
             "details": "Weaviate is connected and operational" if is_healthy else "Cannot connect to Weaviate"
@@ -401,7 +324,7 @@ async def openai_health_check(api_key: str = Depends(verify_api_key)):
             }
         
         # Do a simple test with the OpenAI API
-        is_healthy = await matcher.check_openai_health()
+        is_healthy = await services.matcher.check_openai_health()
         return {
             "healthy": is_healthy,
             "details": "OpenAI API is accessible" if is_healthy else "Cannot connect to OpenAI API"
@@ -499,9 +422,11 @@ async def _generate_embeddings_only(ontology_name: str, collection_name: str = N
         
         # Load the ontology data
         try:
-            async with aiofiles.open(file_path, 'r') as f:
+            async with aiofiles.open(file_path, 'rb') as f:
                 content = await f.read()
-                data = json.loads(content)
+            # Parsing a full ontology takes long enough to stall request handlers
+            data = await asyncio.to_thread(_json_loads, content)
+            del content
             add_log("Successfully loaded JSON data")
         except Exception as exc:
             error_msg = f"Error loading JSON: {str(exc)}"
@@ -516,7 +441,10 @@ async def _generate_embeddings_only(ontology_name: str, collection_name: str = N
         
         # Use enhanced GO parser for comprehensive data extraction
         id_format = ontology_config.get("id_format", {"prefix_replacement": {"_": ":"}})
-        parsed_terms = parse_go_json_enhanced(data, id_format)
+        parsed_terms = await asyncio.to_thread(parse_go_json_enhanced, data, id_format)
+        # The loader streams from parsed_terms; keeping the raw graph alive for
+        # the whole load would roughly double peak memory on large ontologies
+        del data
 
         add_log(f"Successfully parsed {len(parsed_terms)} terms")
         update_progress("embedding", 30, f"Creating embeddings for {len(parsed_terms)} terms...")
@@ -529,7 +457,6 @@ async def _generate_embeddings_only(ontology_name: str, collection_name: str = N
         def embedding_progress_callback(status: str, percentage: int, message: str, extra_data: dict):
             """Update embedding progress."""
             if progress_key in embedding_progress_store:
-                embedding_progress_store[progress_key]["embedding_stats"] = extra_data
                 # Map embedding progress to overall progress (30-95%)
                 overall_percentage = 30 + int(percentage * 0.65)
                 update_progress(
@@ -544,9 +471,23 @@ async def _generate_embeddings_only(ontology_name: str, collection_name: str = N
             """Check if the operation should be cancelled."""
             return embedding_cancellation_flags.get(cancellation_key, False)
         
-        await ontology_manager.create_and_load_ontology_collection(
-            collection_name, parsed_terms, OPENAI_API_KEY, embedding_progress_callback, cancellation_check
-        )
+        # Run as its own task so a cancellation request can interrupt it at
+        # whatever it is awaiting instead of waiting for the next flag check.
+        # Parsed terms are handed over and freed as they are loaded.
+        load_task = asyncio.create_task(services.ontology_manager.create_and_load_ontology_collection(
+            collection_name, DrainingTerms(parsed_terms), OPENAI_API_KEY, embedding_progress_callback, cancellation_check,
+            hnsw_settings=get_ontology_config(ontology_name).get("hnsw")
+        ))
+        background_tasks_store[progress_key] = load_task
+        try:
+            await load_task
+        except asyncio.CancelledError:
+            if not embedding_cancellation_flags.get(cancellation_key, False):
+                raise
+            # The partially loaded collection is left unused
+            add_log("Embedding generation was cancelled", "WARNING")
+            update_progress("cancelled", embedding_progress_store[progress_key].get("progress_percentage", 0), "Operation cancelled")
+            return collection_name
         
         update_progress("finalizing", 96, "Updating configuration...")
         
@@ -575,6 +516,7 @@ async def _generate_embeddings_only(ontology_name: str, collection_name: str = N
         # Clean up cancellation flag
         if cancellation_key in embedding_cancellation_flags:
             del embedding_cancellation_flags[cancellation_key]
+        background_tasks_store.pop(progress_key, None)
 
 
 @app.post("/admin/generate_embeddings")
@@ -637,6 +579,8 @@ async def cancel_embedding_generation(ontology_name: str, api_key: str = Depends
     
     # Set cancellation flag
     embedding_cancellation_flags[cancellation_key] = True
+    if (load_task := background_tasks_store.get(progress_key)) is not None:
+        load_task.cancel()
     
     # Mark as cancelled in progress store
     if progress_key in embedding_progress_store:
@@ -663,15 +607,15 @@ async def test_embeddings_config(api_key: str = Depends(verify_api_key)):
         # Use a simple test string
         test_text = "This is a test embedding for configuration validation."
         
-        # Get model configuration
-        model_name = EMBEDDINGS_CONFIG.get("model", {}).get("name", "text-ada-002")
+        # Same model identifier the ingestion and search paths send to OpenAI
+        model_name = get_embedding_model_name()
+        request_options = {"model": model_name}
+        if dimensions := get_embedding_dimensions():
+            request_options["dimensions"] = dimensions
         
         # Test OpenAI API
         client = openai.Client(api_key=OPENAI_API_KEY)
-        response = client.embeddings.create(
-            model=model_name,
-            input=test_text
-        )
+        response = client.embeddings.create(input=test_text, **request_options)
         
         # Extract embedding info
         embedding = response.data[0].embedding
@@ -1,16 +1,731 @@
 import asyncio
+import functools
+import hashlib
+import inspect
+import itertools
+import json
 import logging
+import multiprocessing
+import operator
+import os
+import sqlite3
+import string
 import time
-from typing import Any, Callable, Optional
-
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional, Sequence, Sized
+from urllib.parse import urlsplit
+
+import httpx
+import openai
 import weaviate
 import weaviate.classes as wvc
 from openai import APIError, RateLimitError
-from weaviate.exceptions import WeaviateBaseError
+from weaviate.exceptions import WeaviateBaseError, WeaviateUnsupportedFeatureError
+from weaviate.util import generate_uuid5
 
-from .config import EMBEDDINGS_CONFIG, WEAVIATE_API_KEY, WEAVIATE_URL
+from .config import EMBEDDINGS_CONFIG, WEAVIATE_API_KEY, WEAVIATE_GRPC_PORT, WEAVIATE_URL
 from .config_updater import ConfigUpdater
+from .embedding_cache import EmbeddingCache, PassageEmbeddingCache
 from .go_parser import parse_enhanced_go_term
+from .retry import retry_delay
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    # Compact, non-ASCII-preserving output matches orjson, so hashes agree either way
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def _parse_weaviate_url(url: str) -> tuple[str, int]:
+    """Host and port of a self-hosted Weaviate URL; the port defaults to 8080.
+
+    Accepts bare ``host:port`` values as well as URLs with a scheme, a path
+    or a bracketed IPv6 host.
+    """
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    return parts.hostname or "localhost", parts.port or 8080
+
+
+# Parsed once; both the ingestion and the request-path clients connect here
+_WEAVIATE_HOST, _WEAVIATE_PORT = _parse_weaviate_url(WEAVIATE_URL)
+
+# Config model names that differ from the identifiers the OpenAI API expects
+_OPENAI_MODEL_ALIASES = {"text-ada-002": "text-embedding-ada-002"}
+
+# Native size of the models that can return shortened embeddings via the
+# ``dimensions`` request parameter
+_SHORTENABLE_MODEL_DIMENSIONS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072}
+
+# Per-request limits of the OpenAI embeddings endpoint. Tokens are estimated at
+# ~4 characters each and kept below the 300k hard cap.
+MAX_OPENAI_EMBEDDING_INPUTS = 2048
+MAX_OPENAI_EMBEDDING_TOKENS = 250_000
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+_LOWERCASE_PUNCTUATION_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, string.punctuation)
+
+# Minimum seconds between repeated progress callbacks of the same status
+PROGRESS_UPDATE_INTERVAL = 0.5
+
+# Import batch sizes timed by the batch-size calibration, one batch each
+_BATCH_SIZE_PROBES = (16, 64, 256, 1024)
+
+# Final statuses of an import, always reported
+_TERMINAL_STATUSES = frozenset({
+    "completed", "completed_with_errors", "completed_with_failures", "cancelled", "error"
+})
+
+# Collection schema of an enhanced ontology; identical for every collection
+_SCHEMA_PROPERTIES = tuple(
+    wvc.config.Property(name=name, data_type=data_type)
+    for name, data_type in (
+        ("term_id", wvc.config.DataType.TEXT),
+        ("name", wvc.config.DataType.TEXT),
+        ("definition", wvc.config.DataType.TEXT),
+        ("exact_synonyms", wvc.config.DataType.TEXT_ARRAY),
+        ("narrow_synonyms", wvc.config.DataType.TEXT_ARRAY),
+        ("broad_synonyms", wvc.config.DataType.TEXT_ARRAY),
+    )
+) + (
+    # Also holds related and untyped synonyms, so it is kept; but it repeats
+    # the typed lists and is only returned, never searched, so it is not indexed
+    wvc.config.Property(
+        name="all_synonyms",
+        data_type=wvc.config.DataType.TEXT_ARRAY,
+        index_searchable=False,
+        index_filterable=False
+    ),
+    wvc.config.Property(name="searchable_text", data_type=wvc.config.DataType.TEXT),
+    # Fingerprint used to skip unchanged terms on an incremental reload
+    wvc.config.Property(name="content_hash", data_type=wvc.config.DataType.TEXT, index_searchable=False),
+)
+
+# Reads every hashed property of a term in one C-level call
+_hashed_values = operator.itemgetter(*(prop.name for prop in _SCHEMA_PROPERTIES if prop.name != "content_hash"))
+
+# HNSW settings fixed when a collection is created, and the query-time ones
+# Weaviate lets change afterwards
+_HNSW_BUILD_SETTINGS = ("ef_construction", "max_connections")
+_HNSW_QUERY_SETTINGS = ("ef", "dynamic_ef_min", "dynamic_ef_max", "dynamic_ef_factor")
+
+# Term IDs removed per delete_many call on an incremental reload
+_DELETE_CHUNK = 1000
+
+# Objects fetched per request when reading the stored content hashes. Only
+# two short properties are returned, so pages far above the client's default
+# of 100 stay small while cutting round trips on large ontologies.
+_HASH_PAGE_SIZE = 5000
+
+# Terms sent to a preprocessing worker process at a time
+_PREPROCESS_CHUNK = 500
+
+# Vectors are computed client-side (see _embed_texts), so Weaviate
+# must not call OpenAI again for every imported object
+_VECTORIZER_CONFIG = wvc.config.Configure.Vectorizer.none()
+
+# The ingestion client outlives many batch imports on one connection; large
+# batches need more than the default insert timeout
+_INGESTION_CLIENT_CONFIG = wvc.init.AdditionalConfig(
+    timeout=wvc.init.Timeout(init=10, query=60, insert=120)
+)
+
+# Embeddings are held as float32 arrays (4 bytes per dimension rather than a
+# boxed Python float) and only expanded to lists when handed to Weaviate
+Vector = Sequence[float]
+
+
+def get_embedding_model_name() -> str:
+    """Return the OpenAI model used for both term and passage embeddings."""
+    model_name = EMBEDDINGS_CONFIG.get("model", {}).get("name", "text-ada-002")
+    return _OPENAI_MODEL_ALIASES.get(model_name, model_name)
+
+
+def get_embedding_dimensions() -> Optional[int]:
+    """Return the shortened embedding size to request, or None for the model's native size.
+
+    Only text-embedding-3 models can shorten their embeddings; for other models
+    the configured dimensions are informational.
+    """
+    native = _SHORTENABLE_MODEL_DIMENSIONS.get(get_embedding_model_name())
+    dimensions = EMBEDDINGS_CONFIG.get("model", {}).get("dimensions")
+    return dimensions if native and dimensions and dimensions != native else None
+
+
+def get_embedding_signature() -> str:
+    """Identify the vectors the configured model produces, for cache keys and content hashes."""
+    model_name = get_embedding_model_name()
+    dimensions = get_embedding_dimensions()
+    return f"{model_name}/{dimensions}" if dimensions else model_name
+
+
+@dataclass(frozen=True)
+class _SearchableTextConfig:
+    """Searchable-text settings resolved from the embeddings configuration."""
+
+    use_name: bool = True
+    use_definition: bool = True
+    use_synonyms: bool = True
+    lowercase: bool = False
+    remove_punctuation: bool = False
+    separator: str = " | "
+
+    @classmethod
+    def from_config(cls, config: dict) -> "_SearchableTextConfig":
+        vectorize_fields = config.get("vectorize_fields", {})
+        preprocessing = config.get("preprocessing", {})
+        return cls(
+            use_name=vectorize_fields.get("name", True),
+            use_definition=vectorize_fields.get("definition", True),
+            use_synonyms=vectorize_fields.get("synonyms", True),
+            lowercase=preprocessing.get("lowercase", False),
+            remove_punctuation=preprocessing.get("remove_punctuation", False),
+            separator=preprocessing.get("combine_fields_separator", " | ")
+        )
+
+    def _preprocess(self, text: str) -> str:
+        if self.lowercase and self.remove_punctuation:
+            # ASCII text is lowercased and stripped in one pass
+            if text.isascii():
+                return text.translate(_LOWERCASE_PUNCTUATION_TABLE)
+            return text.lower().translate(_PUNCTUATION_TABLE)
+        if self.lowercase:
+            return text.lower()
+        if self.remove_punctuation:
+            return text.translate(_PUNCTUATION_TABLE)
+        return text
+
+    def build(self, term_data: dict) -> str:
+        # Single pass over the term; empty fields and synonyms are dropped
+        # here so the preprocessing does not need to filter again
+        components = []
+        if self.use_name and (name := term_data.get("name")):
+            components.append(name)
+        if self.use_definition and (definition := term_data.get("definition")):
+            components.append(definition)
+        if self.use_synonyms:
+            # Add all synonyms for richer semantic content
+            for key in ("exact_synonyms", "narrow_synonyms", "broad_synonyms"):
+                components.extend(filter(None, term_data.get(key) or ()))
+        if self.lowercase or self.remove_punctuation:
+            components = [t for c in components if (t := self._preprocess(c))]
+        return self.separator.join(components)
+
+
+def _extract_term_fields(raw_term: dict) -> dict:
+    """Extract all useful fields from GO/DO JSON for better semantic matching."""
+    # Raw GO/DO nodes (with 'lbl' and 'meta') go through the GO parser, which
+    # handles both formats; already parsed terms are used directly
+    if "lbl" in raw_term and "meta" in raw_term and "exact_synonyms" not in raw_term:
+        raw_term = parse_enhanced_go_term(raw_term) or raw_term
+
+    # Synonym lists are copied by reference. A fresh empty list is only made
+    # when one is missing: Weaviate's batch serializer accepts lists, not tuples.
+    return {
+        "term_id": raw_term.get("id", ""),
+        "name": raw_term.get("name", ""),
+        "definition": raw_term.get("definition", ""),
+        "exact_synonyms": raw_term.get("exact_synonyms") or [],
+        "narrow_synonyms": raw_term.get("narrow_synonyms") or [],
+        "broad_synonyms": raw_term.get("broad_synonyms") or [],
+        "all_synonyms": raw_term.get("all_synonyms") or [],
+        # Rebuilt from the configured fields by _enhance_term
+        "searchable_text": raw_term.get("searchable_text", "")
+    }
+
+
+def _enhance_term(raw_term: dict, text_config: _SearchableTextConfig, model_name: str) -> dict:
+    """Enhanced fields, searchable text and content hash of one term.
+
+    The keys are exactly the collection's properties, so the dict is imported
+    as is. Module-level so it can run in worker processes.
+    """
+    enhanced_term = _extract_term_fields(raw_term)
+    enhanced_term["searchable_text"] = text_config.build(enhanced_term)
+    enhanced_term["content_hash"] = _content_hash(enhanced_term, model_name)
+    return enhanced_term
+
+
+def _is_sparse(term: dict, min_searchable_words: int) -> bool:
+    """Whether a term has too few words in its searchable text to be worth an embedding."""
+    return len(term["searchable_text"].split()) < min_searchable_words
+
+
+def _content_hash(term: dict, model_name: str) -> str:
+    """Fingerprint of everything stored for a term, including the model its vector came from."""
+    return hashlib.sha256(_json_dumps([model_name, *_hashed_values(term)])).hexdigest()
+
+
+ProgressCallback = Callable[[str, int, str, dict[str, Any]], Optional[Awaitable[None]]]
+
+
+class _ProgressReporter:
+    """Hands progress updates to a callback from a separate task.
+
+    The import loop only enqueues updates, so a slow callback cannot hold it
+    up. When the callback falls behind, the oldest pending update is dropped.
+    """
+
+    def __init__(self, callback: ProgressCallback, logger: logging.Logger, max_pending: int = 8):
+        self._callback = callback
+        self._logger = logger
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._dropped = False
+        self._task = asyncio.create_task(self._drain())
+
+    def report(self, status: str, percentage: int, message: str, extra_data: dict[str, Any]) -> None:
+        update = (status, percentage, message, extra_data)
+        try:
+            self._queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self._queue.get_nowait()
+            self._queue.put_nowait(update)
+            if not self._dropped:
+                self._dropped = True
+                self._logger.warning("Progress callback is falling behind; dropping stale updates")
+
+    async def _drain(self) -> None:
+        while (update := await self._queue.get()) is not None:
+            try:
+                result = self._callback(*update)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self._logger.error(f"Progress callback failed: {e}")
+
+    async def aclose(self) -> None:
+        """Wait for every queued update to be delivered, then stop the drain task."""
+        await self._queue.put(None)
+        await self._task
+
+
+class _RateLimiter:
+    """Token bucket allowing ``max_rate`` acquisitions per ``time_period`` seconds."""
+
+    def __init__(self, max_rate: float, time_period: float):
+        self.max_rate = max_rate
+        self._per_second = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.max_rate, self._tokens + (now - self._updated) * self._per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._per_second)
+
+
+class DrainingTerms:
+    """Single-pass view of a term list that lets go of each term once it is read.
+
+    Loading from it keeps the load's progress percentages (it has a length)
+    while every parsed term can be freed as soon as its batch is prepared,
+    instead of the whole list living until the load ends. The list is
+    emptied in the process.
+    """
+
+    def __init__(self, terms: list[dict]):
+        # Reversed once so terms are taken from the end in O(1)
+        terms.reverse()
+        self._terms = terms
+        self._total = len(terms)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[dict]:
+        terms = self._terms
+        while terms:
+            yield terms.pop()
+
+
+def _calibrated_batch_size(probe_rates: dict[int, float]) -> int:
+    """Pick the probed import batch size with the highest throughput.
+
+    Args:
+        probe_rates: Import throughput in terms per second, keyed by batch size
+
+    Returns:
+        The fastest batch size; the smallest of those tied for fastest
+    """
+    if not probe_rates:
+        raise ValueError("No batch size was probed")
+    return min(probe_rates, key=lambda size: (-probe_rates[size], size))
+
+
+class _ThrottledProgress:
+    """Reports import progress together with a snapshot of the statistics.
+
+    Repeats of the same status (one per batch) are throttled; status changes
+    and final statuses are always reported.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[str, int, str, dict[str, Any]], None]],
+        embedding_stats: dict[str, Any]
+    ):
+        self._callback = callback
+        self._stats = embedding_stats
+        self._last_progress = 0.0
+        self._last_status: Optional[str] = None
+
+    def __call__(self, status: str, percentage: int, message: str, **kwargs) -> None:
+        if not self._callback:
+            return
+        now = time.monotonic()
+        if (
+            status == self._last_status
+            and status not in _TERMINAL_STATUSES
+            and now - self._last_progress < PROGRESS_UPDATE_INTERVAL
+        ):
+            return
+        self._last_progress = now
+        self._last_status = status
+        # A snapshot: the reporter delivers it after the stats have moved on
+        extra_data = {**self._stats, **kwargs} if kwargs else self._stats.copy()
+        self._callback(status, percentage, message, extra_data)
+
+
+class _BatchImporter:
+    """Imports embedded batches of terms into one collection.
+
+    Holds what the batches of a load share: the statistics they update, the
+    batches that failed, the current batch size and, while it is being
+    calibrated, the batch sizes still to probe.
+    """
+
+    def __init__(
+        self,
+        collection,
+        logger: logging.Logger,
+        embedding_stats: dict[str, Any],
+        update_progress: _ThrottledProgress,
+        cancellation_check: Optional[Callable[[], bool]],
+        total_terms: Optional[int],
+        batch_size: int,
+        probe_sizes: list[int],
+        on_calibrated: Callable[[int], None]
+    ):
+        self.collection = collection
+        self.logger = logger
+        self.embedding_stats = embedding_stats
+        self.update_progress = update_progress
+        self.cancellation_check = cancellation_check
+        self.total_terms = total_terms
+        self.batch_size = batch_size
+        self.probe_sizes = probe_sizes
+        self.probe_rates: dict[int, float] = {}
+        self._on_calibrated = on_calibrated
+        # Terms handed to import so far, across batches
+        self.consumed_terms = 0
+        self.failed_batches: list[tuple[int, str]] = []
+        self.throughput_ema: Optional[float] = None
+
+        batch_config = EMBEDDINGS_CONFIG.get("processing", {})
+        self.retry_failed = batch_config.get("retry_failed", True)
+        self.max_retries = batch_config.get("max_retries", 3)
+        perf_config = EMBEDDINGS_CONFIG.get("performance", {})
+        rate_limit_delay = perf_config.get("rate_limit_delay", 0.1)
+        self.retry_base_delay = perf_config.get("retry_base_delay", rate_limit_delay)
+        self.retry_max_delay = perf_config.get("retry_max_delay", 60)
+        # With a request limiter configured, batches need no fixed pause between them
+        self.batch_delay = 0 if perf_config.get("max_requests_per_minute") else rate_limit_delay
+
+        self.use_server_side_batching = batch_config.get("server_side_batching", False)
+        self.use_bulk_insert = batch_config.get("bulk_insert", False) and not self.use_server_side_batching
+        # Weaviate requests each import batch is split into. A fixed split keeps
+        # a predictable number of objects in flight, where the dynamic batcher
+        # shrinks its batches whenever the server queue backs up.
+        self.max_concurrent_batches = perf_config.get("max_concurrent_batches")
+        # Whole batches imported at once. Only insert_many calls are independent
+        # of each other; the batch builders of one collection share state.
+        max_concurrent_imports = perf_config.get("max_concurrent_imports", 1)
+        self._in_flight: Optional[set[asyncio.Future]] = None
+        if max_concurrent_imports > 1 and self.use_bulk_insert:
+            self._in_flight = set()
+            self._import_slots = asyncio.Semaphore(max_concurrent_imports)
+
+        total_batches = 0
+        if total_terms is not None:
+            total_batches = len(probe_sizes) + -(-max(total_terms - sum(probe_sizes), 0) // batch_size)
+        embedding_stats["total_batches"] = total_batches
+        self.batches_label = total_batches if total_terms is not None else "?"
+
+    @property
+    def current_batch_size(self) -> int:
+        """Size of the next batch: the next probe size while calibrating."""
+        return self.probe_sizes[0] if self.probe_sizes else self.batch_size
+
+    def _open_batch(self, item_count: int):
+        if self.use_server_side_batching:
+            try:
+                # Server-side streaming: Weaviate applies its own back-pressure
+                if self.max_concurrent_batches:
+                    return self.collection.batch.stream(concurrency=self.max_concurrent_batches)
+                return self.collection.batch.stream()
+            except WeaviateUnsupportedFeatureError as e:
+                self.logger.warning(f"Server-side batching unavailable, using client-side batching: {e}")
+                self.use_server_side_batching = False
+        concurrent_requests = self.max_concurrent_batches or 2
+        return self.collection.batch.fixed_size(
+            batch_size=max(1, -(-item_count // concurrent_requests)),
+            concurrent_requests=concurrent_requests
+        )
+
+    def import_items(
+        self, items: list[tuple[dict, Optional[Vector]]], retry: bool = False
+    ) -> list[tuple[dict, Optional[Vector]]]:
+        """Import items with the v4 batch API and return the failed items.
+
+        Failed items are retried by the caller and only counted as failed terms once it gives up.
+        A batch builder reports failures only once it is closed, so retries of
+        the (usually few) failed items skip its setup and go out with insert_many.
+        """
+        collection = self.collection
+        if self.use_bulk_insert or retry:
+            # One gRPC request per batch instead of one add_object call per term
+            result = collection.data.insert_many([
+                wvc.data.DataObject(
+                    properties=term,
+                    uuid=generate_uuid5(term["term_id"]),
+                    vector=list(vector) if vector is not None else None
+                )
+                for term, vector in items
+            ])
+            for index, error in result.errors.items():
+                self.logger.error("Weaviate rejected term %s: %s", items[index][0]["term_id"], error.message)
+            return [items[index] for index in result.errors]
+
+        with self._open_batch(len(items)) as batch:
+            for term, vector in items:
+                batch.add_object(
+                    term,
+                    uuid=generate_uuid5(term["term_id"]),
+                    vector=list(vector) if vector is not None else None
+                )
+
+        # The client collects per-object failures; they are only complete
+        # once the batch is flushed, so they are read in one pass afterwards
+        rejected = {
+            error.object_.properties.get("term_id"): error.message
+            for error in collection.batch.failed_objects
+        }
+        if not rejected:
+            return []
+        for term_id, message in rejected.items():
+            self.logger.error("Weaviate rejected term %s: %s", term_id, message)
+        return [(term, vector) for term, vector in items if term["term_id"] in rejected]
+
+    async def submit(
+        self,
+        batch_num: int,
+        batch_terms: list[dict],
+        batch_items: list[tuple[dict, Optional[Vector]]],
+        progress_percentage: int,
+        batch_started: float
+    ) -> None:
+        """Import a batch, in the background when concurrent imports are enabled."""
+        if self._in_flight is None or self.probe_sizes:
+            # Probe batches are timed on their own
+            await self.import_batch(batch_num, batch_terms, batch_items, progress_percentage, batch_started)
+            return
+        # Up to max_concurrent_imports batches are imported at once
+        await self._import_slots.acquire()
+        import_task = asyncio.ensure_future(
+            self.import_batch(batch_num, batch_terms, batch_items, progress_percentage, batch_started)
+        )
+        self._in_flight.add(import_task)
+        import_task.add_done_callback(self._in_flight.discard)
+        import_task.add_done_callback(lambda _: self._import_slots.release())
+
+    async def wait(self) -> None:
+        """Wait for the batches still being imported in the background."""
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+
+    def cancel(self) -> None:
+        """Cancel the batches still being imported in the background."""
+        for import_task in list(self._in_flight or ()):
+            import_task.cancel()
+
+    def _cancelled(self) -> bool:
+        return bool(self.cancellation_check and self.cancellation_check())
+
+    async def import_batch(
+        self,
+        batch_num: int,
+        batch_terms: list[dict],
+        batch_items: list[tuple[dict, Optional[Vector]]],
+        progress_percentage: int,
+        batch_started: float
+    ) -> None:
+        """Import one batch with retries, recording its outcome in the statistics.
+
+        A cancellation seen between retries only stops this batch; the batch
+        loop reports it.
+        """
+        embedding_stats = self.embedding_stats
+        update_progress = self.update_progress
+        # Retry logic for batch processing
+        batch_retry_count = 0
+        batch_success = False
+        import_seconds = 0.0
+
+        while batch_retry_count <= self.max_retries and not batch_success:
+            try:
+                # The sync batch API blocks, so it runs in a thread while
+                # the next window's embeddings are fetched on the loop
+                import_started = time.perf_counter()
+                batch_failed_items = await asyncio.to_thread(self.import_items, batch_items, batch_retry_count > 0)
+                import_seconds += time.perf_counter() - import_started
+
+                # If some terms succeeded, count the batch as partially successful
+                successful_terms = len(batch_items) - len(batch_failed_items)
+                embedding_stats["processed_terms"] += successful_terms
+
+                if len(batch_failed_items) == 0:
+                    batch_success = True
+                    embedding_stats["batches_completed"] += 1
+                else:
+                    # Check for cancellation before retry
+                    if self._cancelled():
+                        return
+
+                    # Retry only failed terms
+                    if self.retry_failed and batch_retry_count < self.max_retries:
+                        batch_items = batch_failed_items
+                        batch_retry_count += 1
+                        embedding_stats["retry_count"] += 1
+                        update_progress(
+                            "retrying_batch",
+                            progress_percentage,
+                            f"Retrying {len(batch_failed_items)} failed terms from batch {batch_num}"
+                        )
+                        await asyncio.sleep(
+                            retry_delay(None, batch_retry_count, self.retry_base_delay, self.retry_max_delay)
+                        )
+                        continue
+                    else:
+                        batch_success = True  # Move on even with failures
+                        embedding_stats["failed_terms"] += len(batch_failed_items)
+                        embedding_stats["batches_completed"] += 1
+
+                # Add rate limiting delay
+                if self.batch_delay > 0 and not self.use_server_side_batching and (
+                    self.total_terms is None or self.consumed_terms < self.total_terms
+                ):
+                    await asyncio.sleep(self.batch_delay)
+
+            except (RateLimitError, APIError) as e:
+                # Handle OpenAI API errors
+                self.logger.error("OpenAI API error in batch %d: %s", batch_num, e)
+
+                # Check for cancellation before retry
+                if self._cancelled():
+                    return
+
+                if batch_retry_count < self.max_retries:
+                    batch_retry_count += 1
+                    embedding_stats["retry_count"] += 1
+                    wait_time = retry_delay(e, batch_retry_count, self.retry_base_delay, self.retry_max_delay)
+                    update_progress(
+                        "rate_limited",
+                        progress_percentage,
+                        f"Rate limited on batch {batch_num}, waiting {wait_time:.1f}s before retry..."
+                    )
+
+                    await asyncio.sleep(wait_time)
+                else:
+                    self.failed_batches.append((batch_num, str(e)))
+                    update_progress(
+                        "batch_error",
+                        progress_percentage,
+                        f"Batch {batch_num} failed after {self.max_retries} retries: {str(e)}"
+                    )
+                    break
+
+            except WeaviateBaseError as e:
+                # Handle Weaviate errors
+                self.logger.error("Weaviate error in batch %d: %s", batch_num, e)
+
+                # Check for cancellation before retry
+                if self._cancelled():
+                    return
+
+                if batch_retry_count < self.max_retries:
+                    batch_retry_count += 1
+                    embedding_stats["retry_count"] += 1
+                    update_progress(
+                        "weaviate_error",
+                        progress_percentage,
+                        f"Weaviate error on batch {batch_num}, retrying..."
+                    )
+                    await asyncio.sleep(
+                        retry_delay(e, batch_retry_count, self.retry_base_delay, self.retry_max_delay)
+                    )
+                else:
+                    self.failed_batches.append((batch_num, str(e)))
+                    update_progress(
+                        "batch_error",
+                        progress_percentage,
+                        f"Batch {batch_num} failed with Weaviate error: {str(e)}"
+                    )
+                    break
+
+            except Exception as e:
+                # Handle unexpected errors
+                self.logger.error("Unexpected error in batch %d: %s", batch_num, e)
+                self.failed_batches.append((batch_num, str(e)))
+                update_progress(
+                    "batch_error",
+                    progress_percentage,
+                    f"Batch {batch_num} encountered unexpected error: {str(e)}"
+                )
+                break
+
+        if self.probe_sizes and batch_success:
+            self._record_probe(batch_num, len(batch_items) / max(import_seconds, 1e-6))
+
+        # Smoothed import throughput, to help tune batch_size and concurrency
+        batch_rate = len(batch_terms) / max(time.time() - batch_started, 1e-6)
+        self.throughput_ema = (
+            batch_rate if self.throughput_ema is None else 0.2 * batch_rate + 0.8 * self.throughput_ema
+        )
+        if batch_num % 10 == 0:
+            self.logger.info("Batch %d/%s: ~%.1f terms/s", batch_num, self.batches_label, self.throughput_ema)
+
+    def _record_probe(self, batch_num: int, rate: float) -> None:
+        """Record the throughput of a probe batch; after the last probe, switch to the fastest size."""
+        self.probe_rates[self.probe_sizes.pop(0)] = rate
+        if self.probe_sizes:
+            return
+        self.batch_size = _calibrated_batch_size(self.probe_rates)
+        self._on_calibrated(self.batch_size)
+        self.logger.info(
+            f"Calibrated import batch size {self.batch_size}: "
+            + ", ".join(f"{size}: {rate:.1f} terms/s" for size, rate in self.probe_rates.items())
+        )
+        if self.total_terms is not None:
+            self.embedding_stats["total_batches"] = (
+                batch_num + -(-(self.total_terms - self.consumed_terms) // self.batch_size)
+            )
+            self.batches_label = self.embedding_stats["total_batches"]
 
 
 class OntologyManager:
@@ -18,168 +733,485 @@ class OntologyManager:
 
     def __init__(self) -> None:
         self._client: Optional[weaviate.WeaviateClient] = None
+        self._client_lock = asyncio.Lock()
+        # Native async client for the request path; the sync client above is
+        # kept for ingestion, which relies on the sync batch API
+        self._async_client: Optional[weaviate.WeaviateAsyncClient] = None
+        self._async_client_lock = asyncio.Lock()
+        self._openai_client: Optional[openai.AsyncOpenAI] = None
+        self._openai_api_key: Optional[str] = None
+        self._rate_limiter: Optional[_RateLimiter] = None
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._passage_cache: Optional[PassageEmbeddingCache] = None
+        # Calibrated import batch sizes, keyed by embedding model and ontology
+        self._tuned_batch_sizes: dict[str, int] = {}
         self.config_updater = ConfigUpdater()
         self.logger = logging.getLogger(__name__)
 
     async def _init_client(self) -> weaviate.WeaviateClient:
-        # Extract host and port from URL
-        url_parts = WEAVIATE_URL.replace("http://", "").replace("https://", "").split(":")
-        host = url_parts[0]
-        port = int(url_parts[1]) if len(url_parts) > 1 else 8080
-
+        # Connecting the sync client blocks on network I/O, so keep it off the event loop
         if WEAVIATE_API_KEY:
-            client = weaviate.connect_to_weaviate_cloud(
+            client = await asyncio.to_thread(
+                weaviate.connect_to_weaviate_cloud,
                 cluster_url=WEAVIATE_URL,
-                auth_credentials=weaviate.auth.Auth.api_key(WEAVIATE_API_KEY)
+                auth_credentials=weaviate.auth.Auth.api_key(WEAVIATE_API_KEY),
+                additional_config=_INGESTION_CLIENT_CONFIG
             )
         else:
-            client = weaviate.connect_to_local(
-                host=host,
-                port=port
+            client = await asyncio.to_thread(
+                weaviate.connect_to_local,
+                host=_WEAVIATE_HOST,
+                port=_WEAVIATE_PORT,
+                grpc_port=WEAVIATE_GRPC_PORT,
+                additional_config=_INGESTION_CLIENT_CONFIG
             )
         return client
 
     async def get_weaviate_client(self) -> weaviate.WeaviateClient:
-        if self._client is None:
-            self._client = await self._init_client()
+        async with self._client_lock:
+            if self._client is None:
+                self._client = await self._init_client()
         return self._client
 
+    async def get_async_weaviate_client(self) -> weaviate.WeaviateAsyncClient:
+        # Every search asks for the client; once it is connected skip the lock
+        if self._async_client is not None:
+            return self._async_client
+        async with self._async_client_lock:
+            if self._async_client is None:
+                if WEAVIATE_API_KEY:
+                    client = weaviate.use_async_with_weaviate_cloud(
+                        cluster_url=WEAVIATE_URL,
+                        auth_credentials=weaviate.auth.Auth.api_key(WEAVIATE_API_KEY)
+                    )
+                else:
+                    client = weaviate.use_async_with_local(
+                        host=_WEAVIATE_HOST, port=_WEAVIATE_PORT, grpc_port=WEAVIATE_GRPC_PORT
+                    )
+                await client.connect()
+                self._async_client = client
+        return self._async_client
+
+    async def warmup(self) -> None:
+        """Open the request-path Weaviate connection before the first request needs it."""
+        try:
+            await self.get_async_weaviate_client()
+        except Exception as e:
+            # Not fatal: the connection is retried lazily and /admin/weaviate_health reports it
+            self.logger.warning(f"Weaviate warmup failed: {e}")
+
+    async def close(self) -> None:
+        """Close the Weaviate and OpenAI connections opened by this manager."""
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._client is not None:
+            await asyncio.to_thread(self._client.close)
+            self._client = None
+
     async def check_weaviate_health(self) -> bool:
         """Check if Weaviate is healthy and accessible."""
         try:
-            client = await self.get_weaviate_client()
+            client = await self.get_async_weaviate_client()
             # Check if Weaviate is ready
-            return client.is_ready()
+            return await client.is_ready()
         except Exception as e:
             self.logger.error(f"Weaviate health check failed: {e}")
             return False
 
-    def get_current_ontology_version(self, ontology_name: str) -> Optional[str]:
-        return self.config_updater.get_current_ontology_version(ontology_name)
+    async def _collection_exists(self, client: weaviate.WeaviateClient, collection_name: str) -> bool:
+        # Asked of the server on every load: other workers and the admin API
+        # change the schema too, and exists() applies Weaviate's capitalization
+        # of stored names
+        return await asyncio.to_thread(client.collections.exists, collection_name)
+
+    async def get_openai_client(self, api_key: str) -> openai.AsyncOpenAI:
+        """Pooled async OpenAI client for ``api_key``, shared by imports and searches."""
+        if self._openai_client is None or self._openai_api_key != api_key:
+            previous = self._openai_client
+            # One pooled connection set for all concurrent embedding requests;
+            # with HTTP/2 they are multiplexed over a single connection
+            max_connections = EMBEDDINGS_CONFIG.get("performance", {}).get("max_concurrent_requests", 8)
+            self._openai_client = openai.AsyncOpenAI(
+                api_key=api_key,
+                http_client=httpx.AsyncClient(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                    timeout=httpx.Timeout(60.0, connect=5.0)
+                )
+            )
+            self._openai_api_key = api_key
+            # Swapped in before awaiting, so concurrent callers see the new
+            # client; the old key's pool is released instead of leaking
+            if previous is not None:
+                await previous.close()
+        return self._openai_client
+
+    async def _embed_texts(
+        self,
+        texts: list[str],
+        openai_api_key: str,
+        chunk_size: int,
+        max_concurrency: int,
+        stats: Optional[dict[str, Any]] = None,
+        token_counts: Optional[list[int]] = None
+    ) -> list[Optional[Vector]]:
+        """Embed texts client-side, keeping up to ``max_concurrency`` OpenAI requests in flight.
+
+        Returns one vector per input text, or ``None`` for texts whose chunk still
+        failed after the configured retries. The token usage of each request is
+        appended to ``token_counts`` when given.
+        """
+        client = await self.get_openai_client(openai_api_key)
+        request_options = {"model": get_embedding_model_name()}
+        if dimensions := get_embedding_dimensions():
+            request_options["dimensions"] = dimensions
+        processing = EMBEDDINGS_CONFIG.get("processing", {})
+        max_retries = processing.get("max_retries", 3) if processing.get("retry_failed", True) else 0
+        perf_config = EMBEDDINGS_CONFIG.get("performance", {})
+        retry_base_delay = perf_config.get("retry_base_delay", perf_config.get("rate_limit_delay", 0.1))
+        retry_max_delay = perf_config.get("retry_max_delay", 60)
+        rate_limiter = self._get_rate_limiter()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _embed(chunk: list[str]) -> list[Vector]:
+            async with semaphore:
+                for attempt in range(max_retries + 1):
+                    try:
+                        if rate_limiter is not None:
+                            await rate_limiter.acquire()
+                        response = await client.embeddings.create(input=chunk, **request_options)
+                        if token_counts is not None and response.usage is not None:
+                            token_counts.append(response.usage.total_tokens)
+                        return [array("f", item.embedding) for item in response.data]
+                    except (RateLimitError, APIError) as e:
+                        if attempt == max_retries:
+                            raise
+                        if stats is not None:
+                            stats["retry_count"] += 1
+                        await asyncio.sleep(retry_delay(e, attempt + 1, retry_base_delay, retry_max_delay))
+
+        chunks = self.chunk_embedding_inputs(texts, chunk_size)
+        results = await asyncio.gather(*(_embed(chunk) for chunk in chunks), return_exceptions=True)
+
+        vectors: list[Optional[Vector]] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                self.logger.error("Embedding request for %d texts failed: %s", len(chunk), result)
+                vectors.extend([None] * len(chunk))
+            else:
+                vectors.extend(result)
+        return vectors
+
+    def _get_rate_limiter(self) -> Optional[_RateLimiter]:
+        """Limiter shared by every embedding request of this manager, if ``max_requests_per_minute`` is set."""
+        max_rpm = EMBEDDINGS_CONFIG.get("performance", {}).get("max_requests_per_minute")
+        if not max_rpm:
+            return None
+        if self._rate_limiter is None or self._rate_limiter.max_rate != max_rpm:
+            self._rate_limiter = _RateLimiter(max_rpm, 60)
+        return self._rate_limiter
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        cache_config = EMBEDDINGS_CONFIG.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        if self._embedding_cache is None:
+            path = cache_config.get("path") or os.path.join(
+                os.environ.get("ONTOLOGY_DATA_DIR", "/app/data"), "embedding_cache.sqlite3"
+            )
+            self._embedding_cache = EmbeddingCache(path)
+        return self._embedding_cache
+
+    def get_passage_cache(self) -> Optional[PassageEmbeddingCache]:
+        """Cache of search passage vectors, kept apart from the term vectors it must not grow."""
+        cache_config = EMBEDDINGS_CONFIG.get("cache", {})
+        if not cache_config.get("enabled", False):
+            return None
+        if self._passage_cache is None:
+            path = cache_config.get("passage_path") or os.path.join(
+                os.environ.get("ONTOLOGY_DATA_DIR", "/app/data"), "passage_cache.sqlite3"
+            )
+            self._passage_cache = PassageEmbeddingCache(
+                path,
+                ttl_seconds=cache_config.get("passage_ttl_days", 30) * 86400,
+                max_entries=cache_config.get("passage_max_entries", 100000)
+            )
+        return self._passage_cache
 
-    def _extract_enhanced_term_data(self, raw_term: dict) -> dict:
-        """Extract all useful fields from GO/DO JSON for better semantic matching."""
-        # If the term is already parsed (has exact_synonyms, etc.), use it directly
-        if "exact_synonyms" in raw_term:
-            return {
-                "term_id": raw_term["id"],
-                "name": raw_term["name"],
-                "definition": raw_term.get("definition", ""),
-                "exact_synonyms": raw_term.get("exact_synonyms", []),
-                "narrow_synonyms": raw_term.get("narrow_synonyms", []),
-                "broad_synonyms": raw_term.get("broad_synonyms", []),
-                "all_synonyms": raw_term.get("all_synonyms", []),
-                "searchable_text": raw_term.get("searchable_text", "")
-            }
-
-        # Check if this is a raw GO/DO node (has 'lbl' and 'meta' structure)
-        if "lbl" in raw_term and "meta" in raw_term:
-            # Use the GO parser which handles both GO and DO formats
-            parsed_term = parse_enhanced_go_term(raw_term)
-            if parsed_term:
-                return {
-                    "term_id": parsed_term["id"],
-                    "name": parsed_term["name"],
-                    "definition": parsed_term.get("definition", ""),
-                    "exact_synonyms": parsed_term.get("exact_synonyms", []),
-                    "narrow_synonyms": parsed_term.get("narrow_synonyms", []),
-                    "broad_synonyms": parsed_term.get("broad_synonyms", []),
-                    "all_synonyms": parsed_term.get("all_synonyms", []),
-                    "searchable_text": ""  # Will be built by _build_searchable_text
-                }
-
-        # Fallback: extract basic fields from other formats
-        term_data = {
-            "term_id": raw_term.get("id", ""),
-            "name": raw_term.get("name", ""),
-            "definition": raw_term.get("definition", "")
-        }
+    async def _embed_texts_cached(
+        self,
+        texts: list[str],
+        openai_api_key: str,
+        chunk_size: int,
+        max_concurrency: int,
+        stats: Optional[dict[str, Any]] = None,
+        token_counts: Optional[list[int]] = None
+    ) -> list[Optional[Vector]]:
+        """Like ``_embed_texts``, but reuse cached vectors and only embed the cache misses.
+
+        Duplicate texts are embedded once and the vector shared by every term that produced them.
+        """
+        unique_index: dict[str, int] = {}
+        positions = [unique_index.setdefault(text, len(unique_index)) for text in texts]
+        if len(unique_index) < len(texts):
+            self.logger.info("Embedding %d unique texts for %d terms", len(unique_index), len(texts))
+            unique_vectors = await self._embed_texts_cached(
+                list(unique_index), openai_api_key, chunk_size, max_concurrency, stats, token_counts
+            )
+            return [unique_vectors[position] for position in positions]
 
-        # Initialize empty synonym arrays for unparsed data
-        term_data.update({
-            "exact_synonyms": [],
-            "narrow_synonyms": [],
-            "broad_synonyms": [],
-            "all_synonyms": [],
-            "searchable_text": ""  # Will be built by _build_searchable_text
-        })
+        try:
+            cache = self._get_embedding_cache()
+            if cache is None:
+                return await self._embed_texts(
+                    texts, openai_api_key, chunk_size, max_concurrency, stats, token_counts
+                )
+            signature = get_embedding_signature()
+
+            def lookup() -> tuple[list[str], dict[str, Sequence[float]]]:
+                # Hashing a window of texts is CPU work; it shares the lookup's thread
+                keys = [EmbeddingCache.make_key(signature, text) for text in texts]
+                return keys, cache.get_many(keys)
+
+            keys, cached = await asyncio.to_thread(lookup)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Embedding cache unavailable, embedding all terms: {e}")
+            return await self._embed_texts(
+                texts, openai_api_key, chunk_size, max_concurrency, stats, token_counts
+            )
 
-        return term_data
+        vectors: list[Optional[Vector]] = [cached.get(key) for key in keys]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        if stats is not None:
+            stats["cache_hits"] += len(texts) - len(misses)
+        self.logger.debug("Embedding cache: %d/%d hits", len(texts) - len(misses), len(texts))
+        if not misses:
+            return vectors
 
-    def _build_searchable_text(self, term_data: dict) -> str:
-        """Build comprehensive text for semantic search based on configuration."""
-        vectorize_fields = EMBEDDINGS_CONFIG.get("vectorize_fields", {})
-        preprocessing = EMBEDDINGS_CONFIG.get("preprocessing", {})
+        fresh = await self._embed_texts(
+            [texts[i] for i in misses], openai_api_key, chunk_size, max_concurrency, stats, token_counts
+        )
+        new_items = []
+        for i, vector in zip(misses, fresh):
+            vectors[i] = vector
+            if vector is not None:
+                new_items.append((keys[i], vector))
+        if new_items:
+            try:
+                await asyncio.to_thread(cache.put_many, new_items)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Failed to store embeddings in cache: {e}")
+        return vectors
+
+    @staticmethod
+    def chunk_embedding_inputs(texts: list[str], chunk_size: int) -> list[list[str]]:
+        """Split texts into consecutive request-sized chunks within OpenAI's input and token limits."""
+        max_inputs = max(1, min(chunk_size, MAX_OPENAI_EMBEDDING_INPUTS))
+        chunks: list[list[str]] = []
+        current: list[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = len(text) // 4
+            if current and (len(current) >= max_inputs or current_tokens + tokens > MAX_OPENAI_EMBEDDING_TOKENS):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _embed_window(
+        self,
+        terms: Iterator[dict],
+        window_size: int,
+        min_searchable_words: int,
+        openai_api_key: str,
+        request_size: int,
+        max_concurrency: int,
+        embedding_stats: dict[str, Any],
+        token_counts: list[int]
+    ) -> tuple[list[dict], list[Optional[Vector]]]:
+        """Take the next ``window_size`` enhanced terms and embed those worth embedding.
+
+        Returns the terms and their vectors, None for sparse terms. A window
+        shorter than ``window_size`` (possibly empty) means ``terms`` has run out.
+        """
+        def pull_window() -> tuple[list[dict], list[int]]:
+            window = list(itertools.islice(terms, window_size))
+            return window, [i for i, term in enumerate(window) if not _is_sparse(term, min_searchable_words)]
+
+        # Pulling a window prepares its terms: CPU work, or a wait on the
+        # preprocessing workers, so it is kept off the event loop together
+        # with picking out the terms worth embedding
+        window, dense = await asyncio.to_thread(pull_window)
+        dense_vectors = await self._embed_texts_cached(
+            [window[i]["searchable_text"] for i in dense],
+            openai_api_key,
+            request_size,
+            max_concurrency,
+            embedding_stats,
+            token_counts
+        )
+        vectors: list[Optional[Vector]] = [None] * len(window)
+        for i, vector in zip(dense, dense_vectors):
+            vectors[i] = vector
+        return window, vectors
 
-        components = []
+    def start_window_embedding(
+        self,
+        terms: Iterator[dict],
+        window_size: int,
+        min_searchable_words: int,
+        openai_api_key: str,
+        request_size: int,
+        max_concurrency: int,
+        embedding_stats: dict[str, Any],
+        token_counts: list[int]
+    ) -> "asyncio.Future[tuple[list[dict], list[Optional[Vector]]]]":
+        """Start embedding the next window of ``terms`` (see ``_embed_window``) in the background."""
+        return asyncio.ensure_future(self._embed_window(
+            terms,
+            window_size,
+            min_searchable_words,
+            openai_api_key,
+            request_size,
+            max_concurrency,
+            embedding_stats,
+            token_counts
+        ))
 
-        # Add fields based on configuration
-        if vectorize_fields.get("name", True):
-            name = term_data.get("name", "")
-            if name:
-                components.append(name)
+    def get_current_ontology_version(self, ontology_name: str) -> Optional[str]:
+        return self.config_updater.get_current_ontology_version(ontology_name)
 
-        if vectorize_fields.get("definition", True):
-            definition = term_data.get("definition", "")
-            if definition:
-                components.append(definition)
+    def _extract_enhanced_term_data(self, raw_term: dict) -> dict:
+        """Extract all useful fields from GO/DO JSON for better semantic matching."""
+        return _extract_term_fields(raw_term)
 
-        if vectorize_fields.get("synonyms", True):
-            # Add all synonyms for richer semantic content
-            components.extend(term_data.get("exact_synonyms", []))
-            components.extend(term_data.get("narrow_synonyms", []))
-            components.extend(term_data.get("broad_synonyms", []))
+    def _build_searchable_text(self, term_data: dict, text_config: Optional[_SearchableTextConfig] = None) -> str:
+        """Build comprehensive text for semantic search based on configuration."""
+        return (text_config or _SearchableTextConfig.from_config(EMBEDDINGS_CONFIG)).build(term_data)
 
-        # Apply preprocessing
-        if preprocessing.get("lowercase", False):
-            components = [c.lower() for c in components if c]
+    def _iter_enhanced_terms(
+        self, ontology_terms: Iterable[dict], executor: Optional[Executor] = None
+    ) -> Iterator[dict]:
+        """Iterate over the terms with their enhanced fields and searchable text, in input order.
 
-        if preprocessing.get("remove_punctuation", False):
-            import string
-            translator = str.maketrans('', '', string.punctuation)
-            components = [c.translate(translator) for c in components if c]
+        With an ``executor``, terms are enhanced in its worker processes in chunks.
+        """
+        # Resolved once per import rather than once per term
+        text_config = _SearchableTextConfig.from_config(EMBEDDINGS_CONFIG)
+        signature = get_embedding_signature()
+        if executor is None:
+            return (_enhance_term(term, text_config, signature) for term in ontology_terms)
+        return executor.map(
+            _enhance_term,
+            ontology_terms,
+            itertools.repeat(text_config),
+            itertools.repeat(signature),
+            chunksize=_PREPROCESS_CHUNK
+        )
 
-        # Join with configured separator
-        separator = preprocessing.get("combine_fields_separator", " | ")
-        return separator.join(filter(None, components))
+    @staticmethod
+    def _read_content_hashes(collection) -> Optional[dict[str, str]]:
+        """Map each stored term ID to its content hash; None if the collection has no hashes."""
+        if not any(prop.name == "content_hash" for prop in collection.config.get().properties):
+            return None
+        return {
+            obj.properties["term_id"]: obj.properties["content_hash"]
+            for obj in collection.iterator(
+                return_properties=["term_id", "content_hash"], cache_size=_HASH_PAGE_SIZE
+            )
+        }
 
     async def create_and_load_ontology_collection(
         self,
         collection_name: str,
-        ontology_terms: list[dict],
+        ontology_terms: Iterable[dict],
         openai_api_key: str,
-        progress_callback: Optional[Callable[[str, int, str, dict[str, Any]], None]] = None,
-        cancellation_check: Optional[Callable[[], bool]] = None
+        progress_callback: Optional[ProgressCallback] = None,
+        cancellation_check: Optional[Callable[[], bool]] = None,
+        cancellation_event: Optional[asyncio.Event] = None,
+        hnsw_settings: Optional[dict] = None
     ) -> None:
         """Create Weaviate collection with richer ontology data and progress tracking.
 
         Args:
             collection_name: Name of the collection to create
-            ontology_terms: List of ontology terms to load
+            ontology_terms: Ontology terms to load; any iterable, consumed one embedding
+                            window at a time. Progress percentages need a sized collection.
             openai_api_key: OpenAI API key for embeddings
             progress_callback: Optional callback for progress updates
-                              (status, percentage, message, extra_data)
-            cancellation_check: Optional callback to check if operation should be cancelled
+                              (status, percentage, message, extra_data); it runs
+                              outside the import loop and may be a coroutine function
+            cancellation_check: Optional callback polled between batches. Cancelling the
+                                task running this coroutine stops it sooner, at whatever
+                                it is awaiting, and reports a "cancelled" status first.
+            cancellation_event: Optional event set to cancel; cheaper to check than a
+                                callback that has to look the request up. Checked
+                                before ``cancellation_check`` when both are given.
+            hnsw_settings: Optional HNSW settings of this ontology, overriding the
+                           ``hnsw`` section of the embeddings config key by key
         """
+        if cancellation_event is not None:
+            user_check = cancellation_check
+
+            def event_or_callback_check() -> bool:
+                return cancellation_event.is_set() or (user_check is not None and user_check())
+
+            cancellation_check = event_or_callback_check
+
+        if progress_callback is None:
+            await self._load_ontology_collection(
+                collection_name, ontology_terms, openai_api_key, None, cancellation_check, hnsw_settings
+            )
+            return
+
+        reporter = _ProgressReporter(progress_callback, self.logger)
+        try:
+            await self._load_ontology_collection(
+                collection_name, ontology_terms, openai_api_key, reporter.report, cancellation_check, hnsw_settings
+            )
+        finally:
+            # Deliver the final status before returning to the caller
+            await reporter.aclose()
+
+    async def _load_ontology_collection(
+        self,
+        collection_name: str,
+        ontology_terms: Iterable[dict],
+        openai_api_key: str,
+        progress_callback: Optional[Callable[[str, int, str, dict[str, Any]], None]],
+        cancellation_check: Optional[Callable[[], bool]],
+        hnsw_settings: Optional[dict] = None
+    ) -> None:
         client = await self.get_weaviate_client()
+        # Unknown for a plain iterator; then counted as terms are read
+        total_terms: Optional[int] = len(ontology_terms) if isinstance(ontology_terms, Sized) else None
 
         # Initialize embedding statistics
         embedding_stats = {
-            "total_terms": len(ontology_terms),
+            "total_terms": total_terms or 0,
             "processed_terms": 0,
             "failed_terms": 0,
             "retry_count": 0,
+            "cache_hits": 0,
+            "skipped_sparse_terms": 0,
+            "unchanged_terms": 0,
+            "removed_terms": 0,
             "token_usage": 0,
             "start_time": time.time(),
             "batches_completed": 0,
             "total_batches": 0
         }
 
-        def update_progress(status: str, percentage: int, message: str, **kwargs):
-            """Update progress with additional data."""
-            if progress_callback:
-                extra_data = {**embedding_stats, **kwargs}
-                progress_callback(status, percentage, message, extra_data)
+        # Per-request token usage, summed once at the end rather than on every request
+        token_counts: list[int] = []
+        update_progress = _ThrottledProgress(progress_callback, embedding_stats)
 
         update_progress("initializing", 0, "Initializing embedding generation...")
 
@@ -188,324 +1220,296 @@ class OntologyManager:
             update_progress("cancelled", 0, "Operation cancelled by user")
             return
 
-        # Delete existing collection if it exists
+        # Optional vector index tuning; Weaviate's defaults apply to unset keys
+        hnsw_config = {**EMBEDDINGS_CONFIG.get("hnsw", {}), **(hnsw_settings or {})}
+
+        # An existing collection whose objects carry content hashes is updated
+        # in place: only new and changed terms are embedded and written
+        existing_hashes: Optional[dict[str, str]] = None
+        if EMBEDDINGS_CONFIG.get("processing", {}).get("incremental_reload", False) and \
+                await self._collection_exists(client, collection_name):
+            existing_hashes = await asyncio.to_thread(
+                self._read_content_hashes, client.collections.get(collection_name)
+            )
+            if existing_hashes is not None:
+                self.logger.info(f"Reloading {collection_name} incrementally ({len(existing_hashes)} stored terms)")
+                update_progress("initializing", 5, f"Comparing with {len(existing_hashes)} stored terms")
+            else:
+                # Created before content hashes were stored: migrated by a full
+                # rebuild, after which later reloads are incremental
+                self.logger.info(f"{collection_name} has no content hashes; rebuilding it in full")
+
+        # Delete existing collection if it exists, so no delete is issued for a
+        # new name and a missing collection is not an error path
         try:
-            await asyncio.to_thread(client.collections.delete, collection_name)
-            self.logger.info(f"Deleted existing collection: {collection_name}")
-            update_progress("initializing", 5, f"Deleted existing collection: {collection_name}")
+            if existing_hashes is None and await self._collection_exists(client, collection_name):
+                await asyncio.to_thread(client.collections.delete, collection_name)
+                self.logger.info(f"Deleted existing collection: {collection_name}")
+                update_progress("initializing", 5, f"Deleted existing collection: {collection_name}")
         except WeaviateBaseError as e:
-            if "not found" not in str(e).lower():
-                self.logger.error(f"Error deleting collection: {e}")
-                update_progress("error", 0, f"Failed to delete existing collection: {str(e)}")
-                raise
-        except Exception as e:
-            self.logger.warning(f"Collection might not exist: {e}")
+            self.logger.error(f"Error deleting collection: {e}")
+            update_progress("error", 0, f"Failed to delete existing collection: {str(e)}")
+            raise
 
         # Check for cancellation before creating collection
         if cancellation_check and cancellation_check():
             update_progress("cancelled", 0, "Operation cancelled by user")
             return
 
-        # Create enhanced collection with synonym support
-        self.logger.info(f"Creating enhanced collection: {collection_name}")
-        update_progress("creating_collection", 10, f"Creating collection: {collection_name}")
-
-        # Get embedding model configuration
-        embedding_model = EMBEDDINGS_CONFIG.get("model", {})
-        model_name = embedding_model.get("name", "text-ada-002")
-
-        # Map model names to Weaviate configuration
-        if model_name == "text-ada-002":
-            vectorizer_model = "ada"
-            model_version = "002"
-        elif model_name == "text-embedding-3-small":
-            vectorizer_model = "text-embedding-3-small"
-            model_version = None
-        elif model_name == "text-embedding-3-large":
-            vectorizer_model = "text-embedding-3-large"
-            model_version = None
-        else:
-            vectorizer_model = "ada"
-            model_version = "002"
-
-        # Create the collection with proper v4 API
-        vectorizer_kwargs = {
-            "model": vectorizer_model,
-            "type_": "text"
-        }
-        if model_version:
-            vectorizer_kwargs["model_version"] = model_version
-
-        await asyncio.to_thread(
-            client.collections.create,
-            name=collection_name,
-            vectorizer_config=wvc.config.Configure.Vectorizer.text2vec_openai(**vectorizer_kwargs),
-            properties=[
-                wvc.config.Property(
-                    name="term_id",
-                    data_type=wvc.config.DataType.TEXT
-                ),
-                wvc.config.Property(
-                    name="name",
-                    data_type=wvc.config.DataType.TEXT
-                ),
-                wvc.config.Property(
-                    name="definition",
-                    data_type=wvc.config.DataType.TEXT
-                ),
-                wvc.config.Property(
-                    name="exact_synonyms",
-                    data_type=wvc.config.DataType.TEXT_ARRAY
-                ),
-                wvc.config.Property(
-                    name="narrow_synonyms",
-                    data_type=wvc.config.DataType.TEXT_ARRAY
-                ),
-                wvc.config.Property(
-                    name="broad_synonyms",
-                    data_type=wvc.config.DataType.TEXT_ARRAY
-                ),
-                wvc.config.Property(
-                    name="all_synonyms",
-                    data_type=wvc.config.DataType.TEXT_ARRAY
-                ),
-                wvc.config.Property(
-                    name="searchable_text",
-                    data_type=wvc.config.DataType.TEXT,
-                    skip_vectorization=False
-                )
-            ]
-        )
-        self.logger.info(f"Successfully created enhanced collection: {collection_name}")
-        update_progress("created_collection", 15, "Collection created successfully")
-
-        # Process and load enhanced term data
-        self.logger.info(f"Processing {len(ontology_terms)} terms for enhanced storage")
-        update_progress("processing_terms", 20, f"Processing {len(ontology_terms)} terms...")
-
-        enhanced_terms = []
-
-        for i, term in enumerate(ontology_terms):
-            # Check for cancellation during processing
-            if cancellation_check and cancellation_check():
-                update_progress("cancelled", 0, "Operation cancelled by user during term processing")
-                return
-
-            enhanced_term = self._extract_enhanced_term_data(term)
-            enhanced_term["searchable_text"] = self._build_searchable_text(enhanced_term)
-            enhanced_terms.append(enhanced_term)
-
-            # Update progress every 100 terms
-            if (i + 1) % 100 == 0:
-                percentage = 20 + int((i + 1) / len(ontology_terms) * 20)  # 20-40%
-                update_progress(
-                    "processing_terms",
-                    percentage,
-                    f"Processed {i + 1}/{len(ontology_terms)} terms"
-                )
-
-        update_progress("processing_complete", 40, f"Processed all {len(enhanced_terms)} terms")
+        if existing_hashes is None:
+            # Create enhanced collection with synonym support
+            self.logger.info(f"Creating enhanced collection: {collection_name}")
+            update_progress("creating_collection", 10, f"Creating collection: {collection_name}")
+
+            create_options = {}
+            # Graph build settings are fixed once the collection exists; a
+            # cheaper build speeds up bulk loads at some cost in recall
+            if hnsw_build_options := {
+                key: hnsw_config[key] for key in _HNSW_BUILD_SETTINGS if key in hnsw_config
+            }:
+                create_options["vector_index_config"] = wvc.config.Configure.VectorIndex.hnsw(**hnsw_build_options)
+            create_collection = functools.partial(
+                client.collections.create,
+                name=collection_name,
+                vectorizer_config=_VECTORIZER_CONFIG,
+                properties=list(_SCHEMA_PROPERTIES),
+                **create_options
+            )
+            try:
+                await asyncio.to_thread(create_collection)
+            except WeaviateBaseError as e:
+                if "already exists" not in str(e):
+                    raise
+                # Created by another worker since the existence check; replaced
+                # once, after checking again
+                self.logger.warning(f"{collection_name} was created concurrently; replacing it")
+                if await self._collection_exists(client, collection_name):
+                    await asyncio.to_thread(client.collections.delete, collection_name)
+                await asyncio.to_thread(create_collection)
+            self.logger.info(f"Successfully created enhanced collection: {collection_name}")
+            update_progress("created_collection", 15, "Collection created successfully")
+
+        # Terms are enhanced lazily, one embedding window at a time, so the raw
+        # and enhanced copies of the whole ontology never coexist in memory
+        terms_label = total_terms if total_terms is not None else "streamed"
+        self.logger.info(f"Processing {terms_label} terms for enhanced storage")
+        update_progress("processing_terms", 20, f"Processing {terms_label} terms...")
+        enhanced_iter: Optional[Iterator[dict]] = None
+
+        removed_term_ids: list[str] = []
+        if existing_hashes is not None:
+            # Objects are keyed by term ID, so importing a changed term overwrites it
+            changed_terms = []
+            for term in self._iter_enhanced_terms(ontology_terms):
+                if existing_hashes.pop(term["term_id"], None) != term["content_hash"]:
+                    changed_terms.append(term)
+                else:
+                    embedding_stats["unchanged_terms"] += 1
+            removed_term_ids = list(existing_hashes)
+            total_terms = embedding_stats["total_terms"] = len(changed_terms)
+            enhanced_iter = iter(changed_terms)
+            self.logger.info(
+                f"{total_terms} new or changed terms, {embedding_stats['unchanged_terms']} unchanged, "
+                f"{len(removed_term_ids)} removed"
+            )
 
         # Configure batch processing
         batch_config = EMBEDDINGS_CONFIG.get("processing", {})
-        batch_size = batch_config.get("batch_size", 100)
-        retry_failed = batch_config.get("retry_failed", True)
-        max_retries = batch_config.get("max_retries", 3)
+        batch_size = batch_config.get("batch_size", 200)
+        # The best batch size depends on the Weaviate deployment, so it can be
+        # measured: the first batches are imported at each probe size and the
+        # fastest is used from then on. Collections are named
+        # "<ontology>_<timestamp>", so the result carries over to later loads.
+        tuning_key = f"{get_embedding_model_name()}|{collection_name.rsplit('_', 1)[0]}"
+        probe_sizes: list[int] = []
+        if batch_config.get("auto_tune_batch_size", False):
+            if tuning_key in self._tuned_batch_sizes:
+                batch_size = self._tuned_batch_sizes[tuning_key]
+            elif total_terms is None or total_terms >= 2 * sum(_BATCH_SIZE_PROBES):
+                probe_sizes = list(_BATCH_SIZE_PROBES)
+        # Terms with fewer words than this are not worth an embedding
+        min_searchable_words = batch_config.get("min_searchable_words", 1)
 
         # Performance settings
         perf_config = EMBEDDINGS_CONFIG.get("performance", {})
-        rate_limit_delay = perf_config.get("rate_limit_delay", 0.1)
+        # Embedding requests for the next few batches run concurrently; each
+        # window is embedded up front and then imported batch by batch
+        max_concurrency = perf_config.get("max_concurrent_requests", 8) if batch_config.get("parallel_processing", True) else 1
+        # Texts per OpenAI request, tunable apart from the Weaviate import batch size
+        embedding_request_size = min(
+            batch_config.get("embedding_request_size", batch_size), MAX_OPENAI_EMBEDDING_INPUTS
+        )
+        # Whole import batches, enough to keep max_concurrency requests busy
+        embed_window = batch_size * max_concurrency * -(-embedding_request_size // batch_size)
+        # Embedded terms not yet imported; batches are taken from the front
+        pending_terms: list[dict] = []
+        pending_vectors: list[Optional[Vector]] = []
 
-        # Calculate total batches
-        total_batches = (len(enhanced_terms) + batch_size - 1) // batch_size
-        embedding_stats["total_batches"] = total_batches
+        # Get the collection object
+        collection = client.collections.get(collection_name)
+
+        importer = _BatchImporter(
+            collection,
+            self.logger,
+            embedding_stats,
+            update_progress,
+            cancellation_check,
+            total_terms,
+            batch_size,
+            probe_sizes,
+            # The calibrated size is kept for later loads of the ontology
+            functools.partial(self._tuned_batch_sizes.__setitem__, tuning_key)
+        )
 
         # Batch import enhanced data with progress tracking
         self.logger.info(f"Starting enhanced batch import into {collection_name}")
         update_progress(
             "embedding_generation",
             45,
-            f"Starting embedding generation ({total_batches} batches, {batch_size} terms per batch)"
+            f"Starting embedding generation ({importer.batches_label} batches, {batch_size} terms per batch)"
         )
 
-        # Get the collection object
-        collection = client.collections.get(collection_name)
-
-        # Process terms in batches with detailed progress
-        failed_batches = []
-
-        for batch_idx in range(0, len(enhanced_terms), batch_size):
-            batch_terms = enhanced_terms[batch_idx:batch_idx + batch_size]
-            batch_num = (batch_idx // batch_size) + 1
-
-            # Calculate progress (45-95% for embedding generation)
-            progress_percentage = 45 + int((batch_idx / len(enhanced_terms)) * 50)
-
-            # Check for cancellation before each batch
-            if cancellation_check and cancellation_check():
-                update_progress("cancelled", progress_percentage, "Operation cancelled by user during batch processing")
-                return
-
-            update_progress(
-                "embedding_batch",
-                progress_percentage,
-                f"Processing batch {batch_num}/{total_batches} ({len(batch_terms)} terms)",
-                current_batch=batch_num,
-                batch_size=len(batch_terms)
-            )
-
-            # Retry logic for batch processing
-            batch_retry_count = 0
-            batch_success = False
-
-            while batch_retry_count <= max_retries and not batch_success:
-                try:
-                    # Use v4 batch API with error handling
-                    batch_failed_terms = []
-
-                    with collection.batch.dynamic() as batch:
-                        for idx, term in enumerate(batch_terms):
-                            # Check for cancellation every 10 terms within a batch
-                            if idx > 0 and idx % 10 == 0 and cancellation_check and cancellation_check():
-                                # Cancel the batch gracefully
-                                update_progress("cancelled", progress_percentage, "Operation cancelled by user during term processing")
-                                return
-
-                            try:
-                                batch.add_object({
-                                    "term_id": term["term_id"],
-                                    "name": term["name"],
-                                    "definition": term["definition"],
-                                    "exact_synonyms": term["exact_synonyms"],
-                                    "narrow_synonyms": term["narrow_synonyms"],
-                                    "broad_synonyms": term["broad_synonyms"],
-                                    "all_synonyms": term["all_synonyms"],
-                                    "searchable_text": term["searchable_text"]
-                                })
-                            except Exception as e:
-                                self.logger.error(f"Failed to add term {term.get('term_id')}: {e}")
-                                batch_failed_terms.append(term)
-                                embedding_stats["failed_terms"] += 1
-
-                    # If some terms succeeded, count the batch as partially successful
-                    successful_terms = len(batch_terms) - len(batch_failed_terms)
-                    embedding_stats["processed_terms"] += successful_terms
-
-                    if len(batch_failed_terms) == 0:
-                        batch_success = True
-                        embedding_stats["batches_completed"] += 1
-                    else:
-                        # Check for cancellation before retry
-                        if cancellation_check and cancellation_check():
-                            update_progress("cancelled", progress_percentage, "Operation cancelled by user before retry")
-                            return
-
-                        # Retry only failed terms
-                        if retry_failed and batch_retry_count < max_retries:
-                            batch_terms = batch_failed_terms
-                            batch_retry_count += 1
-                            embedding_stats["retry_count"] += 1
-                            update_progress(
-                                "retrying_batch",
-                                progress_percentage,
-                                f"Retrying {len(batch_failed_terms)} failed terms from batch {batch_num}"
-                            )
-                            await asyncio.sleep(rate_limit_delay * 2)  # Double delay for retries
-                            continue
-                        else:
-                            batch_success = True  # Move on even with failures
-                            embedding_stats["batches_completed"] += 1
-
-                    # Add rate limiting delay
-                    if rate_limit_delay > 0 and batch_idx + batch_size < len(enhanced_terms):
-                        await asyncio.sleep(rate_limit_delay)
-
-                except (RateLimitError, APIError) as e:
-                    # Handle OpenAI API errors
-                    self.logger.error(f"OpenAI API error in batch {batch_num}: {e}")
-
-                    # Check for cancellation before retry
-                    if cancellation_check and cancellation_check():
-                        update_progress("cancelled", progress_percentage, "Operation cancelled by user during rate limit handling")
-                        return
-
-                    if batch_retry_count < max_retries:
-                        batch_retry_count += 1
-                        embedding_stats["retry_count"] += 1
-                        wait_time = min(rate_limit_delay * (2 ** batch_retry_count), 60)  # Exponential backoff
-                        update_progress(
-                            "rate_limited",
-                            progress_percentage,
-                            f"Rate limited on batch {batch_num}, waiting {wait_time:.1f}s before retry..."
-                        )
-
-                        # Check for cancellation during wait with 1-second intervals
-                        for _ in range(int(wait_time)):
-                            if cancellation_check and cancellation_check():
-                                update_progress("cancelled", progress_percentage, "Operation cancelled by user during rate limit wait")
-                                return
-                            await asyncio.sleep(1)
-                        await asyncio.sleep(wait_time % 1)  # Sleep for remaining fraction
-                    else:
-                        failed_batches.append((batch_num, str(e)))
-                        update_progress(
-                            "batch_error",
-                            progress_percentage,
-                            f"Batch {batch_num} failed after {max_retries} retries: {str(e)}"
-                        )
-                        break
+        # Term preparation is CPU-bound and can be spread over worker processes.
+        # They are spawned rather than forked: the gRPC and HTTP client threads
+        # of this process are not fork-safe.
+        executor: Optional[ProcessPoolExecutor] = None
+        if enhanced_iter is None:
+            if preprocessing_workers := perf_config.get("preprocessing_workers", 0):
+                executor = ProcessPoolExecutor(
+                    max_workers=preprocessing_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            enhanced_iter = self._iter_enhanced_terms(ontology_terms, executor)
+
+        # Embeddings for the next window are requested while the current one is
+        # imported, so OpenAI latency overlaps with Weaviate import time
+        next_window: Optional[asyncio.Future] = None
+        start_next_window = functools.partial(
+            self.start_window_embedding,
+            enhanced_iter,
+            embed_window,
+            min_searchable_words,
+            openai_api_key,
+            embedding_request_size,
+            max_concurrency,
+            embedding_stats,
+            token_counts
+        )
 
-                except WeaviateBaseError as e:
-                    # Handle Weaviate errors
-                    self.logger.error(f"Weaviate error in batch {batch_num}: {e}")
+        try:
+            progress_percentage = 45
+            fetched_terms = 0
+            input_exhausted = False
+            for batch_num in itertools.count(1):
+                if total_terms is not None and importer.consumed_terms >= total_terms:
+                    break
+                batch_started = time.time()
+
+                # Calculate progress (45-95% for embedding generation)
+                progress_percentage = 45 + int((importer.consumed_terms / total_terms) * 50) if total_terms else 45
+
+                # Check for cancellation before each batch
+                if cancellation_check and cancellation_check():
+                    update_progress("cancelled", progress_percentage, "Operation cancelled by user during batch processing")
+                    return
+
+                current_batch_size = importer.current_batch_size
+                while len(pending_terms) < current_batch_size and not input_exhausted:
+                    window_terms, window_vectors = await (next_window or start_next_window())
+                    fetched_terms += len(window_terms)
+                    if total_terms is None:
+                        embedding_stats["total_terms"] += len(window_terms)
+                    # A short window means a streamed input has run out
+                    input_exhausted = len(window_terms) < embed_window or (
+                        total_terms is not None and fetched_terms >= total_terms
+                    )
+                    next_window = None if input_exhausted else start_next_window()
+                    pending_terms += window_terms
+                    pending_vectors += window_vectors
+                batch_terms = pending_terms[:current_batch_size]
+                batch_vectors = pending_vectors[:current_batch_size]
+                del pending_terms[:current_batch_size]
+                del pending_vectors[:current_batch_size]
+                if not batch_terms:
+                    break
+                importer.consumed_terms += len(batch_terms)
+                if total_terms is None:
+                    embedding_stats["total_batches"] = batch_num
 
-                    # Check for cancellation before retry
-                    if cancellation_check and cancellation_check():
-                        update_progress("cancelled", progress_percentage, "Operation cancelled by user during Weaviate error handling")
-                        return
+                update_progress(
+                    "embedding_batch",
+                    progress_percentage,
+                    f"Processing batch {batch_num}/{importer.batches_label} ({len(batch_terms)} terms)",
+                    current_batch=batch_num,
+                    batch_size=len(batch_terms)
+                )
 
-                    if batch_retry_count < max_retries:
-                        batch_retry_count += 1
-                        embedding_stats["retry_count"] += 1
-                        update_progress(
-                            "weaviate_error",
-                            progress_percentage,
-                            f"Weaviate error on batch {batch_num}, retrying..."
-                        )
-                        await asyncio.sleep(rate_limit_delay * 2)
+                # Terms whose embedding request failed cannot be imported
+                batch_items = []
+                for term, vector in zip(batch_terms, batch_vectors):
+                    if _is_sparse(term, min_searchable_words):
+                        # Imported without a vector: stored, but not matched by vector search
+                        embedding_stats["skipped_sparse_terms"] += 1
+                        batch_items.append((term, None))
+                    elif vector is None:
+                        embedding_stats["failed_terms"] += 1
                     else:
-                        failed_batches.append((batch_num, str(e)))
-                        update_progress(
-                            "batch_error",
-                            progress_percentage,
-                            f"Batch {batch_num} failed with Weaviate error: {str(e)}"
-                        )
-                        break
-
-                except Exception as e:
-                    # Handle unexpected errors
-                    self.logger.error(f"Unexpected error in batch {batch_num}: {e}")
-                    failed_batches.append((batch_num, str(e)))
-                    update_progress(
-                        "batch_error",
-                        progress_percentage,
-                        f"Batch {batch_num} encountered unexpected error: {str(e)}"
-                    )
-                    break
+                        batch_items.append((term, vector))
+                if len(batch_items) < len(batch_terms):
+                    importer.failed_batches.append((batch_num, f"Embedding failed for {len(batch_terms) - len(batch_items)} terms"))
+
+                await importer.submit(batch_num, batch_terms, batch_items, progress_percentage, batch_started)
+
+            await importer.wait()
+        except asyncio.CancelledError:
+            # The running task was cancelled; an import already handed to a
+            # worker thread still finishes, but nothing further is started
+            update_progress("cancelled", progress_percentage, "Operation cancelled by user")
+            raise
+        finally:
+            if next_window is not None:
+                next_window.cancel()
+            importer.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        # Terms dropped from the ontology since the last load. Collections with
+        # content hashes key objects by term ID, so deleting by ID is exact
+        # whereas a filter on the tokenized term_id text is not.
+        for i in range(0, len(removed_term_ids), _DELETE_CHUNK):
+            chunk = removed_term_ids[i:i + _DELETE_CHUNK]
+            await asyncio.to_thread(
+                collection.data.delete_many,
+                where=wvc.query.Filter.by_id().contains_any([generate_uuid5(term_id) for term_id in chunk])
+            )
+            embedding_stats["removed_terms"] += len(chunk)
+
+        # Query-time search width can be changed later, so it is applied once
+        # the collection is loaded and searches see the tuned index
+        hnsw_query_options = {key: hnsw_config[key] for key in _HNSW_QUERY_SETTINGS if key in hnsw_config}
+        if hnsw_query_options and not (cancellation_check and cancellation_check()):
+            try:
+                await asyncio.to_thread(
+                    collection.config.update,
+                    vector_index_config=wvc.config.Reconfigure.VectorIndex.hnsw(**hnsw_query_options)
+                )
+            except WeaviateBaseError as e:
+                self.logger.warning("Could not set the query-time HNSW settings of %s: %s", collection_name, e)
 
         # Calculate final statistics
         elapsed_time = time.time() - embedding_stats["start_time"]
         terms_per_second = embedding_stats["processed_terms"] / elapsed_time if elapsed_time > 0 else 0
+        embedding_stats["token_usage"] = sum(token_counts)
+        tokens_per_second = embedding_stats["token_usage"] / elapsed_time if elapsed_time > 0 else 0
 
         # Determine final status
         if cancellation_check and cancellation_check():
             final_status = "cancelled"
             final_message = f"Operation cancelled. Processed {embedding_stats['processed_terms']}/{embedding_stats['total_terms']} terms before cancellation"
-        elif len(failed_batches) > 0:
+        elif len(importer.failed_batches) > 0:
             final_status = "completed_with_errors"
             final_message = (
                 f"Completed with errors: {embedding_stats['processed_terms']} terms imported, "
-                f"{embedding_stats['failed_terms']} failed, {len(failed_batches)} batches had errors"
+                f"{embedding_stats['failed_terms']} failed, {len(importer.failed_batches)} batches had errors"
             )
         elif embedding_stats["failed_terms"] > 0:
             final_status = "completed_with_failures"
@@ -523,7 +1527,8 @@ class OntologyManager:
             final_message,
             elapsed_time=elapsed_time,
             terms_per_second=terms_per_second,
-            failed_batches=failed_batches
+            tokens_per_second=tokens_per_second,
+            failed_batches=importer.failed_batches
         )
 
         self.logger.info(
@@ -531,7 +1536,11 @@ class OntologyManager:
             f"{embedding_stats['processed_terms']} processed, "
             f"{embedding_stats['failed_terms']} failed, "
             f"{embedding_stats['retry_count']} retries, "
+            f"{embedding_stats['cache_hits']} cached embeddings, "
+            f"{embedding_stats['unchanged_terms']} unchanged, "
+            f"{embedding_stats['removed_terms']} removed, "
             f"{elapsed_time:.1f}s elapsed, "
-            f"{terms_per_second:.1f} terms/s"
+            f"{terms_per_second:.1f} terms/s, "
+            f"{embedding_stats['token_usage']} tokens ({tokens_per_second:.1f} tokens/s)"
         )
 
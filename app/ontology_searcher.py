@@ -1,13 +1,47 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
 import asyncio
 import logging
+import sqlite3
 
-import openai
 import weaviate
 import weaviate.classes as wvc
 
-from .config import OPENAI_API_KEY, DEFAULT_K
-from .ontology_manager import OntologyManager
+from .config import OPENAI_API_KEY, DEFAULT_K, EMBEDDINGS_CONFIG
+from .embedding_cache import EmbeddingCache
+from .ontology_manager import (
+    MAX_OPENAI_EMBEDDING_INPUTS,
+    OntologyManager,
+    get_embedding_dimensions,
+    get_embedding_model_name,
+    get_embedding_signature
+)
+
+
+# Returned for every search hit; the metadata carries its similarity scores
+_CANDIDATE_PROPERTIES = (
+    "term_id", "name", "definition", "exact_synonyms", "narrow_synonyms", "broad_synonyms", "all_synonyms"
+)
+_SIMILARITY_METADATA = wvc.query.MetadataQuery(distance=True, certainty=True)
+# Filtered searches also return the namespace they filter on
+_FILTERED_CANDIDATE_PROPERTIES = _CANDIDATE_PROPERTIES + ("namespace",)
+
+# Hits from which candidates are built off the event loop; below this the
+# thread hand-off costs more than building the dicts
+_THREADED_CANDIDATES_MIN = 200
+
+
+def _to_candidate(properties: Dict) -> Dict:
+    """Candidate for a returned object: its properties, with ``term_id`` renamed to ``id``.
+
+    The properties dict is fresh per query result, so it is taken over rather
+    than rebuilt field by field.
+    """
+    candidate = dict(properties)
+    candidate["id"] = candidate.pop("term_id", None)
+    # Not collection properties, but part of the candidate format
+    candidate.setdefault("cross_references", [])
+    candidate.setdefault("namespace", "")
+    return candidate
 
 
 class OntologySearcher:
@@ -15,16 +49,93 @@ class OntologySearcher:
     
     def __init__(self, manager: OntologyManager, openai_api_key: str = OPENAI_API_KEY):
         self.manager = manager
-        openai.api_key = openai_api_key
+        self.openai_api_key = openai_api_key
         self.logger = logging.getLogger(__name__)
+        # Collection handles of the client they were taken from
+        self._collections: Dict[str, Any] = {}
+        self._collections_client: Optional[weaviate.WeaviateAsyncClient] = None
+
+    def _get_collection(self, client: weaviate.WeaviateAsyncClient, ontology_collection: str) -> Any:
+        """Collection handle for ``ontology_collection``, reused while the client is."""
+        if client is not self._collections_client:
+            # Handles are bound to their client, so a reconnect starts afresh
+            self._collections = {}
+            self._collections_client = client
+        collection = self._collections.get(ontology_collection)
+        if collection is None:
+            collection = self._collections[ontology_collection] = client.collections.get(ontology_collection)
+        return collection
+
+    async def _request_embeddings(self, passages: List[str]) -> List[List[float]]:
+        """Embed passages with as few OpenAI requests as the API limits allow, in input order.
+
+        Passages beyond one request's input or token limit are split into
+        several requests, sent concurrently up to ``max_concurrent_requests``.
+        """
+        # Must match the model and size used to embed the collection's terms
+        request_options = {"model": get_embedding_model_name()}
+        if dimensions := get_embedding_dimensions():
+            request_options["dimensions"] = dimensions
+        # Shares the manager's pooled async client, so searches reuse warm connections
+        client = await self.manager.get_openai_client(self.openai_api_key)
+        semaphore = asyncio.Semaphore(
+            EMBEDDINGS_CONFIG.get("performance", {}).get("max_concurrent_requests", 8)
+        )
+
+        async def embed(chunk: List[str]) -> List[List[float]]:
+            async with semaphore:
+                response = await client.embeddings.create(input=chunk, **request_options)
+            return [item.embedding for item in response.data]
+
+        chunks = self.manager.chunk_embedding_inputs(passages, MAX_OPENAI_EMBEDDING_INPUTS)
+        results = await asyncio.gather(*(embed(chunk) for chunk in chunks))
+        return [embedding for result in results for embedding in result]
+
+    async def _embed_passages(self, passages: List[str]) -> List[List[float]]:
+        """Create embeddings for input passages, in input order.
+
+        Passages searched recently are taken from the manager's passage cache
+        rather than sent to OpenAI again, and a passage repeated within the
+        batch is embedded once.
+        """
+        unique_passages = list(dict.fromkeys(passages))
+        if len(unique_passages) < len(passages):
+            by_passage = dict(zip(unique_passages, await self._embed_passages(unique_passages)))
+            return [by_passage[passage] for passage in passages]
+        signature = get_embedding_signature()
+
+        def lookup():
+            cache = self.manager.get_passage_cache()
+            if cache is None:
+                return None, None, {}
+            keys = [EmbeddingCache.make_key(signature, passage) for passage in passages]
+            return cache, keys, cache.get_many(keys)
+
+        try:
+            cache, keys, cached = await asyncio.to_thread(lookup)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning("Embedding cache unavailable, embedding all passages: %s", e)
+            return await self._request_embeddings(passages)
+        if cache is None:
+            return await self._request_embeddings(passages)
+
+        # Cached vectors are float32 arrays; Weaviate only accepts lists or
+        # numpy-style arrays as query vectors, and packs either into bytes itself
+        embeddings = [cached[key].tolist() if key in cached else None for key in keys]
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if misses:
+            fresh = await self._request_embeddings([passages[i] for i in misses])
+            for i, embedding in zip(misses, fresh):
+                embeddings[i] = embedding
+            try:
+                await asyncio.to_thread(cache.put_many, [(keys[i], embeddings[i]) for i in misses])
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning("Failed to store passage embeddings in cache: %s", e)
+        return embeddings
 
     async def _embed_passage(self, passage: str) -> List[float]:
         """Create embedding for input passage."""
-        response = await openai.embeddings.create(
-            input=passage, 
-            model="text-embedding-ada-002"
-        )
-        return response.data[0].embedding
+        return (await self._embed_passages([passage]))[0]
 
     async def search_ontology(
         self, passage: str, ontology_collection: str, k: int = DEFAULT_K
@@ -35,63 +146,75 @@ class OntologySearcher:
         The search is performed against the 'searchable_text' field which contains
         name + definition + all synonyms for better semantic matching.
         """
-        client = await self.manager.get_weaviate_client()
+        client = await self.manager.get_async_weaviate_client()
         embedding = await self._embed_passage(passage)
-        
+        return await self._query_candidates(client, passage, ontology_collection, embedding, k)
+
+    async def search_ontology_batch(
+        self, passages: List[str], ontology_collection: str, k: int = DEFAULT_K
+    ) -> List[List[Dict]]:
+        """
+        Search several passages at once, returning one candidate list per passage.
+
+        All passages are embedded together, in as few OpenAI requests as the
+        API limits allow, and the vector queries then run concurrently.
+        """
+        if not passages:
+            return []
+        client = await self.manager.get_async_weaviate_client()
+        embeddings = await self._embed_passages(passages)
+        return list(await asyncio.gather(*(
+            self._query_candidates(client, passage, ontology_collection, embedding, k)
+            for passage, embedding in zip(passages, embeddings)
+        )))
+
+    async def _query_candidates(
+        self,
+        client: weaviate.WeaviateAsyncClient,
+        passage: str,
+        ontology_collection: str,
+        embedding: List[float],
+        k: int
+    ) -> List[Dict]:
+        """Run the near-vector query for one passage and build its candidates."""
         try:
             # Get the collection
-            collection = client.collections.get(ontology_collection)
+            collection = self._get_collection(client, ontology_collection)
             
             # Enhanced query using v4 API
-            response = await asyncio.to_thread(
-                lambda: collection.query.near_vector(
-                    near_vector=embedding,
-                    limit=k,
-                    return_properties=[
-                        "term_id", 
-                        "name", 
-                        "definition",
-                        "exact_synonyms",
-                        "narrow_synonyms", 
-                        "broad_synonyms",
-                        "all_synonyms"
-                    ],
-                    return_metadata=["distance", "certainty"]
-                )
+            response = await collection.query.near_vector(
+                near_vector=embedding,
+                limit=k,
+                return_properties=_CANDIDATE_PROPERTIES,
+                return_metadata=_SIMILARITY_METADATA
             )
             
         except Exception as e:
-            self.logger.exception(f"Weaviate query failed for collection {ontology_collection}")
+            self.logger.exception("Weaviate query failed for collection %s", ontology_collection)
             return []
         
-        candidates = []
+        if len(response.objects) >= _THREADED_CANDIDATES_MIN:
+            candidates = await asyncio.to_thread(self._build_candidates, response.objects)
+        else:
+            candidates = self._build_candidates(response.objects)
         
-        for obj in response.objects:
-            # Get similarity metadata
-            distance = obj.metadata.distance if obj.metadata.distance else 1.0
-            certainty = obj.metadata.certainty if obj.metadata.certainty else 0.0
-            
-            candidate = {
-                "id": obj.properties.get("term_id"),
-                "name": obj.properties.get("name"),
-                "definition": obj.properties.get("definition"),
-                "exact_synonyms": obj.properties.get("exact_synonyms", []),
-                "narrow_synonyms": obj.properties.get("narrow_synonyms", []),
-                "broad_synonyms": obj.properties.get("broad_synonyms", []),
-                "all_synonyms": obj.properties.get("all_synonyms", []),
-                "cross_references": obj.properties.get("cross_references", []),
-                "namespace": obj.properties.get("namespace", ""),
-                "similarity_distance": distance,
-                "similarity_certainty": certainty
-            }
-            candidates.append(candidate)
-        
-        self.logger.info(
-            f"Found {len(candidates)} candidates for passage: '{passage[:50]}...'"
-        )
+        # %.50s truncates the passage only if the record is emitted
+        self.logger.info("Found %d candidates for passage: '%.50s...'", len(candidates), passage)
         
         return candidates
 
+    @staticmethod
+    def _build_candidates(objects) -> List[Dict]:
+        """Build the candidates of a query's returned objects, with their similarity scores."""
+        candidates = []
+        for obj in objects:
+            candidate = _to_candidate(obj.properties)
+            # Similarity metadata
+            candidate["similarity_distance"] = obj.metadata.distance or 1.0
+            candidate["similarity_certainty"] = obj.metadata.certainty or 0.0
+            candidates.append(candidate)
+        return candidates
+
     async def search_with_filters(
         self, 
         passage: str, 
@@ -103,49 +226,27 @@ class OntologySearcher:
         Enhanced search with optional filtering by GO namespace 
         (biological_process, molecular_function, cellular_component).
         """
-        client = await self.manager.get_weaviate_client()
+        client = await self.manager.get_async_weaviate_client()
         embedding = await self._embed_passage(passage)
         
         try:
             # Get the collection
-            collection = client.collections.get(ontology_collection)
+            collection = self._get_collection(client, ontology_collection)
             
             # Build the query with optional filtering
             where_filter = None
             if namespace_filter:
                 where_filter = wvc.query.Filter.by_property("namespace").equal(namespace_filter)
             
-            response = await asyncio.to_thread(
-                lambda: collection.query.near_vector(
-                    near_vector=embedding,
-                    limit=k,
-                    where=where_filter,
-                    return_properties=[
-                        "term_id", "name", "definition", "exact_synonyms", 
-                        "narrow_synonyms", "broad_synonyms", "all_synonyms",
-                        "namespace"
-                    ]
-                )
+            response = await collection.query.near_vector(
+                near_vector=embedding,
+                limit=k,
+                filters=where_filter,
+                return_properties=_FILTERED_CANDIDATE_PROPERTIES
             )
             
         except Exception as e:
-            self.logger.exception(f"Enhanced filtered query failed: {e}")
+            self.logger.exception("Enhanced filtered query failed: %s", e)
             return []
         
-        candidates = []
-        
-        for obj in response.objects:
-            candidate = {
-                "id": obj.properties.get("term_id"),
-                "name": obj.properties.get("name"),
-                "definition": obj.properties.get("definition"),
-                "exact_synonyms": obj.properties.get("exact_synonyms", []),
-                "narrow_synonyms": obj.properties.get("narrow_synonyms", []),
-                "broad_synonyms": obj.properties.get("broad_synonyms", []),
-                "all_synonyms": obj.properties.get("all_synonyms", []),
-                "cross_references": obj.properties.get("cross_references", []),
-                "namespace": obj.properties.get("namespace", "")
-            }
-            candidates.append(candidate)
-        
-        return candidates
\ No newline at end of file
+        return [_to_candidate(obj.properties) for obj in response.objects]
\ No newline at end of file
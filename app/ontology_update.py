@@ -0,0 +1,247 @@
+"""
+Ontology download/update task run in the background by the admin API.
+
+Kept out of ``app.main`` so the ingestion dependencies are only imported when
+an update actually runs, not on every worker cold start.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from .config_updater import DownloadHistoryManager
+
+logger = logging.getLogger(__name__)
+
+# Progress tracking store (in-memory for now)
+update_progress_store = {}
+
+# Per-request task state keyed by task id, oldest first. Bounded so finished
+# tasks do not accumulate for the lifetime of the worker.
+MAX_TRACKED_TASKS = 64
+update_tasks: "OrderedDict[str, dict]" = OrderedDict()
+
+_TERMINAL_STATES = ("completed", "failed", "cancelled")
+
+# Returned by the download worker when the server answers 304 Not Modified
+_NOT_MODIFIED = object()
+
+
+def register_update_task(ontology_name: str, source_url: str) -> str:
+    """Record a queued update and return its task id, evicting the oldest tasks past the limit."""
+    task_id = uuid4().hex
+    update_tasks[task_id] = {
+        "task_id": task_id,
+        "state": "queued",
+        "progress": 0.0,
+        "ontology_name": ontology_name,
+        "source_url": source_url,
+        "queued_at": time.time()
+    }
+    while len(update_tasks) > MAX_TRACKED_TASKS:
+        update_tasks.popitem(last=False)
+    return task_id
+
+
+async def _perform_ontology_update(ontology_name: str, source_url: str, task_id: Optional[str] = None):
+    """Download the ontology from ``source_url`` and save to disk."""
+    
+    # Initialize progress tracking
+    progress_key = ontology_name
+    update_progress_store[progress_key] = {
+        "status": "starting",
+        "progress_percentage": 0,
+        "recent_logs": [],
+        "started_at": time.time(),
+        "ontology_name": ontology_name,
+        "source_url": source_url,
+        "download_percentage": 0,
+        "download_bytes": 0,
+        "download_total_bytes": 0
+    }
+    
+    def add_log(message: str, level: str = "INFO"):
+        """Add a log entry to progress tracking."""
+        timestamp = datetime.utcnow().strftime("%H:%M:%S")
+        log_entry = {
+            "timestamp": timestamp,
+            "message": message,
+            "level": level
+        }
+        if progress_key in update_progress_store:
+            update_progress_store[progress_key]["recent_logs"].append(log_entry)
+            # Keep only last 10 logs
+            update_progress_store[progress_key]["recent_logs"] = update_progress_store[progress_key]["recent_logs"][-10:]
+        logger.info("Update %s: %s", ontology_name, message)
+
+    def update_progress(status: str, percentage: int, message: str = "", 
+                       download_percentage: int = None, download_bytes: int = None, 
+                       download_total_bytes: int = None):
+        """Update progress status."""
+        task = update_tasks.get(task_id) if task_id else None
+        if task is not None:
+            task["state"] = status if status in _TERMINAL_STATES else "running"
+            task["progress"] = percentage / 100
+        if progress_key in update_progress_store:
+            update_progress_store[progress_key].update({
+                "status": status,
+                "progress_percentage": percentage
+            })
+            if download_percentage is not None:
+                update_progress_store[progress_key]["download_percentage"] = download_percentage
+            if download_bytes is not None:
+                update_progress_store[progress_key]["download_bytes"] = download_bytes
+            if download_total_bytes is not None:
+                update_progress_store[progress_key]["download_total_bytes"] = download_total_bytes
+            if message:
+                add_log(message)
+
+    try:
+        add_log(f"Starting ontology update from {source_url}")
+        update_progress("starting", 5, "Initializing download...")
+
+        # Get the persistent data directory from environment
+        data_dir = os.environ.get("ONTOLOGY_DATA_DIR", "/app/data")
+        
+        # Create source_ontologies subdirectory
+        source_ontologies_dir = os.path.join(data_dir, "source_ontologies")
+        os.makedirs(source_ontologies_dir, exist_ok=True)
+        
+        # Standardized filename for this ontology
+        filename = f"{ontology_name}.json"
+        file_path = os.path.join(source_ontologies_dir, filename)
+        
+        update_progress("downloading", 10, f"Downloading to {filename}")
+
+        # Ingestion-only dependency; keep it off the request-serving import path
+        import requests
+
+        # Make the request conditional on the validators from the last download
+        # of the same URL, so an unchanged ontology is not fetched again
+        download_history_manager = DownloadHistoryManager()
+        filename_with_path = os.path.join("source_ontologies", filename)
+        request_headers = {}
+        last_record = download_history_manager.get_latest_record(ontology_name)
+        if (last_record and last_record.get("source_url") == source_url
+                and last_record.get("filename") == filename_with_path
+                and os.path.exists(file_path)):
+            if last_record.get("etag"):
+                request_headers["If-None-Match"] = last_record["etag"]
+            if last_record.get("last_modified"):
+                request_headers["If-Modified-Since"] = last_record["last_modified"]
+        response_validators = {}
+
+        # Download function to run in thread
+        def download_file_with_progress():
+            """Download file with progress tracking using requests."""
+            try:
+                with requests.get(source_url, stream=True, headers=request_headers) as response:
+                    if response.status_code == 304:
+                        return _NOT_MODIFIED
+                    response.raise_for_status()
+                    response_validators["etag"] = response.headers.get("ETag")
+                    response_validators["last_modified"] = response.headers.get("Last-Modified")
+                    
+                    # Get file size for progress tracking
+                    total_size = int(response.headers.get('content-length', 0))
+                    downloaded_size = 0
+                    
+                    # Update progress with total size
+                    update_progress("downloading", 10, f"Starting download ({total_size // 1024 // 1024} MB)",
+                                  download_percentage=0, download_bytes=0, download_total_bytes=total_size)
+                    
+                    # Stream download to file
+                    with open(file_path, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=8192):
+                            # Check for cancellation
+                            if (progress_key in update_progress_store and 
+                                update_progress_store[progress_key].get("status") == "cancelled"):
+                                logger.warning("Download cancelled by user")
+                                return None
+                                
+                            if chunk:  # filter out keep-alive chunks
+                                f.write(chunk)
+                                downloaded_size += len(chunk)
+                                
+                                # Update download progress
+                                if total_size > 0:
+                                    download_pct = int((downloaded_size / total_size) * 100)
+                                    overall_pct = 10 + int((downloaded_size / total_size) * 30)  # 30% for download
+                                    update_progress("downloading", overall_pct, 
+                                                  f"Downloaded {downloaded_size // 1024 // 1024} MB of {total_size // 1024 // 1024} MB",
+                                                  download_percentage=download_pct,
+                                                  download_bytes=downloaded_size,
+                                                  download_total_bytes=total_size)
+                    
+                    return downloaded_size
+                    
+            except requests.RequestException as exc:
+                raise exc
+        
+        # Run download in thread to not block async event loop
+        try:
+            downloaded_size = await asyncio.to_thread(download_file_with_progress)
+            
+            if downloaded_size is None:
+                add_log("Download cancelled by user", "WARNING")
+                update_progress("cancelled", 0, "Download cancelled")
+                return None
+                
+            if downloaded_size is _NOT_MODIFIED:
+                update_progress("completed", 100, f"{ontology_name} is unchanged since the last download, keeping {filename}")
+                return {
+                    "ontology_name": ontology_name,
+                    "source_url": source_url,
+                    "filename": filename,
+                    "file_path": file_path,
+                    "not_modified": True,
+                    "size_bytes": os.path.getsize(file_path)
+                }
+
+            add_log(f"Downloaded {downloaded_size // 1024 // 1024} MB to {filename}")
+            
+        except Exception as exc:
+            error_msg = f"Download failed: {str(exc)}"
+            add_log(error_msg, "ERROR")
+            update_progress("failed", 0, error_msg)
+            raise exc
+
+        update_progress("completed", 100, f"Download completed! File saved to {filename}")
+        add_log(f"Ontology download completed successfully. File: {filename}")
+        
+        # Store download metadata
+        download_info = {
+            "ontology_name": ontology_name,
+            "source_url": source_url,
+            "filename": filename,
+            "file_path": file_path,
+            "downloaded_at": datetime.utcnow().isoformat(),
+            "size_bytes": downloaded_size
+        }
+        
+        # Update the download history so Streamlit can see it
+        download_history_manager.add_download_record(
+            ontology_name=ontology_name,
+            filename=filename_with_path,
+            size_bytes=downloaded_size,
+            timestamp=download_info["downloaded_at"] + "Z",
+            source_url=source_url,
+            etag=response_validators.get("etag"),
+            last_modified=response_validators.get("last_modified")
+        )
+        # Update status to available since we just downloaded it
+        download_history_manager.update_file_status(ontology_name, filename_with_path, "available")
+        add_log(f"Updated download history for {ontology_name}")
+        
+        return download_info
+        
+    except Exception as exc:
+        error_msg = f"Ontology update failed: {str(exc)}"
+        add_log(error_msg, "ERROR")
+        update_progress("failed", 0, error_msg)
+        logger.exception("Ontology update failed")
+        raise exc
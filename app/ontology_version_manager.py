@@ -4,10 +4,23 @@ Ontology Version Manager - Handles version detection, comparison, and persistent
 import os
 import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional, Tuple
 import logging
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps_indented(obj: Dict) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_indented(obj: Dict) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 try:
     from .config import ONTOLOGY_CONFIG
 except ImportError:
@@ -15,18 +28,25 @@ except ImportError:
     ONTOLOGY_CONFIG = {}
 
 
+_METADATA_SUFFIX = "_version_metadata.json"
+# Metadata files read at once when listing stored versions
+_MAX_READ_WORKERS = 16
+
+
 class OntologyVersionManager:
     """Manages ontology versions to avoid re-embedding identical data."""
     
     def __init__(self, data_dir: str = None):
         self.logger = logging.getLogger(__name__)
         self.data_dir = data_dir or os.getenv("ONTOLOGY_DATA_DIR", "./data/ontologies")
+        # Parsed metadata files, keyed by path, with the (mtime, size) they were read at
+        self._metadata_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
         self.ensure_data_directory()
     
     def ensure_data_directory(self) -> None:
         """Ensure the data directory exists."""
         os.makedirs(self.data_dir, exist_ok=True)
-        self.logger.info(f"Ontology data directory: {self.data_dir}")
+        self.logger.info("Ontology data directory: %s", self.data_dir)
     
     def extract_go_version_info(self, go_data: Dict) -> Dict[str, str]:
         """Extract version information from GO.json data."""
@@ -60,14 +80,19 @@ class OntologyVersionManager:
                     version_info["format_version"] = val
             
         except Exception as e:
-            self.logger.warning(f"Failed to extract GO version info: {e}")
+            self.logger.warning("Failed to extract GO version info: %s", e)
         
         return version_info
     
-    def generate_version_hash(self, ontology_data: Dict) -> str:
-        """Generate a hash of the ontology data for version comparison."""
+    def generate_version_hash(self, ontology_data: Dict, version_info: Optional[Dict] = None) -> str:
+        """Generate a hash of the ontology data for version comparison.
+
+        ``version_info`` is the data's already extracted version information,
+        if the caller has it.
+        """
         # Create a stable hash based on version info and content size
-        version_info = self.extract_go_version_info(ontology_data)
+        if version_info is None:
+            version_info = self.extract_go_version_info(ontology_data)
         
         # Use version date and graph count for hashing
         graphs = ontology_data.get("graphs", [])
@@ -85,21 +110,38 @@ class OntologyVersionManager:
     
     def get_version_metadata_path(self, ontology_name: str) -> str:
         """Get path for version metadata file."""
-        return os.path.join(self.data_dir, f"{ontology_name}_version_metadata.json")
+        return os.path.join(self.data_dir, f"{ontology_name}{_METADATA_SUFFIX}")
     
     def get_stored_version_info(self, ontology_name: str) -> Optional[Dict]:
-        """Get stored version information for an ontology."""
+        """Get stored version information for an ontology.
+
+        The file is only parsed again once it has changed on disk, so the
+        returned dict is shared between calls and must not be modified.
+        """
         metadata_path = self.get_version_metadata_path(ontology_name)
         
-        if not os.path.exists(metadata_path):
+        try:
+            stat = os.stat(metadata_path)
+        except FileNotFoundError:
+            self._metadata_cache.pop(metadata_path, None)
+            return None
+        except OSError as e:
+            self.logger.warning("Failed to read version metadata: %s", e)
             return None
         
+        file_state = (stat.st_mtime_ns, stat.st_size)
+        cached = self._metadata_cache.get(metadata_path)
+        if cached and cached[0] == file_state:
+            return cached[1]
+        
         try:
-            with open(metadata_path, 'r') as f:
-                return json.load(f)
+            with open(metadata_path, 'rb') as f:
+                metadata = _json_loads(f.read())
         except Exception as e:
-            self.logger.warning(f"Failed to read version metadata: {e}")
+            self.logger.warning("Failed to read version metadata: %s", e)
             return None
+        self._metadata_cache[metadata_path] = (file_state, metadata)
+        return metadata
     
     def store_version_info(
         self, 
@@ -126,8 +168,8 @@ class OntologyVersionManager:
             dir_name = os.path.dirname(metadata_path)
             os.makedirs(dir_name, exist_ok=True)
             
-            with tempfile.NamedTemporaryFile('w', dir=dir_name, delete=False) as tf:
-                json.dump(metadata, tf, indent=2)
+            with tempfile.NamedTemporaryFile('wb', dir=dir_name, delete=False) as tf:
+                tf.write(_json_dumps_indented(metadata))
                 temp_name = tf.name
             
             # Try atomic replace first
@@ -142,9 +184,10 @@ class OntologyVersionManager:
                 except OSError:
                     pass
             
-            self.logger.info(f"Stored version metadata for {ontology_name} at {metadata_path}")
+            self._metadata_cache.pop(metadata_path, None)
+            self.logger.info("Stored version metadata for %s at %s", ontology_name, metadata_path)
         except Exception as e:
-            self.logger.error(f"Failed to store version metadata: {e}")
+            self.logger.error("Failed to store version metadata: %s", e)
     
     def compare_versions(
         self, 
@@ -160,13 +203,13 @@ class OntologyVersionManager:
             - new_version_info: Dict (new version info)
         """
         new_version_info = self.extract_go_version_info(new_ontology_data)
-        new_hash = self.generate_version_hash(new_ontology_data)
+        new_hash = self.generate_version_hash(new_ontology_data, new_version_info)
         new_version_info["content_hash"] = new_hash
         
         stored_info = self.get_stored_version_info(ontology_name)
         
         if not stored_info:
-            self.logger.info(f"No stored version found for {ontology_name}")
+            self.logger.info("No stored version found for %s", ontology_name)
             return True, None, new_version_info
         
         stored_version_info = stored_info.get("version_info", {})
@@ -174,12 +217,12 @@ class OntologyVersionManager:
         
         if new_hash != stored_hash:
             self.logger.info(
-                f"Version change detected for {ontology_name}: "
-                f"{stored_version_info.get('version_date')} -> {new_version_info['version_date']}"
+                "Version change detected for %s: %s -> %s",
+                ontology_name, stored_version_info.get('version_date'), new_version_info['version_date']
             )
             return True, stored_info, new_version_info
         else:
-            self.logger.info(f"No version change for {ontology_name}, using cached data")
+            self.logger.info("No version change for %s, using cached data", ontology_name)
             return False, stored_info, new_version_info
     
     def get_weaviate_data_path(self) -> str:
@@ -189,39 +232,45 @@ class OntologyVersionManager:
         return weaviate_data_path
     
     def cleanup_old_collections(self, current_collections: list) -> None:
-        """Clean up metadata for collections that no longer exist."""
-        if not os.path.exists(self.data_dir):
-            return
-        
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith("_version_metadata.json"):
-                metadata_path = os.path.join(self.data_dir, filename)
+        """Clean up metadata for collections that no longer exist.
+
+        Metadata is read through the parsed-file cache, so only files written
+        since the last read are parsed again.
+        """
+        current = set(current_collections)
+        for ontology_name, metadata in self.list_stored_versions().items():
+            collection_name = metadata.get("collection_name", "")
+            if collection_name and collection_name not in current:
+                metadata_path = self.get_version_metadata_path(ontology_name)
                 try:
-                    with open(metadata_path, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    collection_name = metadata.get("collection_name", "")
-                    if collection_name and collection_name not in current_collections:
-                        os.remove(metadata_path)
-                        self.logger.info(f"Cleaned up metadata for removed collection: {collection_name}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to process metadata file {filename}: {e}")
+                    os.remove(metadata_path)
+                except OSError as e:
+                    self.logger.warning("Failed to remove metadata file %s: %s", metadata_path, e)
+                    continue
+                self._metadata_cache.pop(metadata_path, None)
+                self.logger.info("Cleaned up metadata for removed collection: %s", collection_name)
     
     def list_stored_versions(self) -> Dict[str, Dict]:
-        """List all stored ontology versions."""
-        versions = {}
-        
+        """List all stored ontology versions.
+
+        Files are read concurrently, which overlaps their latency on network
+        or bind-mounted volumes.
+        """
         if not os.path.exists(self.data_dir):
-            return versions
+            return {}
         
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith("_version_metadata.json"):
-                ontology_name = filename.replace("_version_metadata.json", "")
-                metadata = self.get_stored_version_info(ontology_name)
-                if metadata:
-                    versions[ontology_name] = metadata
+        ontology_names = [
+            filename[:-len(_METADATA_SUFFIX)]
+            for filename in os.listdir(self.data_dir)
+            if filename.endswith(_METADATA_SUFFIX)
+        ]
+        if len(ontology_names) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(ontology_names), _MAX_READ_WORKERS)) as pool:
+                metadata = list(pool.map(self.get_stored_version_info, ontology_names))
+        else:
+            metadata = [self.get_stored_version_info(name) for name in ontology_names]
         
-        return versions
+        return {name: info for name, info in zip(ontology_names, metadata) if info}
 
 
 def extract_version_from_ontology_data(ontology_data: Dict, ontology_format: str = "json") -> Dict[str, str]:
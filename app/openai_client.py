@@ -1,4 +1,5 @@
 import os
+import asyncio
 import logging
 import time
 from dotenv import load_dotenv
@@ -6,15 +7,17 @@ from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     import httpx
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
+    AsyncOpenAI = None
     OpenAI = None
     httpx = None
 
 from app.config import Config
+from app.retry import retry_delay
 
 # Load environment variables
 load_dotenv()
@@ -22,6 +25,9 @@ load_dotenv()
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Texts sent per embeddings request when a batch is split; OpenAI accepts up to 2048
+DEFAULT_CHUNK_SIZE = 1000
+
 
 @dataclass
 class EmbeddingResult:
@@ -71,6 +77,8 @@ class OpenAIEmbeddingClient:
         performance_config = self.embeddings_config.get("performance", {})
         self.rate_limit_delay = performance_config.get("rate_limit_delay", 0.1)
         self.request_timeout = performance_config.get("request_timeout", 30)
+        self.max_concurrent_requests = performance_config.get("max_concurrent_requests", 8)
+        self.retry_max_delay = performance_config.get("retry_max_delay", 60)
         
         # Processing settings
         processing_config = self.embeddings_config.get("processing", {})
@@ -82,18 +90,32 @@ class OpenAIEmbeddingClient:
         self.track_tokens = usage_config.get("track_tokens", True)
         self.log_requests = usage_config.get("log_requests", False)
         
+        # Async client for concurrent batches, created on first use
+        self._aclient = None
+        
         # Initialize client
         try:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                max_retries=self.max_retries,
-                timeout=httpx.Timeout(60.0, read=30.0, write=30.0, connect=5.0) if httpx else self.request_timeout
-            )
+            self.client = OpenAI(**self._client_options())
             self._validate_connection()
             logger.info("OpenAI client initialized successfully")
         except Exception as e:
             raise OpenAIClientError(f"Failed to initialize OpenAI client: {e}")
     
+    def _client_options(self) -> Dict[str, Any]:
+        """Keyword arguments shared by the sync and async OpenAI clients."""
+        return {
+            "api_key": self.api_key,
+            "max_retries": self.max_retries,
+            "timeout": httpx.Timeout(60.0, read=30.0, write=30.0, connect=5.0) if httpx else self.request_timeout
+        }
+    
+    @property
+    def aclient(self) -> "AsyncOpenAI":
+        """Async OpenAI client, bound to the event loop it is first used on."""
+        if self._aclient is None:
+            self._aclient = AsyncOpenAI(**self._client_options())
+        return self._aclient
+    
     def _validate_connection(self):
         """Validate OpenAI API connection by performing a minimal test.
         
@@ -174,6 +196,7 @@ class OpenAIEmbeddingClient:
         if not text or not text.strip():
             raise OpenAIClientError("Text cannot be empty")
             
+        last_error: Optional[Exception] = None
         for attempt in range(self.max_retries + 1):
             try:
                 if self.log_requests:
@@ -181,8 +204,7 @@ class OpenAIEmbeddingClient:
                     
                 # Apply rate limiting
                 if attempt > 0:
-                    delay = self.rate_limit_delay * (2 ** (attempt - 1))  # Exponential backoff
-                    time.sleep(delay)
+                    time.sleep(retry_delay(last_error, attempt, self.rate_limit_delay, self.retry_max_delay))
                 elif self.rate_limit_delay > 0:
                     time.sleep(self.rate_limit_delay)
                     
@@ -212,6 +234,7 @@ class OpenAIEmbeddingClient:
                 # Handle specific error types
                 error_msg = str(e)
                 is_retryable = self._is_retryable_error(e)
+                last_error = e
                 
                 if attempt < self.max_retries and self.retry_failed and is_retryable:
                     logger.warning(f"Embedding generation attempt {attempt + 1} failed (retryable): {e}")
@@ -248,49 +271,40 @@ class OpenAIEmbeddingClient:
         
         # Use provided dimensions or config default
         embed_dimensions = dimensions or self.model_dimensions
-            
+        
+        # More texts than one request takes are sent one request after another;
+        # agenerate_embeddings sends them concurrently
+        results = []
+        for i in range(0, len(valid_texts), DEFAULT_CHUNK_SIZE):
+            results.extend(self._generate_chunk(valid_texts[i:i + DEFAULT_CHUNK_SIZE], embed_dimensions))
+        return results
+    
+    def _generate_chunk(self, texts: List[str], dimensions: int) -> List[EmbeddingResult]:
+        """Embed one request's worth of non-empty texts, retrying failures."""
+        last_error: Optional[Exception] = None
         for attempt in range(self.max_retries + 1):
             try:
                 if self.log_requests:
-                    logger.debug(f"Generating embeddings for {len(valid_texts)} texts")
+                    logger.debug(f"Generating embeddings for {len(texts)} texts")
                     
                 # Apply rate limiting
                 if attempt > 0:
-                    delay = self.rate_limit_delay * (2 ** (attempt - 1))  # Exponential backoff
-                    time.sleep(delay)
+                    time.sleep(retry_delay(last_error, attempt, self.rate_limit_delay, self.retry_max_delay))
                 elif self.rate_limit_delay > 0:
                     time.sleep(self.rate_limit_delay)
                     
                 response = self.client.embeddings.create(
-                    input=valid_texts,
+                    input=texts,
                     model=self.model,
-                    dimensions=embed_dimensions
+                    dimensions=dimensions
                 )
                 
-                if not response.data or len(response.data) != len(valid_texts):
-                    raise OpenAIClientError(
-                        f"Expected {len(valid_texts)} embeddings, got {len(response.data) if response.data else 0}"
-                    )
-                    
-                results = []
-                token_count = response.usage.total_tokens if response.usage else 0
-                
-                for i, embedding_data in enumerate(response.data):
-                    results.append(EmbeddingResult(
-                        embedding=embedding_data.embedding,
-                        text=valid_texts[i],
-                        token_count=token_count // len(valid_texts),  # Approximate per-text token count
-                        model=self.model
-                    ))
-                    
-                if self.track_tokens:
-                    logger.debug(f"Generated {len(results)} embeddings with {token_count} total tokens")
-                    
-                return results
+                return self._build_results(texts, response)
                 
             except Exception as e:
                 # Handle specific error types
                 is_retryable = self._is_retryable_error(e)
+                last_error = e
                 
                 if attempt < self.max_retries and self.retry_failed and is_retryable:
                     logger.warning(f"Batch embedding generation attempt {attempt + 1} failed (retryable): {e}")
@@ -300,6 +314,114 @@ class OpenAIEmbeddingClient:
                         logger.error(f"Non-retryable error in batch embedding generation: {e}")
                     raise OpenAIClientError(f"Failed to generate batch embeddings after {attempt + 1} attempts: {e}")
                     
+    def _build_results(self, texts: List[str], response: Any) -> List[EmbeddingResult]:
+        """Turn an embeddings response for ``texts`` into results, in input order.
+        
+        Raises:
+            OpenAIClientError: If the response does not hold one embedding per text.
+        """
+        if not response.data or len(response.data) != len(texts):
+            raise OpenAIClientError(
+                f"Expected {len(texts)} embeddings, got {len(response.data) if response.data else 0}"
+            )
+            
+        results = []
+        token_count = response.usage.total_tokens if response.usage else 0
+        
+        for i, embedding_data in enumerate(response.data):
+            results.append(EmbeddingResult(
+                embedding=embedding_data.embedding,
+                text=texts[i],
+                token_count=token_count // len(texts),  # Approximate per-text token count
+                model=self.model
+            ))
+            
+        if self.track_tokens:
+            logger.debug(f"Generated {len(results)} embeddings with {token_count} total tokens")
+            
+        return results
+    
+    async def agenerate_embeddings(
+        self,
+        texts: List[str],
+        dimensions: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: Optional[int] = None
+    ) -> List[EmbeddingResult]:
+        """Generate embeddings for multiple texts with concurrent requests.
+        
+        The texts are split into chunks of ``chunk_size``, each sent as its own
+        request with at most ``max_concurrency`` in flight at once.
+        
+        Args:
+            texts: List of texts to embed.
+            dimensions: Override dimensions (uses config default if None).
+            chunk_size: Texts per request.
+            max_concurrency: Requests in flight at once (uses config default if None).
+            
+        Returns:
+            List of EmbeddingResult objects, in the order of the non-empty texts.
+            
+        Raises:
+            OpenAIClientError: If any chunk fails after its retries.
+        """
+        if not texts:
+            return []
+            
+        # Filter out empty texts
+        valid_texts = [text for text in texts if text and text.strip()]
+        if not valid_texts:
+            raise OpenAIClientError("No valid texts provided for embedding")
+            
+        return await self._agenerate(
+            self.aclient, valid_texts, dimensions or self.model_dimensions, chunk_size, max_concurrency
+        )
+    
+    async def _agenerate(
+        self,
+        aclient: "AsyncOpenAI",
+        texts: List[str],
+        dimensions: int,
+        chunk_size: int,
+        max_concurrency: Optional[int]
+    ) -> List[EmbeddingResult]:
+        """Embed non-empty texts in concurrent chunked requests, in input order."""
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrent_requests)
+        
+        async def embed_chunk(chunk: List[str]) -> List[EmbeddingResult]:
+            last_error: Optional[Exception] = None
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if attempt > 0:
+                        await asyncio.sleep(
+                            retry_delay(last_error, attempt, self.rate_limit_delay, self.retry_max_delay)
+                        )
+                    async with semaphore:
+                        response = await aclient.embeddings.create(
+                            input=chunk,
+                            model=self.model,
+                            dimensions=dimensions
+                        )
+                    return self._build_results(chunk, response)
+                    
+                except Exception as e:
+                    is_retryable = self._is_retryable_error(e)
+                    last_error = e
+                    
+                    if attempt < self.max_retries and self.retry_failed and is_retryable:
+                        logger.warning(f"Batch embedding generation attempt {attempt + 1} failed (retryable): {e}")
+                        continue
+                    if not is_retryable:
+                        logger.error(f"Non-retryable error in batch embedding generation: {e}")
+                    raise OpenAIClientError(f"Failed to generate batch embeddings after {attempt + 1} attempts: {e}")
+        
+        if self.log_requests:
+            logger.debug(f"Generating embeddings for {len(texts)} texts")
+            
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model configuration.
         
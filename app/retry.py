@@ -0,0 +1,30 @@
+"""
+Backoff delays shared by the clients that call OpenAI and Weaviate.
+"""
+import random
+from typing import Optional
+
+
+def retry_after(error: Exception) -> float:
+    """Seconds the server asked us to wait before retrying, or 0 if it did not say."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    try:
+        # OpenAI sends the more precise retry-after-ms alongside retry-after
+        if (retry_after_ms := headers.get("retry-after-ms")) is not None:
+            return min(float(retry_after_ms) / 1000, 60)
+        return min(float(headers.get("retry-after", 0)), 60)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+def retry_delay(error: Optional[Exception], attempt: int, base: float, cap: float) -> float:
+    """Seconds to wait before retry number ``attempt`` (counting from 1).
+
+    A Retry-After from the server is honoured; otherwise the backoff doubles
+    up to ``cap``, with jitter so requests that failed together do not all
+    retry at the same moment.
+    """
+    if error is not None and (requested := retry_after(error)):
+        return requested + random.uniform(0, 1)
+    delay = min(cap, base * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
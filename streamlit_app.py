@@ -274,7 +274,7 @@ def show_embedding_progress(ont_name: str, api_key: str):
                 elif status == "processing_terms":
                     st.info(f"📝 **Processing terms**\n\nPreparing terms for vectorization... ({elapsed}s elapsed)")
                 elif status == "creating_collection":
-                    st.info(f"🗄️ **Creating collection**\n\nSetting up Weaviate collection with OpenAI vectorizer... ({elapsed}s elapsed)")
+                    st.info(f"🗄️ **Creating collection**\n\nSetting up Weaviate collection for precomputed OpenAI embeddings... ({elapsed}s elapsed)")
                 elif status == "embedding_generation" or status == "embedding_batch":
                     st.info(f"🧠 **Generating embeddings**\n\nCreating vector representations for terms... ({elapsed}s elapsed)")
                 elif status == "retrying_batch":
@@ -414,7 +414,7 @@ def load_embeddings_config():
                 "dimensions": 1536
             },
             "processing": {
-                "batch_size": 100,
+                "batch_size": 200,
                 "parallel_processing": True,
                 "retry_failed": True,
                 "max_retries": 3
@@ -808,7 +808,7 @@ if st.session_state.get('show_embeddings_config', False):
         st.markdown(f"**Description:** {model_descriptions[selected_model]}")
         
         # Batch size configuration
-        current_batch_size = st.session_state.embedding_config.get("processing", {}).get("batch_size", 100)
+        current_batch_size = st.session_state.embedding_config.get("processing", {}).get("batch_size", 200)
         # Add hidden div with data-testid for batch size input
         # Batch size input test identifier on the number input
         batch_size = st.number_input(
@@ -1136,7 +1136,7 @@ if st.session_state.get('show_ontology_embedding_management', False):
         with col1:
             st.info(f"📊 **Current Configuration**\n\n"
                     f"**Model:** {model_name}\n\n"
-                    f"**Batch Size:** {embeddings_config.get('processing', {}).get('batch_size', 100)}\n\n"
+                    f"**Batch Size:** {embeddings_config.get('processing', {}).get('batch_size', 200)}\n\n"
                     f"**Fields:** {', '.join([k for k, v in embeddings_config.get('vectorize_fields', {}).items() if v])}")
         with col2:
             if st.button("🔍 Test Config", key="test_embed_config_quick", use_container_width=True, help="Test the current embedding configuration"):
@@ -1270,7 +1270,7 @@ if st.session_state.get('show_ontology_embedding_management', False):
                         if vectorize_fields.get("definition", True): fields.append("Definition")
                         if vectorize_fields.get("synonyms", True): fields.append("Synonyms")
                         st.markdown(f"- Fields: {', '.join(fields)}")
-                        st.markdown(f"- Batch Size: {embeddings_config.get('processing', {}).get('batch_size', 100)}")
+                        st.markdown(f"- Batch Size: {embeddings_config.get('processing', {}).get('batch_size', 200)}")
                     
                     with col2:
                         st.markdown("**Actions:**")
@@ -0,0 +1,46 @@
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.ontology_manager import OntologyManager
+
+# Settings every load test starts from; no pause between batches
+_LOAD_TEST_CONFIG = {"performance": {"rate_limit_delay": 0}}
+
+
+async def fake_embed_texts(texts, *args, **kwargs):
+    """Stand-in for OntologyManager._embed_texts that avoids calling OpenAI."""
+    return [[0.1, 0.2, 0.3] for _ in texts]
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Keep files the app writes under ONTOLOGY_DATA_DIR (e.g. the embedding cache) out of /app/data."""
+    monkeypatch.setenv("ONTOLOGY_DATA_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def loaded_manager():
+    """Factory for an OntologyManager that loads ontologies into a mock Weaviate client.
+
+    ``loaded_manager(config_overrides, embed_texts=...)`` returns the manager and
+    the mock client. Embeddings come from ``embed_texts`` (fake_embed_texts by
+    default) instead of OpenAI; the mock is left on ``manager._embed_texts``.
+    EMBEDDINGS_CONFIG is replaced, for the rest of the test, by the base load
+    settings updated section by section with ``config_overrides``.
+    """
+    with ExitStack() as stack:
+        def make(config_overrides=None, embed_texts=fake_embed_texts):
+            config = {section: dict(settings) for section, settings in _LOAD_TEST_CONFIG.items()}
+            for section, settings in (config_overrides or {}).items():
+                config.setdefault(section, {}).update(settings)
+
+            manager = OntologyManager()
+            mock_client = MagicMock()
+            stack.enter_context(patch.object(manager, 'get_weaviate_client', return_value=mock_client))
+            stack.enter_context(patch.object(manager, '_embed_texts', side_effect=embed_texts))
+            stack.enter_context(patch('app.ontology_manager.EMBEDDINGS_CONFIG', config))
+            return manager, mock_client
+
+        yield make
@@ -169,8 +169,9 @@ def test_api_endpoint_returns_download_only(page: Page):
         }
     )
     
-    assert response.status_code == 200
-    assert response.json() == {"status": "update started"}
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert response.json()["task_id"]
     
     # Check progress endpoint
     time.sleep(2)
@@ -112,6 +112,37 @@ class TestDOOntologyManagerIntegration:
             assert "T2DM" in searchable_text
             assert " | " in searchable_text
 
+    def test_build_searchable_text_lowercase_and_punctuation(self, ontology_manager):
+        """Test that combined lowercasing and punctuation removal handles non-ASCII text."""
+        term_data = {
+            "name": "Type 2 Diabetes, Adult-Onset",
+            "definition": "",
+            "exact_synonyms": ["Ménière's Disease", "!!!"]
+        }
+
+        with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
+            "vectorize_fields": {"name": True, "definition": True, "synonyms": True},
+            "preprocessing": {"lowercase": True, "remove_punctuation": True, "combine_fields_separator": " | "}
+        }):
+            searchable_text = ontology_manager._build_searchable_text(term_data)
+
+        assert searchable_text == "type 2 diabetes adultonset | ménières disease"
+
+    @pytest.mark.parametrize("lowercase,remove_punctuation,expected", [
+        (False, False, "Type-2 Diabetes | T2DM!"),
+        (True, False, "type-2 diabetes | t2dm!"),
+        (False, True, "Type2 Diabetes | T2DM"),
+        (True, True, "type2 diabetes | t2dm"),
+    ])
+    def test_build_searchable_text_preprocessing_flags(self, ontology_manager, lowercase, remove_punctuation, expected):
+        """Test each combination of the lowercase and punctuation preprocessing flags."""
+        term_data = {"name": "Type-2 Diabetes", "exact_synonyms": ["T2DM!"]}
+
+        with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
+            "preprocessing": {"lowercase": lowercase, "remove_punctuation": remove_punctuation}
+        }):
+            assert ontology_manager._build_searchable_text(term_data) == expected
+
     def test_extract_enhanced_term_data_error_handling(self, ontology_manager):
         """Test error handling in _extract_enhanced_term_data."""
         # Test with malformed node
@@ -181,6 +212,20 @@ class TestDOOntologyManagerIntegration:
             assert result["broad_synonyms"] == parsed_term["broad_synonyms"]
             assert result["all_synonyms"] == parsed_term["all_synonyms"]
 
+    def test_raw_and_parsed_terms_extract_identically(self, ontology_manager, sample_do_data):
+        """Test that raw nodes and pre-parsed terms go through one extraction path with the same result."""
+        nodes = [node for node in sample_do_data["graphs"][0]["nodes"] if "lbl" in node and "meta" in node]
+        parsed_terms = parse_go_json_enhanced({"graphs": [{"nodes": nodes}]})
+
+        for node, parsed_term in zip(nodes, parsed_terms):
+            from_raw = ontology_manager._extract_enhanced_term_data(node)
+            from_parsed = ontology_manager._extract_enhanced_term_data(parsed_term)
+            assert from_raw == from_parsed
+            assert list(from_raw) == [
+                "term_id", "name", "definition", "exact_synonyms", "narrow_synonyms",
+                "broad_synonyms", "all_synonyms", "searchable_text"
+            ]
+
     @pytest.mark.asyncio
     async def test_weaviate_integration_preparation(self, ontology_manager, sample_do_data, mock_weaviate_client):
         """Test preparation of DO data for Weaviate integration."""
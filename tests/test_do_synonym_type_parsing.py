@@ -196,6 +196,23 @@ class TestDOSynonymTypeParsing:
         assert synonym_data["related_synonyms"] == []
         assert synonym_data["all_synonyms"] == []
 
+    def test_repeated_synonyms_share_one_string(self):
+        """Test that a synonym repeated across terms is stored once."""
+        nodes = [
+            {
+                "id": f"http://purl.obolibrary.org/obo/DOID_{i}",
+                "lbl": f"disease {i}",
+                # Built at runtime so the two values start out as distinct objects
+                "meta": {"synonyms": [{"pred": "hasExactSynonym", "val": "".join(["protein ", "binding"])}]}
+            }
+            for i in range(2)
+        ]
+
+        first, second = (parse_enhanced_go_term(node) for node in nodes)
+
+        assert first["exact_synonyms"][0] == "protein binding"
+        assert first["exact_synonyms"][0] is second["exact_synonyms"][0]
+
     def test_malformed_synonym_handling(self):
         """Test handling of malformed synonym structures."""
         node_malformed_synonyms = {
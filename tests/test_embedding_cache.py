@@ -0,0 +1,21 @@
+"""Test the on-disk embedding caches."""
+
+from unittest.mock import patch
+
+
+def test_passage_cache_expires_and_caps_entries(tmp_path):
+    """Test that expired passages are not returned and only the newest entries are kept."""
+    from app.embedding_cache import PassageEmbeddingCache
+
+    cache = PassageEmbeddingCache(str(tmp_path / "passages.sqlite3"), ttl_seconds=60, max_entries=2)
+    with patch('app.embedding_cache.time.time', return_value=1000.0):
+        cache.put_many([("old", [0.1])])
+    with patch('app.embedding_cache.time.time', return_value=1030.0):
+        cache.put_many([("a", [0.2])])
+        assert set(cache.get_many(["old", "a"])) == {"old", "a"}
+    with patch('app.embedding_cache.time.time', return_value=1070.0):
+        assert set(cache.get_many(["old", "a"])) == {"a"}
+        cache.put_many([("b", [0.3]), ("c", [0.4])])
+
+    with cache._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0] == 2
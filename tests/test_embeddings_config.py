@@ -76,7 +76,7 @@ class TestEmbeddingsConfig:
         embeddings_config = config.get_embeddings_config()
         
         processing = embeddings_config["processing"]
-        assert processing["batch_size"] == 100
+        assert processing["batch_size"] == 200
         assert processing["parallel_processing"] is True
         assert processing["max_retries"] == 3
         
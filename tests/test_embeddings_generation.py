@@ -1,15 +1,17 @@
 """Test embedding generation functionality."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch, call
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch, call
 import asyncio
 from datetime import datetime
+import threading
 import time
 
 from app.ontology_manager import OntologyManager
 from app.config import EMBEDDINGS_CONFIG
 from app.main import _generate_embeddings_only, embedding_progress_store, embedding_cancellation_flags
 import app.main
+from tests.conftest import fake_embed_texts
 
 
 @pytest.mark.asyncio
@@ -24,7 +26,7 @@ async def test_create_and_load_ontology_collection_with_progress():
     
     # Set up the mock chain
     mock_client.collections.get.return_value = mock_collection
-    mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+    mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
     
@@ -39,7 +41,8 @@ async def test_create_and_load_ontology_collection_with_progress():
             "extra_data": extra_data
         })
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         # Test data
         test_terms = [
             {"id": "GO:0001", "name": "test term 1", "definition": "test def 1"},
@@ -87,7 +90,8 @@ async def test_embedding_configuration_applied():
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         with patch.dict(EMBEDDINGS_CONFIG, {
             "model": {"name": "text-embedding-3-small"},
             "processing": {"batch_size": 50},
@@ -108,6 +112,773 @@ async def test_embedding_configuration_applied():
     assert create_call.kwargs['name'] == "test_collection"
 
 
+@pytest.mark.asyncio
+async def test_precomputed_vectors_passed_to_weaviate(loaded_manager):
+    """Test that client-side embeddings are attached to each imported object."""
+    async def indexed_embed_texts(texts, *args, **kwargs):
+        return [None if "skip" in text else [float(i)] for i, text in enumerate(texts)]
+
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 2, "max_retries": 0},
+        "performance": {"max_concurrent_requests": 2}
+    }, embed_texts=indexed_embed_texts)
+    mock_batch = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value
+
+    test_terms = [
+        {"id": "GO:0001", "name": "term 1"},
+        {"id": "GO:0002", "name": "skip term 2"},
+        {"id": "GO:0003", "name": "term 3"},
+    ]
+    await manager.create_and_load_ontology_collection("test_collection", test_terms, "test_api_key")
+
+    # Weaviate must not vectorize on its own
+    create_kwargs = mock_client.collections.create.call_args.kwargs
+    assert create_kwargs['vectorizer_config'].vectorizer == "none"
+
+    # The term whose embedding failed is not imported
+    added = {
+        c.args[0]["term_id"]: c.kwargs["vector"]
+        for c in mock_batch.add_object.call_args_list
+    }
+    assert added == {"GO:0001": [0.0], "GO:0003": [2.0]}
+
+
+@pytest.mark.asyncio
+async def test_sparse_terms_imported_without_embedding(loaded_manager):
+    """Test that terms with too little searchable text are stored without a vector."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "max_retries": 0, "min_searchable_words": 3}
+    })
+    mock_batch = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [
+            {"id": "GO:0001", "name": "apoptosis"},
+            {"id": "GO:0002", "name": "cell", "definition": "the basic unit of life"},
+        ],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    assert manager._embed_texts.call_args.args[0] == ["cell | the basic unit of life"]
+    added = {c.args[0]["term_id"]: c.kwargs["vector"] for c in mock_batch.add_object.call_args_list}
+    assert added == {"GO:0001": None, "GO:0002": [0.1, 0.2, 0.3]}
+    assert progress_updates[-1]["skipped_sparse_terms"] == 1
+    assert progress_updates[-1]["failed_terms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_server_side_batching_and_rejected_objects(loaded_manager):
+    """Test that server-side batching is used when enabled and rejected objects count as failed."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "max_retries": 0, "server_side_batching": True}
+    })
+    mock_collection = mock_client.collections.get.return_value
+    mock_batch = mock_collection.batch.stream.return_value.__enter__.return_value
+    rejected = MagicMock(message="invalid vector")
+    rejected.object_.properties = {"term_id": "GO:0002"}
+    mock_collection.batch.failed_objects = [rejected]
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": "GO:0001", "name": "term one"}, {"id": "GO:0002", "name": "term two"}],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    mock_collection.batch.fixed_size.assert_not_called()
+    assert mock_batch.add_object.call_count == 2
+    assert progress_updates[-1]["failed_terms"] == 1
+    assert progress_updates[-1]["processed_terms"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hnsw_build_settings_applied_at_creation_and_ef_after_import(loaded_manager):
+    """Test that the vector index is created with the build settings and gets its query ef once loaded."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "bulk_insert": True},
+        "hnsw": {"ef_construction": 64, "max_connections": 16, "ef": 128,
+                 "dynamic_ef_min": 100, "dynamic_ef_max": 500}
+    })
+    mock_collection = mock_client.collections.get.return_value
+    call_order = []
+    mock_collection.data.insert_many.side_effect = lambda objects: call_order.append("insert") or MagicMock(errors={})
+    mock_collection.config.update.side_effect = lambda **kwargs: call_order.append("update")
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection", [{"id": "GO:0001", "name": "term one"}], "test_api_key",
+        hnsw_settings={"ef": 256}
+    )
+
+    index_config = mock_client.collections.create.call_args.kwargs["vector_index_config"]
+    assert (index_config.efConstruction, index_config.maxConnections) == (64, 16)
+    # The ontology's own ef overrides the configured one; other settings still apply
+    query_config = mock_collection.config.update.call_args.kwargs["vector_index_config"]
+    assert (query_config.ef, query_config.dynamicEfMin, query_config.dynamicEfMax) == (256, 100, 500)
+    assert call_order == ["insert", "update"]
+
+
+@pytest.mark.asyncio
+async def test_draining_terms_loaded_in_order_and_released(loaded_manager):
+    """Test that a draining term list keeps its length for progress and is emptied while loading."""
+    from app.ontology_manager import DrainingTerms
+
+    manager, mock_client = loaded_manager({"processing": {"batch_size": 10, "bulk_insert": True}})
+    terms = [{"id": f"GO:000{i}", "name": f"term {i}"} for i in range(3)]
+    draining = DrainingTerms(terms)
+    mock_collection = mock_client.collections.get.return_value
+    mock_collection.data.insert_many.return_value = MagicMock(errors={})
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection", draining, "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    assert len(draining) == 3
+    assert progress_updates[-1]["total_terms"] == 3
+    imported = mock_collection.data.insert_many.call_args.args[0]
+    assert [obj.properties["term_id"] for obj in imported] == ["GO:0000", "GO:0001", "GO:0002"]
+    assert terms == []
+
+
+@pytest.mark.asyncio
+async def test_import_batch_split_into_concurrent_requests(loaded_manager):
+    """Test that max_concurrent_batches splits each import batch into concurrent Weaviate requests."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 5},
+        "performance": {"max_concurrent_batches": 2}
+    })
+    mock_collection = mock_client.collections.get.return_value
+    mock_batch = mock_collection.batch.fixed_size.return_value.__enter__.return_value
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"GO:000{i}", "name": f"term {i}"} for i in range(5)],
+        "test_api_key"
+    )
+
+    mock_collection.batch.fixed_size.assert_called_once_with(batch_size=3, concurrent_requests=2)
+    assert mock_batch.add_object.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_imports_batch_in_one_call(loaded_manager):
+    """Test that bulk insert sends each batch with insert_many and retries rejected objects."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "max_retries": 1, "bulk_insert": True}
+    })
+    mock_collection = mock_client.collections.get.return_value
+    mock_collection.data.insert_many.side_effect = [
+        MagicMock(errors={1: MagicMock(message="invalid vector")}),
+        MagicMock(errors={})
+    ]
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": "GO:0001", "name": "term one"}, {"id": "GO:0002", "name": "term two"}],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    mock_collection.batch.fixed_size.assert_not_called()
+    first, retry = mock_collection.data.insert_many.call_args_list
+    assert [obj.properties["term_id"] for obj in first.args[0]] == ["GO:0001", "GO:0002"]
+    assert first.args[0][0].vector == [0.1, 0.2, 0.3]
+    assert [obj.properties["term_id"] for obj in retry.args[0]] == ["GO:0002"]
+    assert progress_updates[-1]["failed_terms"] == 0
+    assert progress_updates[-1]["processed_terms"] == 2
+
+
+def test_content_hash_stable_across_releases():
+    """Test that content hashes do not change, so stored collections still reload incrementally."""
+    from app.ontology_manager import _content_hash
+
+    term = {
+        "term_id": "GO:0001",
+        "name": "term one",
+        "definition": "a définition",
+        "exact_synonyms": ["alpha"],
+        "narrow_synonyms": [],
+        "broad_synonyms": [],
+        "all_synonyms": ["alpha"],
+        "searchable_text": "term one | a définition | alpha",
+        "content_hash": ""
+    }
+
+    assert _content_hash(term, "text-embedding-3-small") == (
+        "188e474056677bded139c86e9da6d26179f507f4e1a3f104cb51e039f177b292"
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_batches_imported_concurrently(loaded_manager):
+    """Test that up to max_concurrent_imports insert_many calls run at once."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 2, "bulk_insert": True},
+        "performance": {"max_concurrent_imports": 3}
+    })
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def insert_many(objects):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return MagicMock(errors={})
+
+    mock_client.collections.get.return_value.data.insert_many.side_effect = insert_many
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"GO:{i:04d}", "name": f"term {i}"} for i in range(20)],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    assert max_in_flight == 3
+    assert progress_updates[-1]["processed_terms"] == 20
+    assert progress_updates[-1]["batches_completed"] == 10
+
+
+@pytest.mark.asyncio
+async def test_incremental_reload_writes_only_changed_terms(loaded_manager):
+    """Test that reloading an existing collection skips unchanged terms and removes dropped ones."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "incremental_reload": True, "bulk_insert": True}
+    })
+    terms = [{"id": "GO:0001", "name": "kept"}, {"id": "GO:0002", "name": "renamed"}]
+    stored = {term["term_id"]: term["content_hash"] for term in manager._iter_enhanced_terms(terms)}
+    stored["GO:0002"] = "stale"
+    stored["GO:0003"] = "dropped"
+
+    mock_client.collections.exists.return_value = True
+    mock_collection = mock_client.collections.get.return_value
+    mock_collection.config.get.return_value.properties = [MagicMock(), MagicMock()]
+    mock_collection.config.get.return_value.properties[1].name = "content_hash"
+    mock_collection.iterator.return_value = [
+        MagicMock(properties={"term_id": term_id, "content_hash": content_hash})
+        for term_id, content_hash in stored.items()
+    ]
+    mock_collection.data.insert_many.return_value = MagicMock(errors={})
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        terms,
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    mock_client.collections.delete.assert_not_called()
+    mock_client.collections.create.assert_not_called()
+    assert mock_collection.iterator.call_args.kwargs["cache_size"] > 100
+    manager._embed_texts.assert_awaited_once()
+    assert manager._embed_texts.await_args.args[0] == ["renamed"]
+    (inserted,), _ = mock_collection.data.insert_many.call_args
+    assert [obj.properties["term_id"] for obj in inserted] == ["GO:0002"]
+    mock_collection.data.delete_many.assert_called_once()
+    assert progress_updates[-1]["unchanged_terms"] == 1
+    assert progress_updates[-1]["removed_terms"] == 1
+    assert progress_updates[-1]["processed_terms"] == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_reload_rebuilds_collection_without_hashes(loaded_manager):
+    """Test that a collection created before content hashes is rebuilt with them."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 10, "incremental_reload": True, "bulk_insert": True}
+    })
+    mock_client.collections.exists.return_value = True
+    mock_client.collections.get.return_value.config.get.return_value.properties = [MagicMock()]
+    mock_client.collections.get.return_value.data.insert_many.return_value = MagicMock(errors={})
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection", [{"id": "GO:0001", "name": "term"}], "test_api_key"
+    )
+
+    mock_client.collections.get.return_value.iterator.assert_not_called()
+    mock_client.collections.delete.assert_called_once_with("test_collection")
+    properties = mock_client.collections.create.call_args.kwargs["properties"]
+    assert "content_hash" in [prop.name for prop in properties]
+
+
+@pytest.mark.asyncio
+async def test_failed_terms_counted_only_after_retries_exhausted(loaded_manager):
+    """Test that a term which imports on retry is not reported as failed."""
+    manager, mock_client = loaded_manager({"processing": {"batch_size": 10, "max_retries": 1}})
+    mock_collection = mock_client.collections.get.return_value
+    mock_batch = mock_collection.batch.fixed_size.return_value.__enter__.return_value
+    rejected = MagicMock(message="transient")
+    rejected.object_.properties = {"term_id": "GO:0001"}
+    type(mock_collection.batch).failed_objects = PropertyMock(return_value=[rejected])
+    mock_collection.data.insert_many.return_value = MagicMock(errors={})
+    progress_updates = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": "GO:0001", "name": "term one"}, {"id": "GO:0002", "name": "term two"}],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    # The rejected term is retried with one insert_many call instead of a new batch builder
+    assert mock_batch.add_object.call_count == 2
+    mock_collection.batch.fixed_size.assert_called_once()
+    retried = mock_collection.data.insert_many.call_args.args[0]
+    assert [obj.properties["term_id"] for obj in retried] == ["GO:0001"]
+    assert progress_updates[-1]["failed_terms"] == 0
+    assert progress_updates[-1]["processed_terms"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_progress_updates_throttled(loaded_manager):
+    """Test that repeated per-batch progress is throttled while status changes are always reported."""
+    manager, _ = loaded_manager({"processing": {"batch_size": 1, "max_retries": 0}})
+    statuses = []
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"GO:{i:04d}", "name": f"term {i}"} for i in range(50)],
+        "test_api_key",
+        lambda status, percentage, message, extra: statuses.append(status)
+    )
+
+    assert 1 <= statuses.count("embedding_batch") < 50
+    assert statuses.index("processing_terms") < statuses.index("embedding_generation") < statuses.index("embedding_batch")
+    assert statuses[-1] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_slow_progress_callback_drops_stale_updates():
+    """Test that a slow callback never blocks reporting and still receives the final update."""
+    from app.ontology_manager import _ProgressReporter
+
+    received = []
+
+    async def slow_callback(status, percentage, message, extra_data):
+        await asyncio.sleep(0.01)
+        received.append(status)
+
+    reporter = _ProgressReporter(slow_callback, MagicMock(), max_pending=2)
+    for i in range(10):
+        reporter.report(f"batch_{i}", i, "", {})
+    reporter.report("completed", 100, "", {})
+    await reporter.aclose()
+
+    assert received == ["batch_9", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_next_window_embedded_while_importing(loaded_manager):
+    """Test that the next window's embeddings are requested before the current window is imported."""
+    events = []
+
+    async def recording_embed_texts(texts, *args, **kwargs):
+        events.extend(f"embed {text}" for text in texts)
+        return [[0.1] for _ in texts]
+
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 1, "max_retries": 0},
+        "performance": {"max_concurrent_requests": 1}
+    }, embed_texts=recording_embed_texts)
+    mock_batch = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value
+
+    def slow_add_object(properties, uuid=None, vector=None):
+        time.sleep(0.05)
+        events.append(f"import {properties['term_id']}")
+
+    mock_batch.add_object.side_effect = slow_add_object
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": "A", "name": "a"}, {"id": "B", "name": "b"}],
+        "test_api_key"
+    )
+
+    assert events.index("embed b") < events.index("import A")
+    assert events[-1] == "import B"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_embedding_waits_for_retry_after():
+    """Test that a 429 with Retry-After is retried after the server's delay."""
+    from openai import RateLimitError
+
+    manager = OntologyManager()
+    response = MagicMock(status_code=429, headers={"retry-after": "2"})
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(side_effect=[
+        RateLimitError("Rate limit exceeded", response=response, body=None),
+        MagicMock(data=[MagicMock(embedding=[0.5])], usage=None)
+    ])
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai), \
+         patch('app.ontology_manager.asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
+         patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
+             "processing": {"max_retries": 1},
+             "performance": {"rate_limit_delay": 0.1, "max_requests_per_minute": 600}
+         }):
+        vectors = await manager._embed_texts(["text"], "test_api_key", 10, 1)
+
+    assert list(vectors[0]) == [0.5]
+    assert 2 <= mock_sleep.await_args.args[0] <= 3
+
+
+@pytest.mark.asyncio
+async def test_streamed_terms_imported_without_known_length(loaded_manager):
+    """Test that terms can be passed as a generator and are read window by window."""
+    pulled = []
+    progress_updates = []
+
+    def terms():
+        for i in range(5):
+            pulled.append(i)
+            yield {"id": f"GO:000{i}", "name": f"term {i}"}
+
+    async def embed(texts, *args, **kwargs):
+        # Beyond what is imported, only the current and prefetched windows have been read
+        assert len(pulled) - mock_batch.add_object.call_count <= 4
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 2},
+        "performance": {"max_concurrent_requests": 1}
+    }, embed_texts=embed)
+    mock_batch = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        terms(),
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(extra)
+    )
+
+    assert mock_batch.add_object.call_count == 5
+    assert progress_updates[-1]["total_terms"] == 5
+    assert progress_updates[-1]["processed_terms"] == 5
+    assert progress_updates[-1]["total_batches"] == 3
+
+
+def test_enhanced_terms_match_collection_schema():
+    """Test that enhanced terms carry exactly the collection's properties, so they import as is."""
+    from app.ontology_manager import _SCHEMA_PROPERTIES
+
+    manager = OntologyManager()
+    raw_terms = [
+        {"id": "GO:0001", "name": "parsed", "exact_synonyms": ["p"]},
+        {"id": "http://purl.obolibrary.org/obo/GO_0002", "lbl": "raw node", "meta": {}},
+        {"id": "GO:0003", "name": "plain"}
+    ]
+
+    schema = {prop.name for prop in _SCHEMA_PROPERTIES}
+    for term in manager._iter_enhanced_terms(raw_terms):
+        assert set(term) == schema
+
+
+def test_all_synonyms_stored_but_not_indexed():
+    """Test that all_synonyms keeps related synonyms without a duplicate inverted index."""
+    from app.ontology_manager import _SCHEMA_PROPERTIES
+
+    all_synonyms = next(prop for prop in _SCHEMA_PROPERTIES if prop.name == "all_synonyms")
+    assert all_synonyms.indexSearchable is False
+    assert all_synonyms.indexFilterable is False
+
+    node = {
+        "id": "http://purl.obolibrary.org/obo/GO_0001",
+        "lbl": "term",
+        "meta": {"synonyms": [
+            {"pred": "hasExactSynonym", "val": "exact"},
+            {"pred": "hasRelatedSynonym", "val": "related"}
+        ]}
+    }
+    term = next(OntologyManager()._iter_enhanced_terms([node]))
+    assert term["all_synonyms"] == ["exact", "related"]
+
+
+@pytest.mark.asyncio
+async def test_terms_prepared_in_worker_processes(loaded_manager):
+    """Test that preprocessing workers produce the same terms, in input order."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 2},
+        "performance": {"preprocessing_workers": 2},
+        "preprocessing": {"lowercase": True, "remove_punctuation": True}
+    })
+    mock_batch = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value
+    terms = [{"id": f"GO:000{i}", "name": f"Term {i}!"} for i in range(5)]
+
+    expected = [term["searchable_text"] for term in manager._iter_enhanced_terms(terms)]
+    await manager.create_and_load_ontology_collection("test_collection", terms, "test_api_key")
+
+    imported = [c.args[0]["searchable_text"] for c in mock_batch.add_object.call_args_list]
+    assert imported == expected == [f"term {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_embedding_request_size_independent_of_batch_size(loaded_manager):
+    """Test that OpenAI requests can be larger than Weaviate import batches."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 2, "embedding_request_size": 4},
+        "performance": {"max_concurrent_requests": 1}
+    })
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"GO:000{i}", "name": f"term {i}"} for i in range(6)],
+        "test_api_key"
+    )
+
+    assert [len(c.args[0]) for c in manager._embed_texts.call_args_list] == [4, 2]
+    assert all(c.args[2] == 4 for c in manager._embed_texts.call_args_list)
+    assert mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value.add_object.call_count == 6
+
+
+@pytest.mark.asyncio
+async def test_batch_size_calibrated_once_per_ontology(loaded_manager):
+    """Test that probe batches pick the fastest import batch size, which later loads reuse."""
+    manager, mock_client = loaded_manager({
+        "processing": {"batch_size": 100, "bulk_insert": True, "auto_tune_batch_size": True}
+    })
+    insert_many = mock_client.collections.get.return_value.data.insert_many
+
+    def slow_insert(objects):
+        # Fixed cost per request, so larger batches import faster per term
+        time.sleep(0.05)
+        return MagicMock(errors={})
+
+    insert_many.side_effect = slow_insert
+    terms = [{"id": f"GO:{i:05d}", "name": f"term {i}"} for i in range(3000)]
+
+    await manager.create_and_load_ontology_collection("GO_1", terms, "test_api_key")
+    first_load = [len(c.args[0]) for c in insert_many.call_args_list]
+    insert_many.reset_mock()
+    await manager.create_and_load_ontology_collection("GO_2", terms, "test_api_key")
+    second_load = [len(c.args[0]) for c in insert_many.call_args_list]
+
+    assert first_load == [16, 64, 256, 1024, 1024, 616]
+    assert second_load == [1024, 1024, 952]
+
+
+def test_calibrated_batch_size_picks_fastest_probe():
+    """Test that calibration picks the probed size with the highest throughput."""
+    from app.ontology_manager import _calibrated_batch_size
+
+    assert _calibrated_batch_size({16: 120.0, 64: 410.0, 256: 980.0, 1024: 730.0}) == 256
+    assert _calibrated_batch_size({1024: 500.0}) == 1024
+
+
+def test_calibrated_batch_size_prefers_smaller_on_tie():
+    """Test that equally fast sizes resolve to the smaller one, whatever the probe order."""
+    from app.ontology_manager import _calibrated_batch_size
+
+    assert _calibrated_batch_size({256: 900.0, 64: 900.0, 16: 300.0}) == 64
+    with pytest.raises(ValueError):
+        _calibrated_batch_size({})
+
+
+async def test_window_embedding_short_and_empty_last_windows(loaded_manager):
+    """Test that windows are taken in order, the last one short, then empty once the terms run out."""
+    manager, _ = loaded_manager({"cache": {"enabled": False}})
+    terms = iter([{"term_id": f"GO:{i}", "searchable_text": f"term number {i}"} for i in range(5)])
+
+    windows = [
+        await manager.start_window_embedding(terms, 2, 1, "test_api_key", 2, 1, {}, [])
+        for _ in range(4)
+    ]
+
+    assert [[term["term_id"] for term in window] for window, _ in windows] == [
+        ["GO:0", "GO:1"], ["GO:2", "GO:3"], ["GO:4"], []
+    ]
+    assert [len(vectors) for _, vectors in windows] == [2, 2, 1, 0]
+    assert manager._embed_texts.call_args_list[-1].args[0] == []
+
+
+async def test_window_embedding_leaves_sparse_terms_without_vectors(loaded_manager):
+    """Test that only terms with enough words are embedded; the rest get no vector."""
+    manager, _ = loaded_manager({"cache": {"enabled": False}})
+    terms = iter([
+        {"term_id": "GO:1", "searchable_text": "cell"},
+        {"term_id": "GO:2", "searchable_text": "cell division"},
+    ])
+
+    window, vectors = await manager.start_window_embedding(terms, 10, 2, "test_api_key", 10, 1, {}, [])
+
+    assert [term["term_id"] for term in window] == ["GO:1", "GO:2"]
+    assert vectors == [None, [0.1, 0.2, 0.3]]
+    assert manager._embed_texts.call_args.args[0] == ["cell division"]
+
+
+@pytest.mark.asyncio
+async def test_searchable_text_settings_resolved_once_per_import(loaded_manager):
+    """Test that the text settings are read once per import, not once per term."""
+    from app.ontology_manager import _SearchableTextConfig
+
+    manager, _ = loaded_manager()
+
+    with patch.object(_SearchableTextConfig, 'from_config', wraps=_SearchableTextConfig.from_config) as mock_from_config:
+        await manager.create_and_load_ontology_collection(
+            "test_collection",
+            [{"id": f"GO:{i:04d}", "name": f"term {i}"} for i in range(50)],
+            "test_api_key"
+        )
+
+    assert mock_from_config.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_bounded_concurrency():
+    """Test that embedding chunks run concurrently but within the configured limit."""
+    manager = OntologyManager()
+    token_counts = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def create(model, input):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "bad" in input:
+            raise RuntimeError("boom")
+        return MagicMock(
+            data=[MagicMock(embedding=[len(text)]) for text in input],
+            usage=MagicMock(total_tokens=len(input))
+        )
+
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = create
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai):
+        vectors = await manager._embed_texts(
+            ["a", "bb", "ccc", "bad", "eeeee", "ffffff"], "test_api_key", 2, 2, token_counts=token_counts
+        )
+
+    assert max_in_flight == 2
+    assert sorted(token_counts) == [2, 2]
+    assert [v if v is None else list(v) for v in vectors] == [[1], [2], None, None, [5], [6]]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model_config, expected_dimensions, expected_signature", [
+    ({"name": "text-embedding-3-small", "dimensions": 512}, 512, "text-embedding-3-small/512"),
+    ({"name": "text-embedding-3-small", "dimensions": 1536}, None, "text-embedding-3-small"),
+    ({"name": "text-ada-002", "dimensions": 512}, None, "text-embedding-ada-002"),
+])
+async def test_shortened_embeddings_requested_when_configured(model_config, expected_dimensions, expected_signature):
+    """Test that text-embedding-3 models are asked for the configured size and cache keys tell sizes apart."""
+    from app.ontology_manager import get_embedding_signature
+
+    manager = OntologyManager()
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(return_value=MagicMock(data=[MagicMock(embedding=[0.1])], usage=None))
+
+    with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {"model": model_config}), \
+         patch.object(manager, 'get_openai_client', return_value=mock_openai):
+        await manager._embed_texts(["alpha"], "test_api_key", 10, 1)
+        assert get_embedding_signature() == expected_signature
+
+    assert mock_openai.embeddings.create.call_args.kwargs.get("dimensions") == expected_dimensions
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_skips_unchanged_terms(tmp_path):
+    """Test that cached vectors are reused and only changed texts are sent to OpenAI."""
+    manager = OntologyManager()
+    config = {**EMBEDDINGS_CONFIG, "cache": {"enabled": True, "path": str(tmp_path / "cache.sqlite3")}}
+    stats = {"cache_hits": 0, "retry_count": 0}
+
+    async def embed(texts, *args, **kwargs):
+        return [[float(len(text)), 0.5] for text in texts]
+
+    with patch('app.ontology_manager.EMBEDDINGS_CONFIG', config), \
+         patch.object(manager, '_embed_texts', side_effect=embed) as mock_embed:
+        first = await manager._embed_texts_cached(["alpha", "beta"], "test_api_key", 10, 1, stats)
+        second = await manager._embed_texts_cached(["alpha", "gamma!"], "test_api_key", 10, 1, stats)
+
+    assert first == [[5.0, 0.5], [4.0, 0.5]]
+    assert [list(v) for v in second] == [[5.0, 0.5], [6.0, 0.5]]
+    assert mock_embed.call_args_list[1].args[0] == ["gamma!"]
+    assert stats["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_texts_embedded_once():
+    """Test that identical searchable texts share a single embedding request slot."""
+    manager = OntologyManager()
+
+    async def embed(texts, *args, **kwargs):
+        return [[float(len(text))] for text in texts]
+
+    with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {"cache": {"enabled": False}}), \
+         patch.object(manager, '_embed_texts', side_effect=embed) as mock_embed:
+        vectors = await manager._embed_texts_cached(["aa", "b", "aa", "b", "ccc"], "test_api_key", 10, 1)
+
+    assert mock_embed.call_args.args[0] == ["aa", "b", "ccc"]
+    assert vectors == [[2.0], [1.0], [2.0], [1.0], [3.0]]
+
+
+def test_embedding_chunks_respect_request_limits():
+    """Test that embedding requests stay within OpenAI's input count and token limits."""
+    chunks = OntologyManager.chunk_embedding_inputs(["a"] * 5000, 4096)
+    assert [len(c) for c in chunks] == [2048, 2048, 904]
+
+    long_text = "x" * 400_000  # ~100k estimated tokens
+    chunks = OntologyManager.chunk_embedding_inputs([long_text] * 5, 100)
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_existing_collection_checked_on_server_before_delete(loaded_manager):
+    """Test that a reload deletes the collection only once the server reports it, under its stored name."""
+    from weaviate.util import _capitalize_first_letter
+
+    manager, mock_client = loaded_manager()
+    # Weaviate stores collection names with a capitalized first letter
+    server_names = set()
+    mock_client.collections.exists.side_effect = lambda name: _capitalize_first_letter(name) in server_names
+    mock_client.collections.create.side_effect = lambda name, **kwargs: server_names.add(_capitalize_first_letter(name))
+
+    test_terms = [{"id": "GO:0001", "name": "test term 1", "definition": "test def 1"}]
+
+    await manager.create_and_load_ontology_collection("test_collection", test_terms, "test_api_key")
+    mock_client.collections.delete.assert_not_called()
+
+    await manager.create_and_load_ontology_collection("test_collection", test_terms, "test_api_key")
+
+    assert server_names == {"Test_collection"}
+    mock_client.collections.delete.assert_called_once_with("test_collection")
+
+
+@pytest.mark.asyncio
+async def test_collection_created_concurrently_replaced_once(loaded_manager):
+    """Test that a create racing another worker's deletes the other collection and creates it again."""
+    from weaviate.exceptions import WeaviateBaseError
+
+    manager, mock_client = loaded_manager()
+    mock_client.collections.exists.side_effect = [False, True]
+    mock_client.collections.create.side_effect = [
+        WeaviateBaseError("class name Test_collection already exists"), None
+    ]
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection", [{"id": "GO:0001", "name": "term"}], "test_api_key"
+    )
+
+    mock_client.collections.delete.assert_called_once_with("test_collection")
+    assert mock_client.collections.create.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_batch_processing_with_failures():
     """Test batch processing handles failures gracefully."""
@@ -120,14 +891,14 @@ async def test_batch_processing_with_failures():
     
     # Simulate batch failures
     failure_count = 0
-    def add_object_side_effect(obj):
+    def add_object_side_effect(obj, uuid=None, vector=None):
         nonlocal failure_count
         if failure_count < 2 and "fail" in obj.get("name", ""):
             failure_count += 1
             raise Exception("Simulated batch error")
     
     mock_batch.add_object = MagicMock(side_effect=add_object_side_effect)
-    mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+    mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
     mock_client.collections.get.return_value = mock_collection
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
@@ -138,7 +909,8 @@ async def test_batch_processing_with_failures():
     def progress_callback(status, percentage, message, extra_data):
         progress_updates.append(extra_data)
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         # Test data with some terms that will fail
         test_terms = [
             {"id": "GO:0001", "name": "test term 1", "definition": "test def 1"},
@@ -176,14 +948,14 @@ async def test_openai_rate_limit_handling():
     
     # Simulate rate limit error on first attempt, success on retry
     call_count = 0
-    def batch_context_side_effect():
+    def batch_context_side_effect(**kwargs):
         nonlocal call_count
         call_count += 1
         if call_count == 1:
             raise RateLimitError("Rate limit exceeded", response=None, body=None)
         return mock_batch
     
-    mock_collection.batch.dynamic.side_effect = batch_context_side_effect
+    mock_collection.batch.fixed_size.side_effect = batch_context_side_effect
     mock_client.collections.get.return_value = mock_collection
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
@@ -198,7 +970,8 @@ async def test_openai_rate_limit_handling():
             "extra_data": extra_data
         })
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         with patch.dict(EMBEDDINGS_CONFIG, {
             "processing": {"retry_failed": True, "max_retries": 3}
         }):
@@ -250,7 +1023,8 @@ async def test_cancellation_during_embedding():
             "message": message
         })
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         # Large dataset to ensure cancellation happens during processing
         test_terms = [
             {"id": f"DO:{i:04d}", "name": f"disease {i}", "definition": f"def {i}"}
@@ -274,6 +1048,56 @@ async def test_cancellation_during_embedding():
     assert "cancelled" in progress_updates[-1]["message"].lower()
 
 
+@pytest.mark.asyncio
+async def test_cancellation_event_stops_between_batches(loaded_manager):
+    """Test that a set cancellation event stops the import without polling a callback."""
+    manager, mock_client = loaded_manager({"processing": {"batch_size": 2}})
+    add_object = mock_client.collections.get.return_value.batch.fixed_size.return_value.__enter__.return_value.add_object
+    cancel = asyncio.Event()
+    progress_updates = []
+
+    def on_progress(status, percentage, message, extra):
+        progress_updates.append(status)
+        if status == "embedding_batch":
+            cancel.set()
+
+    await manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"DO:{i:04d}", "name": f"disease {i}"} for i in range(10)],
+        "test_api_key",
+        on_progress,
+        cancellation_event=cancel
+    )
+
+    assert add_object.call_count < 10
+    assert progress_updates[-1] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_task_cancellation_reports_cancelled_status(loaded_manager):
+    """Test that cancelling the loading task stops it mid-wait and reports the cancellation."""
+    embedding_started = asyncio.Event()
+    progress_updates = []
+
+    async def slow_embed_texts(texts, *args, **kwargs):
+        embedding_started.set()
+        await asyncio.sleep(60)
+
+    manager, _ = loaded_manager(embed_texts=slow_embed_texts)
+    task = asyncio.create_task(manager.create_and_load_ontology_collection(
+        "test_collection",
+        [{"id": f"DO:{i:04d}", "name": f"disease {i}"} for i in range(10)],
+        "test_api_key",
+        lambda status, percentage, message, extra: progress_updates.append(status)
+    ))
+    await asyncio.wait_for(embedding_started.wait(), timeout=5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert progress_updates[-1] == "cancelled"
+
+
 @pytest.mark.asyncio
 async def test_embeddings_config_loading():
     """Test loading embeddings configuration."""
@@ -437,7 +1261,7 @@ async def test_retry_logic_with_rate_limit():
     # Track retry attempts
     add_object_call_count = 0
     
-    def mock_add_object(obj):
+    def mock_add_object(obj, uuid=None, vector=None):
         nonlocal add_object_call_count
         add_object_call_count += 1
         if add_object_call_count <= 2:
@@ -447,7 +1271,7 @@ async def test_retry_logic_with_rate_limit():
         return True
     
     mock_batch.add_object = mock_add_object
-    mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+    mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
     mock_client.collections.get.return_value = mock_collection
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
@@ -461,7 +1285,8 @@ async def test_retry_logic_with_rate_limit():
             "message": message
         })
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
             "processing": {"batch_size": 1, "max_retries": 3, "retry_failed": True},
             "performance": {"rate_limit_delay": 0.01},
@@ -498,16 +1323,20 @@ async def test_batch_partial_failure_handling():
     
     # Track which terms get added
     successful_terms = []
+    rejected_objects = []
     
-    def mock_add_object(obj):
-        # Fail for terms with id ending in 2
+    def mock_add_object(obj, uuid=None, vector=None):
+        # The server rejects terms with id ending in 2; the client reports them after the flush
         if obj["term_id"].endswith("2"):
-            raise Exception("Failed to add term")
+            rejected = MagicMock(message="Failed to add term")
+            rejected.object_.properties = obj
+            rejected_objects.append(rejected)
+            return
         successful_terms.append(obj["term_id"])
-        return True
     
     mock_batch.add_object = mock_add_object
-    mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+    mock_collection.batch.failed_objects = rejected_objects
+    mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
     mock_client.collections.get.return_value = mock_collection
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
@@ -519,7 +1348,8 @@ async def test_batch_partial_failure_handling():
         if extra_data:
             final_stats.update(extra_data)
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
             "processing": {"batch_size": 5, "max_retries": 0, "retry_failed": False},
             "performance": {"rate_limit_delay": 0},
@@ -548,6 +1378,7 @@ async def test_batch_partial_failure_handling():
             assert "GO:0003" in successful_terms
             assert "GO:0012" not in successful_terms
             assert "GO:0004" in successful_terms
+            mock_collection.batch.fixed_size.assert_called_once_with(batch_size=3, concurrent_requests=2)
             
             # Check final stats
             assert final_stats["processed_terms"] == 3
@@ -570,7 +1401,7 @@ async def test_cancellation_during_embedding():
     cancelled = False
     terms_processed = 0
     
-    def mock_add_object(obj):
+    def mock_add_object(obj, uuid=None, vector=None):
         nonlocal terms_processed
         terms_processed += 1
         # Simulate slow processing
@@ -578,7 +1409,7 @@ async def test_cancellation_during_embedding():
         return True
     
     mock_batch.add_object = mock_add_object
-    mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+    mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
     mock_client.collections.get.return_value = mock_collection
     mock_client.collections.create = MagicMock()
     mock_client.is_ready.return_value = True
@@ -597,7 +1428,8 @@ async def test_cancellation_during_embedding():
             cancelled = True
         return cancelled
     
-    with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+    with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+         patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
         with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
             "processing": {"batch_size": 2, "max_retries": 1, "retry_failed": True},
             "performance": {"rate_limit_delay": 0},
@@ -667,12 +1499,13 @@ async def test_embeddings_config_applied():
         mock_collection = MagicMock()
         mock_batch = MagicMock()
         mock_batch.add_object = MagicMock()
-        mock_collection.batch.dynamic.return_value.__enter__.return_value = mock_batch
+        mock_collection.batch.fixed_size.return_value.__enter__.return_value = mock_batch
         mock_client.collections.get.return_value = mock_collection
         mock_client.collections.create = MagicMock()
         mock_client.is_ready.return_value = True
         
-        with patch.object(manager, 'get_weaviate_client', return_value=mock_client):
+        with patch.object(manager, 'get_weaviate_client', return_value=mock_client), \
+             patch.object(manager, '_embed_texts', side_effect=fake_embed_texts):
             with patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
                 "vectorize_fields": {"name": False, "definition": True, "synonyms": False},
                 "preprocessing": {"lowercase": True, "remove_punctuation": True},
@@ -689,4 +1522,4 @@ async def test_embeddings_config_applied():
                 # Verify config was used
                 assert len(build_text_calls) == 1
                 assert build_text_calls[0]["vectorize_fields"] == {"name": False, "definition": True, "synonyms": False}
-                assert build_text_calls[0]["preprocessing"] == {"lowercase": True, "remove_punctuation": True}
\ No newline at end of file
+                assert build_text_calls[0]["preprocessing"] == {"lowercase": True, "remove_punctuation": True}
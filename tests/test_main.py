@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, MagicMock, patch, AsyncMock
 from fastapi.testclient import TestClient
 
 from app.main import app, get_ontology_config, get_nested_value, _perform_ontology_update
@@ -68,6 +68,13 @@ class TestHelperFunctions:
         result = get_nested_value({}, ["meta", "definition", "val"])
         assert result == ""
 
+    def test_get_nested_value_non_dict_intermediate(self):
+        """Test getting nested value when the path runs into a non-dict value."""
+        data = {"meta": {"definition": "plain string"}}
+
+        result = get_nested_value(data, ["meta", "definition", "val"], "default")
+        assert result == "default"
+
 
 class TestAPI:
     """Test API endpoints."""
@@ -98,18 +105,16 @@ class TestAPI:
         assert "GO" in data["ontologies"]
         assert data["ontologies"]["GO"]["name"] == "Gene Ontology"
 
-    @patch("app.main.ontology_manager")
-    @patch("app.main.searcher")
-    @patch("app.main.matcher")
-    def test_resolve_biocurated_data_success(self, mock_llm, mock_searcher, mock_ontology_manager):
+    @patch("app.main.services")
+    def test_resolve_biocurated_data_success(self, mock_services):
         """Test successful biocurated data resolution."""
         # Mock searcher results
-        mock_searcher.search_ontology = AsyncMock(return_value=[
+        mock_services.searcher.search_ontology = AsyncMock(return_value=[
             {"id": "GO:0001", "name": "Test Term", "definition": "Test definition"}
         ])
         
         # Mock LLM matcher results
-        mock_llm.select_best_match = AsyncMock(return_value={
+        mock_services.matcher.select_best_match = AsyncMock(return_value={
             "id": "GO:0001", 
             "name": "Test Term",
             "confidence": 0.9,
@@ -117,7 +122,7 @@ class TestAPI:
         })
         
         # Mock ontology manager
-        mock_ontology_manager.get_current_ontology_version.return_value = "GO_collection_test"
+        mock_services.ontology_manager.get_current_ontology_version.return_value = "GO_collection_test"
         
         response = self.client.post(
             "/resolve_biocurated_data",
@@ -128,6 +133,73 @@ class TestAPI:
         data = response.json()
         assert "best_match" in data
         assert data["best_match"]["id"] == "GO:0001"
+        assert data["best_match"]["definition"] == "Test definition"
+        assert data["alternatives"] == []
+
+    @patch("app.main.ADMIN_API_KEY", None)
+    @patch("app.main._perform_ontology_update", new_callable=AsyncMock)
+    def test_update_ontology_returns_task_id(self, mock_update):
+        """Test that an update request is accepted and can be polled by task id."""
+        response = self.client.post(
+            "/admin/update_ontology",
+            headers={"X-API-Key": "test"},
+            json={"ontology_name": "GO", "source_url": "http://example.com/go.json"}
+        )
+
+        assert response.status_code == 202
+        task_id = response.json()["task_id"]
+        assert response.json()["status"] == "queued"
+        mock_update.assert_awaited_once_with("GO", "http://example.com/go.json", task_id)
+
+        status = self.client.get(
+            "/admin/ontology_status", params={"task_id": task_id}, headers={"X-API-Key": "test"}
+        )
+        assert status.status_code == 200
+        assert status.json()["ontology_name"] == "GO"
+
+        missing = self.client.get(
+            "/admin/ontology_status", params={"task_id": "unknown"}, headers={"X-API-Key": "test"}
+        )
+        assert missing.status_code == 404
+
+    @patch("app.main.services")
+    def test_lifespan_warms_up_and_closes_weaviate(self, mock_services):
+        """Test that each worker connects at startup and closes its clients on shutdown."""
+        mock_services.warm_up = AsyncMock()
+        mock_services.ontology_manager.close = AsyncMock()
+
+        with TestClient(app):
+            mock_services.warm_up.assert_awaited_once()
+            mock_services.ontology_manager.close.assert_not_awaited()
+
+        mock_services.ontology_manager.close.assert_awaited_once()
+
+    @patch("app.main.LLMMatcher")
+    @patch("app.main.OntologySearcher")
+    @patch("app.main.OntologyManager")
+    async def test_services_warm_up_builds_every_service(self, mock_manager, mock_searcher, mock_matcher):
+        """Test that warming up connects the manager and constructs the searcher and matcher."""
+        from app.main import _Services
+
+        mock_manager.return_value.warmup = AsyncMock()
+        services = _Services()
+        await services.warm_up()
+
+        mock_manager.return_value.warmup.assert_awaited_once()
+        mock_searcher.assert_called_once_with(mock_manager.return_value)
+        mock_matcher.assert_called_once_with()
+
+    @patch("app.main.ADMIN_API_KEY", None)
+    @patch("app.main.openai.Client")
+    def test_embeddings_config_check_uses_api_model_name(self, mock_openai_client):
+        """Test that the configuration check sends the same model identifier as ingestion."""
+        mock_openai_client.return_value.embeddings.create.return_value.data = [MagicMock(embedding=[0.1, 0.2])]
+
+        with patch("app.ontology_manager.EMBEDDINGS_CONFIG", {"model": {"name": "text-ada-002"}}):
+            response = self.client.post("/admin/test_embeddings_config", headers={"X-API-Key": "test"})
+
+        assert response.json()["model"] == "text-embedding-ada-002"
+        assert mock_openai_client.return_value.embeddings.create.call_args.kwargs["model"] == "text-embedding-ada-002"
 
     def test_resolve_biocurated_data_missing_fields(self):
         """Test biocurated data resolution with missing fields."""
@@ -204,4 +276,36 @@ class TestOntologyUpdate:
         mock_session.return_value.__aexit__ = AsyncMock(return_value=None)
         
         with pytest.raises(ValueError, match="Failed to download ontology"):
-            await _perform_ontology_update("GO", "http://example.com/invalid.json")
\ No newline at end of file
+            await _perform_ontology_update("GO", "http://example.com/invalid.json")
+
+
+class TestConditionalDownload:
+    """Test that repeat downloads are made conditional on the stored validators."""
+
+    @staticmethod
+    def _response(status_code, body=b"", headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = {"content-length": str(len(body)), **(headers or {})}
+        response.iter_content.return_value = [body]
+        response.__enter__.return_value = response
+        return response
+
+    async def test_not_modified_skips_download(self, tmp_path, monkeypatch):
+        """Test that a 304 on the second update keeps the existing file."""
+        monkeypatch.setenv("ONTOLOGY_DATA_DIR", str(tmp_path))
+        first = self._response(200, b'{"graphs": []}', {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        second = self._response(304)
+
+        with patch("requests.get", side_effect=[first, second]) as mock_get:
+            await _perform_ontology_update("GO", "http://example.com/go.json")
+            result = await _perform_ontology_update("GO", "http://example.com/go.json")
+
+        assert mock_get.call_args_list[0].kwargs["headers"] == {}
+        assert mock_get.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+        }
+        assert result["not_modified"] is True
+        assert (tmp_path / "source_ontologies" / "GO.json").read_bytes() == b'{"graphs": []}'
+
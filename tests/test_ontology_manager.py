@@ -0,0 +1,90 @@
+"""Test the ontology manager's client handling and helpers."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.ontology_manager import OntologyManager
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("http://weaviate:8080", ("weaviate", 8080)),
+    ("https://weaviate.example.org", ("weaviate.example.org", 8080)),
+    ("http://localhost:8081/weaviate", ("localhost", 8081)),
+    ("http://[::1]:9090", ("::1", 9090)),
+    ("weaviate:8085", ("weaviate", 8085)),
+])
+def test_weaviate_url_parsed(url, expected):
+    """Test that the Weaviate host and port survive paths, IPv6 hosts and missing schemes."""
+    from app.ontology_manager import _parse_weaviate_url
+
+    assert _parse_weaviate_url(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_beyond_burst():
+    """Test that the token bucket lets a burst through and then paces requests."""
+    from app.ontology_manager import _RateLimiter
+
+    limiter = _RateLimiter(2, 0.1)
+    started = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+
+    # Two tokens up front, then one every 0.05s
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_sync_client_connected_once_off_the_event_loop():
+    """Test that concurrent callers share one sync client connected in a worker thread."""
+    manager = OntologyManager()
+    connect_threads = []
+
+    def connect(**kwargs):
+        connect_threads.append(threading.current_thread())
+        time.sleep(0.01)
+        return MagicMock()
+
+    with patch('app.ontology_manager.WEAVIATE_API_KEY', None), \
+         patch('app.ontology_manager.weaviate.connect_to_local', side_effect=connect) as mock_connect:
+        clients = await asyncio.gather(manager.get_weaviate_client(), manager.get_weaviate_client())
+
+    assert clients[0] is clients[1]
+    assert len(connect_threads) == 1
+    assert mock_connect.call_args.kwargs["additional_config"].timeout.insert == 120
+    assert connect_threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_openai_client_pooled_and_closed():
+    """Test that one pooled OpenAI client serves every request until the manager is closed."""
+    manager = OntologyManager()
+
+    with patch('app.ontology_manager.httpx.Limits', wraps=httpx.Limits) as mock_limits, \
+         patch('app.ontology_manager.EMBEDDINGS_CONFIG', {"performance": {"max_concurrent_requests": 4}}):
+        client = await manager.get_openai_client("test_api_key")
+        assert await manager.get_openai_client("test_api_key") is client
+
+    mock_limits.assert_called_once_with(max_connections=4, max_keepalive_connections=4)
+
+    await manager.close()
+    assert client.is_closed()
+    assert await manager.get_openai_client("test_api_key") is not client
+
+
+@pytest.mark.asyncio
+async def test_openai_client_replaced_on_key_change_closes_previous():
+    """Test that a new API key gets a new client and the old one's connections are released."""
+    manager = OntologyManager()
+
+    first = await manager.get_openai_client("first_key")
+    second = await manager.get_openai_client("second_key")
+
+    assert second is not first
+    assert first.is_closed() and not second.is_closed()
+    await manager.close()
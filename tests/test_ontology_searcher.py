@@ -0,0 +1,168 @@
+"""Test ontology searches and passage embedding."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.ontology_manager import OntologyManager
+from app.ontology_searcher import _THREADED_CANDIDATES_MIN, OntologySearcher
+
+
+@pytest.mark.asyncio
+async def test_searches_reuse_pooled_clients():
+    """Test that searches embed through the manager's async OpenAI client and connect to Weaviate once."""
+    manager = OntologyManager()
+    searcher = OntologySearcher(manager, openai_api_key="test_api_key")
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(return_value=MagicMock(data=[MagicMock(embedding=[0.1, 0.2])]))
+    mock_weaviate = MagicMock(connect=AsyncMock())
+    mock_weaviate.collections.get.return_value.query.near_vector = AsyncMock(return_value=MagicMock(objects=[]))
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai) as get_openai, \
+         patch('app.ontology_manager.weaviate.use_async_with_local', return_value=mock_weaviate) as use_local, \
+         patch('app.ontology_manager.WEAVIATE_API_KEY', None):
+        assert await searcher.search_ontology("first passage", "GO_1") == []
+        assert await searcher.search_ontology("second passage", "GO_1") == []
+
+    get_openai.assert_called_with("test_api_key")
+    assert mock_openai.embeddings.create.await_count == 2
+    mock_weaviate.connect.assert_awaited_once()
+    assert use_local.call_args.kwargs["grpc_port"] == 50051
+    query = mock_weaviate.collections.get.return_value.query.near_vector.call_args.kwargs
+    assert query["near_vector"] == [0.1, 0.2]
+    assert query["return_metadata"].distance and query["return_metadata"].certainty
+
+
+@pytest.mark.asyncio
+async def test_batch_search_embeds_passages_in_one_request():
+    """Test that a batch search sends one embedding request and queries each passage's vector."""
+    manager = OntologyManager()
+    searcher = OntologySearcher(manager, openai_api_key="test_api_key")
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(return_value=MagicMock(data=[
+        MagicMock(embedding=[0.1]), MagicMock(embedding=[0.2])
+    ]))
+    hits = {0.1: "GO:0001", 0.2: "GO:0002"}
+
+    async def near_vector(near_vector, **kwargs):
+        obj = MagicMock(properties={"term_id": hits[near_vector[0]]})
+        return MagicMock(objects=[obj])
+
+    mock_weaviate = MagicMock()
+    mock_weaviate.collections.get.return_value.query.near_vector = near_vector
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai), \
+         patch.object(manager, 'get_async_weaviate_client', AsyncMock(return_value=mock_weaviate)):
+        results = await searcher.search_ontology_batch(["first passage", "second passage"], "GO_1", k=3)
+        assert await searcher.search_ontology_batch([], "GO_1") == []
+
+    mock_openai.embeddings.create.assert_awaited_once()
+    assert mock_openai.embeddings.create.call_args.kwargs["input"] == ["first passage", "second passage"]
+    assert [[c["id"] for c in candidates] for candidates in results] == [["GO:0001"], ["GO:0002"]]
+    assert "term_id" not in results[0][0]
+    assert (results[0][0]["cross_references"], results[0][0]["namespace"]) == ([], "")
+
+
+@pytest.mark.asyncio
+async def test_large_result_candidates_built_off_event_loop():
+    """Test that candidates of a large result are built in a thread and small results inline."""
+    searcher = OntologySearcher(OntologyManager(), openai_api_key="test_api_key")
+    objects = [
+        MagicMock(properties={"term_id": f"GO:{i:07d}"}, metadata=MagicMock(distance=0.25, certainty=None))
+        for i in range(_THREADED_CANDIDATES_MIN)
+    ]
+    mock_weaviate = MagicMock()
+    near_vector = AsyncMock(side_effect=[MagicMock(objects=objects), MagicMock(objects=objects[:3])])
+    mock_weaviate.collections.get.return_value.query.near_vector = near_vector
+
+    with patch('app.ontology_searcher.asyncio.to_thread', wraps=asyncio.to_thread) as to_thread:
+        large = await searcher._query_candidates(mock_weaviate, "passage", "GO_1", [0.1], k=len(objects))
+        small = await searcher._query_candidates(mock_weaviate, "passage", "GO_1", [0.1], k=3)
+
+    to_thread.assert_called_once()
+    assert [c["id"] for c in large] == [obj.properties["term_id"] for obj in objects]
+    assert (small[0]["similarity_distance"], small[0]["similarity_certainty"]) == (0.25, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_collection_handle_reused_until_client_changes():
+    """Test that the searcher looks each collection up once per Weaviate client."""
+    searcher = OntologySearcher(OntologyManager(), openai_api_key="test_api_key")
+    first_client, second_client = MagicMock(), MagicMock()
+    for client in (first_client, second_client):
+        client.collections.get.return_value.query.near_vector = AsyncMock(return_value=MagicMock(objects=[]))
+
+    for client in (first_client, first_client, second_client):
+        await searcher._query_candidates(client, "passage", "GO_1", [0.1], k=5)
+
+    first_client.collections.get.assert_called_once_with("GO_1")
+    second_client.collections.get.assert_called_once_with("GO_1")
+
+
+@pytest.mark.asyncio
+async def test_large_passage_batch_split_across_requests():
+    """Test that more passages than one request takes are embedded in several requests, in order."""
+    manager = OntologyManager()
+    searcher = OntologySearcher(manager, openai_api_key="test_api_key")
+    passages = [f"passage {i}" for i in range(3000)]
+
+    async def create(input, **kwargs):
+        return MagicMock(data=[MagicMock(embedding=[float(text.split()[1])]) for text in input])
+
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(side_effect=create)
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai), \
+         patch('app.ontology_manager.EMBEDDINGS_CONFIG', {"cache": {"enabled": False}}):
+        embeddings = await searcher._embed_passages(passages)
+
+    assert [len(c.kwargs["input"]) for c in mock_openai.embeddings.create.call_args_list] == [2048, 952]
+    assert embeddings == [[float(i)] for i in range(3000)]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_passages_in_batch_embedded_once():
+    """Test that a passage repeated within a batch is requested once and returned at each position."""
+    manager = OntologyManager()
+    searcher = OntologySearcher(manager, openai_api_key="test_api_key")
+
+    async def create(input, **kwargs):
+        return MagicMock(data=[MagicMock(embedding=[float(len(text))]) for text in input])
+
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(side_effect=create)
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai), \
+         patch('app.ontology_manager.EMBEDDINGS_CONFIG', {"cache": {"enabled": False}}):
+        embeddings = await searcher._embed_passages(["ab", "abc", "ab", "ab"])
+
+    mock_openai.embeddings.create.assert_awaited_once()
+    assert mock_openai.embeddings.create.call_args.kwargs["input"] == ["ab", "abc"]
+    assert embeddings == [[2.0], [3.0], [2.0], [2.0]]
+
+
+@pytest.mark.asyncio
+async def test_repeated_passage_embedded_once(tmp_path):
+    """Test that a passage searched again is embedded from the passage cache instead of OpenAI."""
+    from app.embedding_cache import EmbeddingCache
+    from app.ontology_manager import get_embedding_signature
+    manager = OntologyManager()
+    searcher = OntologySearcher(manager, openai_api_key="test_api_key")
+    mock_openai = MagicMock()
+    mock_openai.embeddings.create = AsyncMock(return_value=MagicMock(data=[MagicMock(embedding=[0.5, 0.25])]))
+
+    with patch.object(manager, 'get_openai_client', return_value=mock_openai), \
+         patch('app.ontology_manager.EMBEDDINGS_CONFIG', {
+             "cache": {"enabled": True, "path": str(tmp_path / "cache.sqlite3")}
+         }):
+        first = await searcher._embed_passages(["apoptosis of T cells"])
+        second = await searcher._embed_passages(["apoptosis of T cells"])
+        key = EmbeddingCache.make_key(get_embedding_signature(), "apoptosis of T cells")
+        term_cache = manager._get_embedding_cache()
+
+    mock_openai.embeddings.create.assert_awaited_once()
+    assert first == second == [[0.5, 0.25]]
+    assert isinstance(second[0], list)
+    # Search input never lands in the term vectors reused by imports
+    assert term_cache.get_many([key]) == {}
@@ -1,7 +1,8 @@
 """Tests for OpenAI API client."""
+import asyncio
 import pytest
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 from app.openai_client import (
     OpenAIEmbeddingClient, 
@@ -399,4 +400,82 @@ class TestOpenAIEmbeddingClient:
                 with patch.object(client, '_is_retryable_error', return_value=True):
                     results = client.generate_embeddings(["text1", "text2"])
                     assert len(results) == 2
-                    assert all(isinstance(r, EmbeddingResult) for r in results)
\ No newline at end of file
+                    assert all(isinstance(r, EmbeddingResult) for r in results)
+
+    @pytest.mark.skipif(not OPENAI_AVAILABLE, reason="OpenAI library not available")
+    def test_generate_embeddings_splits_large_batches_sequentially(self, mock_config):
+        """Test that a batch larger than one request is sent as sequential chunks and kept in order."""
+        def create(input, **kwargs):
+            return Mock(data=[Mock(embedding=[float(text)]) for text in input], usage=None)
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            with patch("app.openai_client.OpenAI") as mock_openai, \
+                 patch("app.openai_client.AsyncOpenAI") as mock_async_openai:
+                mock_openai.return_value.embeddings.create.return_value = Mock(data=[Mock()])
+
+                client = OpenAIEmbeddingClient(config=mock_config)
+                mock_create = mock_openai.return_value.embeddings.create
+                mock_create.reset_mock()
+                mock_create.side_effect = create
+
+                texts = [str(i) for i in range(2500)]
+                results = client.generate_embeddings(texts)
+
+        mock_async_openai.assert_not_called()
+        assert [len(c.kwargs["input"]) for c in mock_create.call_args_list] == [1000, 1000, 500]
+        assert [r.embedding[0] for r in results] == [float(i) for i in range(2500)]
+        assert [r.text for r in results] == texts
+
+    @pytest.mark.skipif(not OPENAI_AVAILABLE, reason="OpenAI library not available")
+    def test_generate_embeddings_works_inside_running_loop(self, mock_config):
+        """Test that the sync path does not start its own event loop, so async callers can use it."""
+        def create(input, **kwargs):
+            return Mock(data=[Mock(embedding=[0.0]) for _ in input], usage=None)
+
+        async def call_from_loop(client):
+            return client.generate_embeddings([str(i) for i in range(1500)])
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            with patch("app.openai_client.OpenAI") as mock_openai:
+                mock_openai.return_value.embeddings.create.return_value = Mock(data=[Mock()])
+                client = OpenAIEmbeddingClient(config=mock_config)
+                mock_openai.return_value.embeddings.create.side_effect = create
+
+                results = asyncio.run(call_from_loop(client))
+
+        assert len(results) == 1500
+
+    @pytest.mark.skipif(not OPENAI_AVAILABLE, reason="OpenAI library not available")
+    @pytest.mark.asyncio
+    async def test_agenerate_embeddings_chunks_with_shared_async_client(self, mock_config):
+        """Test that async generation honours the chunk and concurrency overrides and reuses one client."""
+        in_flight = {"now": 0, "max": 0}
+
+        async def create(input, **kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0)
+            in_flight["now"] -= 1
+            return Mock(data=[Mock(embedding=[float(text)]) for text in input], usage=Mock(total_tokens=len(input)))
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+            with patch("app.openai_client.OpenAI") as mock_openai, \
+                 patch("app.openai_client.AsyncOpenAI") as mock_async_openai:
+                mock_openai.return_value.embeddings.create.return_value = Mock(data=[Mock()])
+                mock_async_openai.return_value.embeddings.create = AsyncMock(side_effect=create)
+
+                client = OpenAIEmbeddingClient(config=mock_config)
+                results = await client.agenerate_embeddings(
+                    ["1", "2", "", "3", "4", "5"], dimensions=256, chunk_size=2, max_concurrency=1
+                )
+                assert await client.agenerate_embeddings([]) == []
+                await client.agenerate_embeddings(["6"])
+
+        mock_async_openai.assert_called_once()
+        calls = mock_async_openai.return_value.embeddings.create.call_args_list
+        assert [c.kwargs["input"] for c in calls] == [["1", "2"], ["3", "4"], ["5"], ["6"]]
+        assert all(c.kwargs["dimensions"] == 256 for c in calls[:3])
+        assert in_flight["max"] == 1
+        assert [(r.text, r.embedding, r.token_count) for r in results] == [
+            ("1", [1.0], 1), ("2", [2.0], 1), ("3", [3.0], 1), ("4", [4.0], 1), ("5", [5.0], 1)
+        ]
@@ -0,0 +1,23 @@
+"""Tests for the shared retry backoff."""
+from unittest.mock import MagicMock
+
+from app.retry import retry_after, retry_delay
+
+
+def test_retry_after_header_parsed():
+    """Test that Retry-After is honoured when present and capped."""
+    assert retry_after(MagicMock(response=MagicMock(headers={"retry-after": "7"}))) == 7
+    assert retry_after(MagicMock(response=MagicMock(headers={"retry-after": "3600"}))) == 60
+    assert retry_after(MagicMock(response=MagicMock(headers={"retry-after": "soon"}))) == 0
+    assert retry_after(Exception("no response")) == 0
+    assert retry_after(MagicMock(response=MagicMock(headers={"retry-after-ms": "250", "retry-after": "1"}))) == 0.25
+
+
+def test_retry_delay_jittered_and_capped():
+    """Test that backoff doubles per attempt within jitter bounds, is capped, and defers to Retry-After."""
+    for attempt, (low, high) in {1: (1, 2), 2: (2, 4), 5: (15, 30)}.items():
+        delays = [retry_delay(None, attempt, base=1.0, cap=30) for _ in range(50)]
+        assert all(low <= delay <= high for delay in delays)
+        assert len(set(delays)) > 1
+    rate_limited = MagicMock(response=MagicMock(headers={"retry-after": "7"}))
+    assert 7 <= retry_delay(rate_limited, 1, base=1.0, cap=30) <= 8
@@ -308,4 +308,32 @@ class TestVersionManagerIntegration:
         
         # Use a non-existent ontology name
         result = version_manager.get_stored_version_info("NONEXISTENT_ONTOLOGY")
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+    def test_stored_version_info_parsed_again_only_after_change(self, tmp_path):
+        """Test that unchanged metadata is served from memory and a new store is picked up."""
+        version_manager = OntologyVersionManager(str(tmp_path))
+        version_manager.store_version_info("GO", {"version_date": "2025-03-16"}, "GO_1", "http://example.com/go.json")
+
+        from app import ontology_version_manager
+
+        with patch.object(ontology_version_manager, "_json_loads", wraps=ontology_version_manager._json_loads) as load:
+            first = version_manager.get_stored_version_info("GO")
+            assert version_manager.get_stored_version_info("GO") is first
+            assert load.call_count == 1
+
+            version_manager.store_version_info("GO", {"version_date": "2025-03-17"}, "GO_2", "http://example.com/go.json")
+            assert version_manager.get_stored_version_info("GO")["collection_name"] == "GO_2"
+            assert load.call_count == 2
+
+    def test_cleanup_removes_metadata_of_dropped_collections(self, tmp_path):
+        """Test that cleanup keeps metadata of current collections and removes the rest."""
+        version_manager = OntologyVersionManager(str(tmp_path))
+        for ontology_name, collection_name in (("GO", "GO_2"), ("DOID", "DOID_1")):
+            version_manager.store_version_info(ontology_name, {}, collection_name, "http://example.com")
+        version_manager.list_stored_versions()
+
+        version_manager.cleanup_old_collections(["GO_2"])
+
+        assert list(version_manager.list_stored_versions()) == ["GO"]
+        assert version_manager.get_stored_version_info("DOID") is None